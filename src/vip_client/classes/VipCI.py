@@ -78,6 +78,7 @@ class VipCI(VipLauncher):
         input_settings: dict = None,
         session_name: str = None,
         verbose: bool = None,
+        client: vip.Client = None,
     ) -> None:
         """
         Creates a VipCI instance and sets its properties from keyword arguments.
@@ -104,6 +105,9 @@ class VipCI(VipLauncher):
             - If True, instance methods will display logs;
             - If False, instance methods will run silently.
 
+        - `client` [Optional] (vip.Client) VIP client of this instance (API key and connections).
+            Default: the current client of `vip` (see init()).
+
         `session_name` is only set at instantiation; other properties can be set later in function calls.
         If `output_dir` leads to data from a previous session, properties will be loaded from the metadata on Girder.
         """
@@ -114,6 +118,7 @@ class VipCI(VipLauncher):
             pipeline_id=pipeline_id,
             input_settings=input_settings,
             verbose=verbose,
+            client=client,
         )
         # End display
         if any([session_name, output_dir]) and (self.__name__ == "VipCI"):
@@ -147,16 +152,17 @@ class VipCI(VipLauncher):
 
         - `girder_key` (str): Girder API key. Can take the same values as `vip_key`.
 
-        - `verbose` (bool): default verbose mode for all instances.
+        - `verbose` (bool): default verbose mode for all instances using the same client.
             - If True, all instances will display logs by default;
             - If False, all instance methods will run silently by default.
 
         - `kwargs` [Optional] (dict): keyword arguments or dictionnary setting properties of the returned instance.
         """
         # Initiate a Vip Session silently
-        super().init(api_key=vip_key, verbose=False)
-        # Restore the verbose state
-        cls._VERBOSE = verbose
+        super().init(api_key=vip_key, verbose=False, client=kwargs.get("client"))
+        # Restore the verbose state of the client
+        client = kwargs.get("client") or cls._api()
+        client.verbose = verbose
         # Instantiate a Girder client
         cls._girder_client = girder_client.GirderClient(apiUrl=cls._GIRDER_PORTAL)
         # Check if `girder_key` is in a local file or environment variable
@@ -164,11 +170,12 @@ class VipCI(VipLauncher):
         # Authenticate with Girder API key
         cls._girder_client.authenticate(apiKey=true_key)
         # Diplay success
-        cls._printc()
-        cls._printc("---------------------------------------------")
-        cls._printc("| You are communicating with VIP and Girder |")
-        cls._printc("---------------------------------------------")
-        cls._printc()
+        with client.use():
+            cls._printc()
+            cls._printc("---------------------------------------------")
+            cls._printc("| You are communicating with VIP and Girder |")
+            cls._printc("---------------------------------------------")
+            cls._printc()
         # Return a VipCI instance for method cascading
         return cls(verbose=(verbose and kwargs), **kwargs)
 
@@ -285,7 +292,7 @@ class VipCI(VipLauncher):
     # ------------------------------------------------
 
     # Method to check existence of a resource on Girder.
-    @classmethod
+    @vip.clientmethod
     def _exists(cls, path: PurePath, location="girder") -> bool:
         """
         Checks existence of a resource on Girder.
@@ -303,7 +310,7 @@ class VipCI(VipLauncher):
     # ------------------------------------------------
 
     # Method to create a distant or local directory
-    @classmethod
+    @vip.clientmethod
     def _create_dir(cls, path: PurePath, location="girder", **kwargs) -> str:
         """
         Creates a directory at `path` on Girder if `location` is "girder".
@@ -330,12 +337,12 @@ class VipCI(VipLauncher):
     # ------------------------------------------------
 
     # Function to delete a path
-    @classmethod
+    @vip.clientmethod
     def _delete_path(cls, path: PurePath, location="vip") -> None:
         raise NotImplementedError("VipCI cannot delete data.")
 
     # Function to delete a path on VIP with warning
-    @classmethod
+    @vip.clientmethod
     def _delete_and_check(cls, path: PurePath, location="vip", timeout=300) -> bool:
         raise NotImplementedError("VipCI cannot delete data.")
 
@@ -363,7 +370,7 @@ class VipCI(VipLauncher):
         )
         res_vip = self._vip_girder_id(res_id)
         # Launch execution
-        workflow_id = vip.init_exec(
+        workflow_id = self._api().init_exec(
             pipeline=self.pipeline_id,
             name=self.session_name,
             inputValues=input_settings,
@@ -385,7 +392,7 @@ class VipCI(VipLauncher):
         }
 
     # Overwrite _get_exec_infos() to bypass call to vip.get_exec_results() (does not work at this time)
-    @classmethod
+    @vip.clientmethod
     def _get_exec_infos(cls, workflow_id: str) -> dict:
         """
         Returns succint information on `workflow_id`:
@@ -395,7 +402,7 @@ class VipCI(VipLauncher):
         """
         try:
             # Get execution infos
-            infos = vip.execution_info(workflow_id)
+            infos = cls._api().execution_info(workflow_id)
             # Secure way to get execution results
             # files = vip.get_exec_results(workflow_id)
         except RuntimeError as vip_error:
@@ -500,7 +507,7 @@ class VipCI(VipLauncher):
         `path` can be a string or PathLib object.
 
         Raises `girder_client.HttpError` if the resource was not found.
-        Adds intepretation message unless `cls._VERBOSE` is False.
+        Adds intepretation message unless the verbose mode is False.
         """
         try:
             resource = cls._girder_client.resourceLookup(str(path))
@@ -0,0 +1,331 @@
+from __future__ import annotations
+import json
+import os
+import time
+from pathlib import *
+
+from vip_client.utils import vip
+from vip_client.classes.VipLauncher import VipLauncher
+from vip_client.classes.VipSession import VipSession
+
+
+class VipCampaign:
+    """
+    Python class to launch many pipeline executions under the execution quota of VIP.
+
+    A campaign holds a queue of jobs, each job being defined by:
+    `pipeline_id`, `input_settings`, `nb_runs` (and optional session properties).
+    The workflows launched by each job are recorded in the queue.
+    - Each job is launched by a dedicated session (VipLauncher or VipSession instance);
+    - The number of running executions on VIP is kept under `max_running`:
+        jobs are launched as soon as execution slots are free (a job can be launched in several steps);
+    - The queue is saved in a local JSON file (`queue_file`):
+        a campaign created with the same file resumes where it stopped;
+    - A job is marked as failed after `max_attempts` failed launches in a row
+        (the errors are recorded in the queue).
+
+    N.B.: requires that `VipLauncher.init()` (or any subclass) has been called with a valid API key.
+    """
+
+    ##################
+    ################ Class Attributes ##################
+    ##################
+
+    # Class name
+    __name__ = "VipCampaign"
+    # Default verbose state
+    _VERBOSE = True
+    # Execution statuses counting as "running" on VIP
+    _RUNNING_STATUS = ["Initializing", "Running"]
+    # Session classes which can run a campaign
+    _SESSION_CLASSES = {"VipLauncher": VipLauncher, "VipSession": VipSession}
+
+    #############
+    ################ Constructor ##################
+    #############
+
+    def __init__(
+        self,
+        queue_file,
+        session_class: type = None,
+        max_running: int = 50,
+        verbose: bool = None,
+        client: vip.Client = None,
+        max_attempts: int = 3,
+    ) -> None:
+        """
+        Create a VipCampaign instance, or resume a campaign from `queue_file`.
+
+        ## Parameters
+        - `queue_file` (str | os.PathLike) Local JSON file where the queue of jobs is saved.
+            If this file exists, the campaign is resumed.
+
+        - `session_class` [Optional] (type) Class of the sessions launching the jobs: VipLauncher or VipSession.
+            Default: class of the saved campaign, or VipSession for a new campaign.
+
+        - `max_running` (int) Maximum number of running executions on VIP (for your whole account).
+
+        - `verbose` [Optional] (bool) Verbose mode for this instance.
+
+        - `client` [Optional] (vip.Client) VIP client of the campaign and its sessions.
+            Default: the current client of `vip`.
+
+        - `max_attempts` (int) Number of failed launches in a row after which a job is marked as failed.
+        """
+        self.verbose = verbose if verbose is not None else self._VERBOSE
+        self.max_running = max_running
+        self.max_attempts = max_attempts
+        self._client = client
+        self._queue_file = Path(queue_file)
+        # Sessions launching the jobs (by session name)
+        self._sessions = {}
+        # Resume the campaign
+        self._jobs = []
+        saved_class = None
+        if self._queue_file.is_file():
+            with self._queue_file.open() as fid:
+                data = json.load(fid)
+            self._jobs = data["jobs"]
+            saved_class = data.get("session_class")
+            self._print(
+                f"<< Campaign restored from {self._queue_file}: {self.pending()} run(s) to launch.\n"
+            )
+        # Set the session class
+        if session_class is None:
+            session_class = self._SESSION_CLASSES.get(saved_class, VipSession)
+        if not issubclass(session_class, VipLauncher):
+            raise TypeError(f"{session_class} is not a subclass of VipLauncher")
+        self._session_class = session_class
+
+    # ------------------------------------------------
+
+    ################
+    ################ Public Methods ##################
+    ################
+
+    # Add a job to the queue
+    def add_job(
+        self,
+        pipeline_id: str,
+        input_settings: dict,
+        nb_runs: int = 1,
+        session_name: str = None,
+        **kwargs,
+    ) -> VipCampaign:
+        """
+        Adds a job to the queue and saves the queue.
+        - `pipeline_id`, `input_settings`, `nb_runs`: see VipLauncher.launch_pipeline();
+        - `session_name` [Optional]: name of the session launching this job
+            (default: '[name of the queue file]-[job number]');
+        - `kwargs` [Optional]: other session properties (e.g., `output_dir`, `input_dir`).
+        """
+        if session_name is None:
+            session_name = f"{self._queue_file.stem}-{len(self._jobs) + 1}"
+        self._jobs.append(
+            {
+                "session_name": session_name,
+                "pipeline_id": pipeline_id,
+                "input_settings": input_settings,
+                "nb_runs": nb_runs,
+                "launched": 0,
+                "properties": kwargs,
+                "workflows": {},
+                "attempts": 0,
+                "errors": [],
+                "failed": False,
+            }
+        )
+        self._save()
+        return self
+
+    # ------------------------------------------------
+
+    # Number of runs to launch
+    def pending(self) -> int:
+        """Returns the number of runs which remain to be launched (failed jobs excluded)"""
+        return sum(
+            job["nb_runs"] - job["launched"]
+            for job in self._jobs
+            if not job.get("failed")
+        )
+
+    # ------------------------------------------------
+
+    # Jobs which could not be launched
+    def failed(self) -> dict:
+        """Returns the launch errors of the failed jobs, by session name"""
+        return {
+            job["session_name"]: job.get("errors", [])
+            for job in self._jobs
+            if job.get("failed")
+        }
+
+    # ------------------------------------------------
+
+    # Launch all jobs
+    def run(self, refresh_time: int = 60) -> VipCampaign:
+        """
+        Launches all jobs in the queue, while keeping the number of running executions
+        on VIP under `max_running`.
+        - Free slots are checked every `refresh_time` (seconds);
+        - The queue is saved after each launch;
+        - Jobs are marked as failed after `max_attempts` failed launches in a row (see failed()).
+
+        Executions are not monitored after launch: see VipMonitor and sessions().
+        """
+        self._print("\n=== RUN CAMPAIGN ===\n")
+        self._print(f"{self.pending()} run(s) to launch (max. running executions: {self.max_running}).")
+        self._print("-------------------------------------------------------------")
+        while self.pending():
+            # Launch the next runs in free slots (none if they cannot be counted)
+            running = self._running_executions()
+            free = self.max_running - running if running is not None else 0
+            for job in self._jobs:
+                if free <= 0:
+                    break
+                nb_runs = min(job["nb_runs"] - job["launched"], free)
+                if nb_runs <= 0 or job.get("failed"):
+                    continue
+                free -= self._launch(job, nb_runs)
+            # Wait for free slots
+            if self.pending():
+                time.sleep(refresh_time)
+        self._print("-------------------------------------------------------------")
+        failed = self.failed()
+        if failed:
+            self._print(f"(!) {len(failed)} job(s) failed:", ", ".join(failed))
+        else:
+            self._print("All runs were launched.")
+        return self
+
+    # ------------------------------------------------
+
+    # Get the sessions of the campaign
+    def sessions(self) -> list:
+        """
+        Returns the sessions of the jobs which were launched,
+        e.g., to monitor them with VipMonitor.
+        """
+        return [self._get_session(job) for job in self._jobs if job["launched"]]
+
+    # ------------------------------------------------
+
+    #################
+    ################ Private Methods ################
+    #################
+
+    # Count the executions in progress on VIP
+    def _running_executions(self) -> int:
+        """
+        Returns the number of executions in progress on VIP.
+        Returns None if the list of executions cannot be obtained.
+        """
+        client = self._client if self._client is not None else vip.get_client()
+        try:
+            executions = client.list_executions()
+        except RuntimeError as e:
+            self._print(f"(!) Running executions could not be listed: {e}")
+            return None
+        return sum(
+            execution.get("status") in self._RUNNING_STATUS for execution in executions
+        )
+
+    # ------------------------------------------------
+
+    # Session launching a job
+    def _get_session(self, job: dict) -> VipLauncher:
+        """
+        Returns the session of `job`.
+        New sessions are restored from their backup file, if any, 
+        or from the workflows saved in the queue.
+        """
+        if job["session_name"] in self._sessions:
+            return self._sessions[job["session_name"]]
+        with self._silent_class():
+            session = self._session_class(
+                session_name=job["session_name"],
+                pipeline_id=job["pipeline_id"],
+                input_settings=job["input_settings"],
+                client=self._client,
+                **job["properties"],
+            )
+        # Restore the workflows (e.g., for sessions without backup)
+        if not session.workflows and job.get("workflows"):
+            with session._unlocked_properties():
+                session.workflows = job["workflows"]
+        self._sessions[job["session_name"]] = session
+        return session
+
+    # ------------------------------------------------
+
+    # Launch some runs of a job
+    def _launch(self, job: dict, nb_runs: int) -> int:
+        """
+        Launches `nb_runs` executions of `job` and saves the queue.
+        Returns the number of launched executions.
+        Launch failures (e.g., VIP quota, missing inputs) are recorded in `job` and retried later,
+        until `max_attempts` failures in a row.
+        """
+        session, nb_workflows = None, 0
+        try:
+            session = self._get_session(job)
+            nb_workflows = len(session.workflows)
+            with session._silent_session():
+                # VipSession: input data must be on VIP
+                if isinstance(session, VipSession) and not job["launched"]:
+                    session.upload_inputs()
+                session.launch_pipeline(nb_runs=nb_runs)
+        except (RuntimeError, FileNotFoundError, ValueError, TypeError) as e:
+            self._print(f"(!) Launch failed for session '{job['session_name']}': {e}")
+            job["attempts"] = job.get("attempts", 0) + 1
+            job["errors"] = job.get("errors", []) + [f"{type(e).__name__}: {e}"]
+            if job["attempts"] >= self.max_attempts:
+                job["failed"] = True
+                self._print(
+                    f"(!) Session '{job['session_name']}' failed {job['attempts']} times: job marked as failed."
+                )
+        else:
+            job["attempts"] = 0
+        # Count the new workflows
+        launched = len(session.workflows) - nb_workflows if session is not None else 0
+        job["launched"] += launched
+        if session is not None:
+            job["workflows"] = session.workflows
+        self._save()
+        if launched:
+            self._print(
+                f"[{job['session_name']}] {launched} execution(s) launched",
+                f"({job['launched']}/{job['nb_runs']}).",
+            )
+        return launched
+
+    # ------------------------------------------------
+
+    # Save the queue
+    def _save(self) -> None:
+        """Saves the queue of jobs in `queue_file` (atomic write)"""
+        data = {"session_class": self._session_class.__name__, "jobs": self._jobs}
+        self._queue_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self._queue_file.with_name(f"{self._queue_file.name}.{os.getpid()}.tmp")
+        with tmp_file.open("w") as fid:
+            json.dump(data, fid, indent=4, default=str)
+        os.replace(tmp_file, self._queue_file)
+
+    # ------------------------------------------------
+
+    # Silence the session class during instantiation
+    def _silent_class(self):
+        return self._session_class._silent_class()
+
+    # Display
+    def _print(self, *args, **kwargs) -> None:
+        if self.verbose:
+            print(*args, **kwargs)
+
+    # ------------------------------------------------
+
+
+#######################################################
+
+if __name__ == "__main__":
+    pass
@@ -29,6 +29,8 @@ class VipClient:
     _VIP_SUPPORT = "vip-support@creatis.insa-lyon.fr"
     # Regular expression for invalid characters
     _INVALID_CHARS = re.compile(r"[^0-9\.,A-Za-z\-+@/_(): \[\]?&=]")
+    # VIP client (vip.Client) of the class (None: the current client of `vip`)
+    _client = None
 
     ################
     ################ Public Methods ##################
@@ -36,7 +38,7 @@ class VipClient:
 
     # Login to VIP
     @classmethod
-    def init(cls, api_key="VIP_API_KEY", verbose=True) -> VipClient:
+    def init(cls, api_key="VIP_API_KEY", verbose=True, client=None) -> VipClient:
         """
         Handshakes with VIP using your own API key.
         Returns a class instance which properties can be provided as keyword arguments.
@@ -53,25 +55,31 @@ class VipClient:
             - If False, all instance methods will run silently by default.
 
         - `kwargs` [Optional] (dict): keyword arguments or dictionnary setting properties of the returned instance.
+
+        - `client` [Optional] (vip.Client): VIP client of this class (e.g., to use another VIP account).
+            Default: the current client of `vip`.
         """
         # Set the default verbose mode for all sessions
         cls._VERBOSE = verbose
+        # Set the VIP client
+        if client is not None:
+            cls._client = client
         # Check if `api_key` is in a local file or environment variable
         true_key = cls._get_api_key(api_key)
         # Set User API key
         try:
-            # setApiKey() may return False
-            assert vip.setApiKey(
+            # set_api_key() may return False
+            assert cls._api().set_api_key(
                 true_key
             ), f"(!) Unable to set the VIP API key: {true_key}.\nPlease check the key or retry later."
         except RuntimeError as vip_error:
-            # setApiKey() may throw RuntimeError in case of bad key
+            # set_api_key() may throw RuntimeError in case of bad key
             cls._printc(
                 f"(!) Unable to set the VIP API key: {true_key}.\n    Original error message:"
             )
             raise vip_error
         except json.decoder.JSONDecodeError as json_error:
-            # setApiKey() may throw JSONDecodeError in special cases
+            # set_api_key() may throw JSONDecodeError in special cases
             cls._printc(
                 f"(!) Unable to set the VIP API key: {true_key}.\n    Original error message:"
             )
@@ -89,6 +97,14 @@ class VipClient:
     ################ Private Methods ################
     #################
 
+    # VIP client of the class
+    @classmethod
+    def _api(cls) -> vip.Client:
+        """Returns the VIP client of the class if any, otherwise the current client of `vip`"""
+        return cls._client if cls._client is not None else vip.get_client()
+
+    # ------------------------------------------------
+
     # Method to check existence of a distant resource.
     @classmethod
     def _exists(cls, path, location="vip") -> bool:
@@ -101,7 +117,7 @@ class VipClient:
             raise NotImplementedError(f"Unknown location: {location}")
         # Check path existence
         try:
-            return vip.exists(str(path))
+            return cls._api().exists(str(path))
         except RuntimeError as vip_error:
             # Connection error with VIP
             cls._handle_vip_error(vip_error)
@@ -127,7 +143,7 @@ class VipClient:
             raise NotImplementedError(f"Unknown location: {location}")
         # Create directory
         try:
-            if not vip.create_dir(str(path)):
+            if not cls._api().create_dir(str(path)):
                 msg = f"The following directoy could not be created on VIP:\n\t{path}\n"
                 msg += f"Please retry later. Contact VIP support ({cls._VIP_SUPPORT}) if this cannot be fixed."
                 raise AssertionError(msg)
@@ -151,9 +167,9 @@ class VipClient:
         if location != "vip":
             raise NotImplementedError(f"Unknown location: {location}")
         # Try path deletion
-        done = vip.delete_path(str(path))
+        done = cls._api().delete_path(str(path))
         # VIP Errors are handled by returning False in `vip.delete_path()`.
-        if not done and vip.exists(str(path)):
+        if not done and cls._api().exists(str(path)):
             # Raise a generic error if deletion did not work
             msg = f"\n'{path}' could not be removed from VIP servers.\n"
             msg += (
@@ -178,6 +194,8 @@ class VipClient:
         while (t < timeout) and cls._exists(path, location):
             time.sleep(2)
             t = time.time() - start
+            # Forget the cached existence of `path` before checking again
+            cls._api().paths.invalidate(str(path))
         # Check if the data have indeed been removed
         return t < timeout
 
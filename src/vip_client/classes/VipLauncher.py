@@ -1,15 +1,105 @@
 from __future__ import annotations
+import hashlib
 import json
 import os
 import re
+import tempfile
 import textwrap
+import threading
 import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from contextlib import contextmanager, nullcontext
 from pathlib import *
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    import msvcrt
+    fcntl = None
+
 from vip_client.utils import vip
 
 
+class InputList:
+    """
+    Compact form of a list parameter in `input_settings`, once parsed.
+    - Values are stored as strings, with 1 flag per value for paths (`paths`);
+    - Iterating yields the parsed values (PurePosixPath for paths, strings otherwise);
+    - Equality is checked on a content hash (`digest`), computed once;
+    - The values bound to a location are computed once and cached (see `bind()`).
+    Instances are immutable.
+    """
+
+    __slots__ = ("values", "paths", "_digest", "_bound")
+
+    def __init__(self, values: list, paths: bytes = None):
+        self.values = values
+        self.paths = paths if paths is not None else bytes(len(values))
+        self._digest = None
+        self._bound = None
+
+    @classmethod
+    def parse(cls, values: list, parse_path) -> InputList:
+        """
+        Returns a new InputList from `values` (strings or path-like objects).
+        `parse_path(value)` returns the string form of `value` if it is a path, None otherwise.
+        """
+        strings, paths = [], bytearray(len(values))
+        for index, value in enumerate(values):
+            path = parse_path(value)
+            if path is None:
+                strings.append(str(value))
+            else:
+                strings.append(path)
+                paths[index] = 1
+        return cls(strings, bytes(paths))
+
+    @staticmethod
+    def accepts(value) -> bool:
+        """Returns True if `value` is a list of strings or path-like objects"""
+        return isinstance(value, list) and all(
+            isinstance(v, (str, os.PathLike)) for v in value
+        )
+
+    def bind(self, key, bind_path) -> list:
+        """
+        Returns a copy of the values as strings, where each path is replaced by `bind_path(path)`.
+        Only the latest result is kept, with its `key` (e.g., a location and its input directory).
+        """
+        if self._bound is None or self._bound[0] != key:
+            self._bound = (key, [
+                bind_path(value) if is_path else value
+                for value, is_path in zip(self.values, self.paths)
+            ])
+        return list(self._bound[1])
+
+    @property
+    def digest(self) -> str:
+        """Hash of the content"""
+        if self._digest is None:
+            content = json.dumps(self.values).encode() + self.paths
+            self._digest = hashlib.sha1(content).hexdigest()
+        return self._digest
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        for value, is_path in zip(self.values, self.paths):
+            yield PurePosixPath(value) if is_path else value
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, InputList):
+            return len(self) == len(other) and self.digest == other.digest
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} values)"
+
+
 class VipLauncher:
     """
     Python class to run VIP pipelines on datasets located on VIP servers.
@@ -38,8 +128,8 @@ class VipLauncher:
         "input_settings",
         "workflows",
     ]
-    # Default verbose state
-    _VERBOSE = True
+    # Thread-local state of class logs (see _silent_class())
+    _silenced = threading.local()
     # Default backup location
     # (set to None to avoid saving and loading backup files)
     _BACKUP_LOCATION = None
@@ -55,8 +145,40 @@ class VipLauncher:
     _VIP_SUPPORT = "vip-support@creatis.insa-lyon.fr"
     # Regular expression for invalid characters (i.e. all except valid characters)
     _INVALID_CHARS_FOR_VIP = re.compile(r"[^0-9\.,A-Za-z\-+@/_(): \[\]?&=]")
-    # List of pipelines available to the user (will evolve after init())
-    _AVAILABLE_PIPELINES = []
+    # VIP client (vip.Client) of the class or instance: API key, connections & available pipelines
+    # (None: the current client of `vip`, set by init())
+    _client = None
+    # Local file keeping the observed execution durations for each pipeline
+    # (set to None to disable the duration history)
+    _DURATIONS_FILE = Path.home() / ".vip_client" / "durations.json"
+    # Number of durations kept for each pipeline
+    _DURATIONS_HISTORY = 50
+    # Maximum time between two updates when monitoring workflows (factor of `refresh_time`)
+    _MAX_REFRESH_FACTOR = 10
+    # Number of consecutive connection errors tolerated when monitoring workflows
+    _MAX_MONITOR_ERRORS = 3
+    # Time of the last workflow update (instance attribute, not saved)
+    _last_update = None
+    # Durations observed for the current pipeline, as (pipeline_id, sorted durations)
+    # (instance attribute, not saved: see _pipeline_durations())
+    _durations = None
+    # Finished workflows whose outputs were requested (instance attribute, not saved)
+    _resolved = None
+    # Retry policy for failed workflows (instance attribute, see set_retry_policy())
+    _retry_policy = None
+    # Delay before writing session backups in the background (seconds).
+    # Saves within this delay are coalesced (set to 0 to write backups immediately)
+    _SAVE_DELAY = 2
+    # Lock for the backup data shared with background writers
+    _BACKUP_LOCK = threading.RLock()
+    # Last backup data, as (backup key, data) (instance attribute, see _save())
+    _backup = None
+    # Backup data waiting to be written, as (backup key, data), & background writer (instance attributes)
+    _pending_backup = None
+    _backup_writer = None
+    _backup_flush = None
+    # Error of the last background write (instance attribute, see _write_pending())
+    _backup_error = None
 
     #####################
     ################ Instance Properties ##################
@@ -278,7 +400,7 @@ class VipLauncher:
         """
         This session will displays logs if `verbose` is True.
         """
-        return self._verbose if self._is_defined("_verbose") else self._VERBOSE
+        return self._verbose if self._is_defined("_verbose") else self._default_verbose()
 
     @verbose.setter
     def verbose(self, verbose: bool) -> None:
@@ -332,6 +454,7 @@ class VipLauncher:
         input_settings: dict = None,
         session_name: str = None,
         verbose: bool = None,
+        client: vip.Client = None,
     ) -> None:
         """
         Create a VipLauncher instance and sets properties from keyword arguments.
@@ -356,11 +479,16 @@ class VipLauncher:
             - If True, instance methods will display logs;
             - If False, instance methods will run silently.
 
+        - `client` [Optional] (vip.Client) VIP client of this instance (API key and connections).
+            Default: the current client of `vip` (see init()).
+
         `session_name` is only set at instantiation; other properties can be set later in function calls.
         If `output_dir` leads to data from a previous session, properties will be loaded from the backup file on VIP.
         """
+        # Set the VIP client
+        self._client = client
         # Set the verbose mode
-        self.verbose = verbose if verbose is not None else self._VERBOSE
+        self.verbose = verbose if verbose is not None else self._default_verbose()
         # Default value for session name
         self.session_name = session_name if session_name else self._new_session_name()
         # Display the session name only if arguments are given
@@ -411,55 +539,61 @@ class VipLauncher:
             C. [safer] The **name of some environment variable** containing your API key (default: "VIP_API_KEY").
         In cases B or C, the API key will be loaded from the local file or the environment variable.
 
-        - `verbose` (bool): default verbose mode for all instances.
+        - `verbose` (bool): default verbose mode for all instances using the same client.
             - If True, all instances will display logs by default;
             - If False, all instance methods will run silently by default.
 
         - `kwargs` [Optional] (dict): keyword arguments or dictionnary setting properties of the returned instance.
-        """
-        # Set the default verbose mode for all sessions
-        cls._VERBOSE = verbose
-        # Check if `api_key` is in a local file or environment variable
-        true_key = cls._get_api_key(api_key)
-        # Set User API key
-        try:
-            # setApiKey() may return False
-            assert vip.setApiKey(
-                true_key
-            ), f"(!) Unable to set the VIP API key: {true_key}.\nPlease check the key or retry later."
-        except RuntimeError as vip_error:
-            # setApiKey() may throw RuntimeError in case of bad key
-            cls._printc(
-                f"(!) Unable to set the VIP API key: {true_key}.\n    Original error message:"
-            )
-            raise vip_error
-        except json.decoder.JSONDecodeError as json_error:
-            # setApiKey() may throw JSONDecodeError in special cases
-            cls._printc(
-                f"(!) Unable to set the VIP API key: {true_key}.\n    Original error message:"
-            )
-            raise json_error
-        # Update the list of available pipelines
-        try:
-            cls._get_available_pipelines()  # RunTimeError is handled downstream
-        except json.decoder.JSONDecodeError as json_error:
-            # The user still cannot communicate with VIP
-            cls._printc(f"(!) Unable to communicate with VIP.")
-            cls._printc(f"    Original error messsage:")
-            raise json_error
-        cls._printc()
-        cls._printc("----------------------------------")
-        cls._printc("| You are communicating with VIP |")
-        cls._printc("----------------------------------")
-        cls._printc()
-        # Double check user can access pipelines
-        if not cls._AVAILABLE_PIPELINES:
-            cls._printc(
-                "(!) Your API key does not allow you to execute pipelines on VIP."
-            )
-            cls._printc(
-                f"    Please join some research group(s) on the Web portal: {cls._VIP_PORTAL}"
-            )
+            If `client` (vip.Client) is provided, the API key is set for this client only
+            (e.g., to use several VIP accounts at once). Otherwise, it is set for the current client of `vip`.
+        """
+        # Client holding the API key
+        client = kwargs.get("client") or cls._api()
+        # Set the default verbose mode for all sessions of this client
+        client.verbose = verbose
+        # Display logs with the verbose mode of this client
+        with client.use():
+            # Check if `api_key` is in a local file or environment variable
+            true_key = cls._get_api_key(api_key)
+            # Set User API key
+            try:
+                # set_api_key() may return False
+                assert client.set_api_key(
+                    true_key
+                ), f"(!) Unable to set the VIP API key: {true_key}.\nPlease check the key or retry later."
+            except RuntimeError as vip_error:
+                # set_api_key() may throw RuntimeError in case of bad key
+                cls._printc(
+                    f"(!) Unable to set the VIP API key: {true_key}.\n    Original error message:"
+                )
+                raise vip_error
+            except json.decoder.JSONDecodeError as json_error:
+                # set_api_key() may throw JSONDecodeError in special cases
+                cls._printc(
+                    f"(!) Unable to set the VIP API key: {true_key}.\n    Original error message:"
+                )
+                raise json_error
+            # Update the list of available pipelines
+            try:
+                cls._get_available_pipelines()  # RunTimeError is handled downstream
+            except json.decoder.JSONDecodeError as json_error:
+                # The user still cannot communicate with VIP
+                cls._printc(f"(!) Unable to communicate with VIP.")
+                cls._printc(f"    Original error messsage:")
+                raise json_error
+            cls._printc()
+            cls._printc("----------------------------------")
+            cls._printc("| You are communicating with VIP |")
+            cls._printc("----------------------------------")
+            cls._printc()
+            # Double check user can access pipelines
+            if not client.pipelines:
+                cls._printc(
+                    "(!) Your API key does not allow you to execute pipelines on VIP."
+                )
+                cls._printc(
+                    f"    Please join some research group(s) on the Web portal: {cls._VIP_PORTAL}"
+                )
         # Return a VipLauncher instance for method cascading
         return cls(verbose=(verbose and kwargs), **kwargs)
 
@@ -549,29 +683,52 @@ class VipLauncher:
         self._print("Execution Name:", self._session_name)
         self._print("Started Workflows:", end="\n\t")
         # Launch all executions in parallel
-        for nEx in range(nb_runs):
+        def launch() -> tuple:
             # Initiate execution
-            try:
-                workflow_id = self._init_exec()
-            # This part may fail for a number of reasons
-            except Exception as e:
-                self._print("\n-------------------------------------")
-                self._print(f"(!) Stopped after {nEx} execution(s).\n")
-                self._save()
-                raise e from None
-            # Display
-            self._print(workflow_id, end=", ")
+            workflow_id = self._init_exec()
             # Get workflow informations
-            try:
-                exec_infos = self._get_exec_infos(workflow_id)
-            except Exception as e:
-                self._save()
-                raise e from None
-            # Create or update workflow entry (depends on init_exec())
-            if workflow_id in self._workflows:
-                self._workflows[workflow_id].update(exec_infos)
-            else:
-                self._workflows[workflow_id] = exec_infos
+            return workflow_id, self._get_exec_infos(workflow_id)
+
+        nb_threads = max(min(nb_runs, vip.MAX_THREADS), 1)
+        client = self._api()
+        client.set_pool_size(nb_threads)
+        error = None  # First failure
+        nb_started = 0  # Number of started executions
+        # Threads are run in a context manager to secure their closing
+        with ThreadPoolExecutor(
+            max_workers=nb_threads,
+            thread_name_prefix="vip_requests",
+            initializer=client.init_thread,  # Thread-safe `requests` Session
+        ) as executor:
+            launches = [executor.submit(launch) for _ in range(nb_runs)]
+            # Browse results in launch order
+            for launched in launches:
+                try:
+                    workflow_id, exec_infos = launched.result()
+                except CancelledError:
+                    continue
+                # This part may fail for a number of reasons
+                except Exception as e:
+                    # Cancel the next launches (launches in progress are kept)
+                    if error is None:
+                        error = e
+                        for next_launch in launches:
+                            next_launch.cancel()
+                    continue
+                # Display
+                nb_started += 1
+                self._print(workflow_id, end=", ")
+                # Create or update workflow entry (depends on init_exec())
+                if workflow_id in self._workflows:
+                    self._workflows[workflow_id].update(exec_infos)
+                else:
+                    self._workflows[workflow_id] = exec_infos
+        # Stop cleanly in case of failure
+        if error is not None:
+            self._print("\n-------------------------------------")
+            self._print(f"(!) Stopped after {nb_started} execution(s).\n")
+            self._save()
+            raise error from None
         # End the application launch
         self._print("\n-------------------------------------")
         self._print("Done.")
@@ -614,32 +771,16 @@ class VipLauncher:
             self._print("Their progress can be monitored on VIP portal:")
             self._print(f"\t{self._VIP_PORTAL}")
             self._print("-------------------------------------------------------------")
+            # Display the expected end
+            eta = self.session_eta()
+            if eta:
+                self._print(
+                    "Expected end of executions:",
+                    time.strftime("%Y/%m/%d %H:%M:%S", time.localtime(time.time() + eta)),
+                )
             # Standby until all executions are over
-            time.sleep(refresh_time)
-            while self._still_running():
-                # Keep track of time
-                start = time.time()
-                # Update the workflow status & discard connection errors
-                try:
-                    self._update_workflows()
-                except Exception as e:
-                    # Print warning message
-                    self._print(
-                        "(!) Connection with VIP was interrupted following an unexpected error (see below)."
-                    )
-                    self._print(
-                        "    This does not affect your executions on VIP servers."
-                    )
-                    self._print(
-                        "    Relaunch monitor_workflows() or visit the VIP portal to see their current status.\n"
-                    )
-                    # Save the session
-                    self._save()
-                    # Raise the error
-                    raise e
-                # Sleep until next itertation
-                elapsed_time = time.time() - start
-                time.sleep(max(refresh_time - elapsed_time, 0))
+            for _ in self._wait_workflows(refresh_time):
+                pass
             # Display the end of executions
             self._print("All executions are over.")
         # Last execution report
@@ -651,6 +792,58 @@ class VipLauncher:
 
     # ------------------------------------------------
 
+    # Get status changes until all executions are over
+    def watch_workflows(self, refresh_time=30):
+        """
+        Generator of status changes for the executions launched in the current session.
+        - Yields a tuple (`workflow_id`, `previous_status`, `new_status`) as soon as an execution changes status;
+        - Status is updated every `refresh_time` (seconds) at most, as in monitor_workflows(), until all runs are done.
+
+        Status changes are detected from the last update of the workflow inventory
+        (e.g., executions which were already over before this call are not yielded).
+        Session is backed up at the end of the procedure.
+
+        Error profile:
+        - Raises RuntimeError if the client fails to communicate with VIP.
+        """
+        # Update existing workflows
+        yield from self._update_workflows()
+        # Standby until all executions are over
+        yield from self._wait_workflows(refresh_time)
+        # Save the session
+        self._save()
+
+    # ------------------------------------------------
+
+    # Relaunch failed executions automatically
+    def set_retry_policy(
+        self,
+        max_attempts: int = 3,
+        backoff_time: int = 60,
+        status: list = ["InitializationFailed", "ExecutionFailed", "Killed"],
+    ) -> VipLauncher:
+        """
+        Sets the retry policy for executions which fail on VIP (e.g., due to the grid infrastructure).
+        - Executions ending with any status in `status` are relaunched with the same settings;
+        - Each execution is run `max_attempts` times at most (set to 1 or less to disable retries);
+        - The n-th retry waits `backoff_time` * 2^(n-1) seconds after the failure is detected.
+
+        Retries are done when workflows are updated (e.g., by monitor_workflows()),
+        which wait for pending retries before ending. Running executions are not affected.
+        Old and new workflows are linked in the inventory by their keys "retried_by" and "retry_of".
+        """
+        if max_attempts <= 1:
+            self._retry_policy = None
+        else:
+            self._retry_policy = {
+                "max_attempts": max_attempts,
+                "backoff_time": backoff_time,
+                "status": list(status),
+            }
+        return self
+
+    # ------------------------------------------------
+
     # Run a full VipLauncher session
     def run_session(self, nb_runs=1, refresh_time=30) -> VipLauncher:
         """
@@ -773,7 +966,7 @@ class VipLauncher:
     # Additional Features
     ###########################################
 
-    @classmethod
+    @vip.clientmethod
     def show_pipeline(cls, pipeline_id: str = None) -> None:
         """
         Displays useful informations about VIP pipelines.
@@ -786,23 +979,24 @@ class VipLauncher:
         - If `pipeline_id` is not exact, shows a list of pipelines with a *partial*, *case-insensitive* match.
         - If `pipeline_id` is exact, shows the list of parameters required to run `pipeline_id`.
         """
-        # Return if _VERBOSE is False
-        if not cls._VERBOSE:
+        # Return if the verbose mode is False
+        if not cls._default_verbose():
             return
         # Check init() was called first
-        if not cls._AVAILABLE_PIPELINES:
+        available_pipelines = cls._api().pipelines
+        if not available_pipelines:
             raise TypeError(
                 f"No pipeline found. Run {cls.__name__}.init() to access pipeline descriptions."
             )
-        # Find all case-insensitive partial matches between `pipeline_id` and cls._AVAILABLE_PIPELINES
+        # Find all case-insensitive partial matches between `pipeline_id` and the available pipelines
         if pipeline_id:
             pipelines = [
                 pipe
-                for pipe in cls._AVAILABLE_PIPELINES
+                for pipe in available_pipelines
                 if pipeline_id.lower() in pipe.lower()
             ]
         else:  # In case no argument is given
-            pipelines = cls._AVAILABLE_PIPELINES
+            pipelines = available_pipelines
         # Display depending on the number of pipelines found
         if not pipelines:  # Case no match
             cls._printc(f"(!) No pipeline found for pattern '{pipeline_id}'.")
@@ -930,7 +1124,7 @@ class VipLauncher:
     # ------------------------------------------------
 
     # Method to check existence of a distant resource.
-    @classmethod
+    @vip.clientmethod
     def _exists(cls, path, location="vip") -> bool:
         """
         Checks existence of a distant resource (`location`="vip").
@@ -941,7 +1135,7 @@ class VipLauncher:
             raise NotImplementedError(f"Unknown location: {location}")
         # Check path existence
         try:
-            return vip.exists(str(path))
+            return cls._api().exists(str(path))
         except RuntimeError as vip_error:
             # Connection error with VIP
             cls._handle_vip_error(vip_error)
@@ -954,7 +1148,7 @@ class VipLauncher:
     # ------------------------------------------------
 
     # Method to create a distant directory
-    @classmethod
+    @vip.clientmethod
     def _create_dir(cls, path: PurePath, location="vip") -> None:
         """
         Creates a directory at `path`, on VIP servers if `location` is "vip".
@@ -967,7 +1161,7 @@ class VipLauncher:
             raise NotImplementedError(f"Unknown location: {location}")
         # Create directory
         try:
-            if not vip.create_dir(str(path)):
+            if not cls._api().create_dir(str(path)):
                 msg = f"The following directoy could not be created on VIP:\n\t{path}\n"
                 msg += f"Please retry later. Contact VIP support ({cls._VIP_SUPPORT}) if this cannot be fixed."
                 raise AssertionError(msg)
@@ -982,7 +1176,7 @@ class VipLauncher:
     # ------------------------------------------------
 
     # Function to delete a path
-    @classmethod
+    @vip.clientmethod
     def _delete_path(cls, path: PurePath, location="vip") -> None:
         """
         Deletes `path` on `location`. Raises an error if the file exists and could not be removed.
@@ -991,9 +1185,9 @@ class VipLauncher:
         if location != "vip":
             raise NotImplementedError(f"Unknown location: {location}")
         # Try path deletion
-        done = vip.delete_path(str(path))
+        done = cls._api().delete_path(str(path))
         # VIP Errors are handled by returning False in `vip.delete_path()`.
-        if not done and vip.exists(str(path)):
+        if not done and cls._api().exists(str(path)):
             # Raise a generic error if deletion did not work
             msg = f"\n'{path}' could not be removed from VIP servers.\n"
             msg += (
@@ -1004,7 +1198,7 @@ class VipLauncher:
     # ------------------------------------------------
 
     # Function to delete a path on VIP with warning
-    @classmethod
+    @vip.clientmethod
     def _delete_and_check(cls, path: PurePath, location="vip", timeout=300) -> bool:
         """
         Deletes `path` on `location` and waits until `path` is actually removed.
@@ -1018,6 +1212,8 @@ class VipLauncher:
         while (t < timeout) and cls._exists(path, location):
             time.sleep(2)
             t = time.time() - start
+            # Forget the cached existence of `path` before checking again
+            cls._api().paths.invalidate(str(path))
         # Check if the data have indeed been removed
         return t < timeout
 
@@ -1028,7 +1224,7 @@ class VipLauncher:
     ##########################################################
 
     # Method to create a directory leaf on the top of any path, at any location
-    @classmethod
+    @vip.clientmethod
     def _mkdirs(cls, path: PurePath, location: str, **kwargs) -> str:
         """
         Creates each non-existent directory in `path` (like os.mkdirs()),
@@ -1129,10 +1325,23 @@ class VipLauncher:
         """
         Under this context, the session will not print anything.
         """
-        verbose = cls._VERBOSE  # save verbose mode
-        cls._VERBOSE = False  # silence instance logs
-        yield
-        cls._VERBOSE = verbose  # restore verbose mode
+        silenced = getattr(cls._silenced, "on", False)  # save verbose mode
+        cls._silenced.on = True  # silence class logs in this thread
+        try:
+            yield
+        finally:
+            cls._silenced.on = silenced  # restore verbose mode
+
+    # ------------------------------------------------
+
+    # Default verbose mode of new instances and class methods
+    @vip.clientmethod
+    def _default_verbose(cls) -> bool:
+        """
+        Returns the default verbose mode of the client (see init()),
+        or False if class logs are silenced in this thread (see _silent_class()).
+        """
+        return cls._api().verbose and not getattr(cls._silenced, "on", False)
 
     # ------------------------------------------------
 
@@ -1175,6 +1384,15 @@ class VipLauncher:
             ]
         )
 
+    # VIP client of the instance
+    @vip.clientmethod
+    def _api(cls) -> vip.Client:
+        """
+        Returns the VIP client of the instance (or class) if any,
+        otherwise the current client of `vip`.
+        """
+        return cls._client if cls._client is not None else vip.get_client()
+
     def _init_exec(self) -> str:
         """
         Initiates one VIP workflow with local properties `pipeline_id`, `session_name`, `input_settings`, `output_dir`.
@@ -1182,7 +1400,7 @@ class VipLauncher:
         - Raises RuntimeError in case of error from VIP
         """
         try:
-            return vip.init_exec(
+            return self._api().init_exec(
                 pipeline=self.pipeline_id,
                 name=self.session_name,
                 inputValues=self.input_settings,
@@ -1276,9 +1494,58 @@ class VipLauncher:
 
     # ------------------------------------------------
 
+    # Update workflows until all executions are over
+    def _wait_workflows(self, refresh_time=30):
+        """
+        Updates the workflow inventory until all executions are over.
+        - The time between updates is given by `self._next_refresh(refresh_time)`;
+        - Yields each status change (see `self._update_workflows()`).
+        """
+        errors = 0  # Consecutive connection errors
+        elapsed_time = 0  # Duration of the last update
+        while self._still_running():
+            # Sleep until next iteration (longer after errors)
+            time.sleep(max(self._next_refresh(refresh_time, errors) - elapsed_time, 0))
+            # Keep track of time
+            start = time.time()
+            # Update the workflow status & discard connection errors
+            try:
+                events = self._update_workflows()
+            except Exception as e:
+                # Back off after connection errors (VIP errors included)
+                if (
+                    isinstance(e, (RuntimeError, OSError))
+                    and errors < self._MAX_MONITOR_ERRORS
+                ):
+                    errors += 1
+                    elapsed_time = 0
+                    self._print(f"(!) Unable to update the workflows ({e}). Retrying later.")
+                    continue
+                # Print warning message
+                self._print(
+                    "(!) Connection with VIP was interrupted following an unexpected error (see below)."
+                )
+                self._print(
+                    "    This does not affect your executions on VIP servers."
+                )
+                self._print(
+                    "    Relaunch monitor_workflows() or visit the VIP portal to see their current status.\n"
+                )
+                # Save the session
+                self._save()
+                # Raise the error
+                raise e
+            errors = 0
+            elapsed_time = time.time() - start
+            # Transmit the status changes
+            yield from events
+
+    # ------------------------------------------------
+
     def _still_running(self) -> int:
         """
-        Returns the number of workflows which are still running on VIP.
+        Returns the number of workflows which are still running on VIP,
+        including failed workflows waiting for a retry (see set_retry_policy()).
         (!) Requires prior call to self._update_workflows to avoid unnecessary connexions to VIP
         """
         # Workflow count
@@ -1287,25 +1554,99 @@ class VipLauncher:
             # Update count
             count += int(self._workflows[wid]["status"] == "Running")
         # Return count
-        return count
+        return count + len(self._pending_retries())
 
     # ------------------------------------------------
 
     # Update all worflow information at once
-    def _update_workflows(self) -> None:
+    def _update_workflows(self, executions: dict = None) -> list:
         """
         Updates the status of each workflow in the inventory.
-        """
+        Statuses are obtained in bulk from the list of executions on VIP
+        (`executions`, if provided by the caller: see `self._get_executions()`).
+        Execution info is requested only for workflows whose status changed 
+        (or is missing from the list), and once for finished workflows without outputs.
+        The duration of workflows that just finished is added to the local history.
+        Failed workflows are relaunched according to the retry policy, if any (see set_retry_policy()).
+
+        Returns the status changes as a list of tuples: (`workflow_id`, `previous_status`, `new_status`).
+        Relaunched workflows are returned with `previous_status` = None.
+        """
+        # Current state of all executions in a single request
+        if executions is None:
+            executions = self._get_executions()
+        # Status changes & durations of the workflows which just finished
+        events, durations = [], []
+        if self._resolved is None:
+            self._resolved = set()
         for wid in self._workflows:
+            workflow = self._workflows[wid]
             # Check if workflow data have been removed
-            if self._workflows[wid]["status"] != "Removed":
+            if workflow["status"] == "Removed":
+                continue
+            # Check if the workflow needs an update
+            status = executions[wid]["status"] if wid in executions else None
+            if (
+                status is None
+                or status != workflow["status"]
+                or (
+                    status == "Finished"
+                    and not workflow.get("outputs")
+                    and wid not in self._resolved
+                )
+            ):
+                previous_status = workflow["status"]
                 # Recall execution info & update the workflow status
-                self._workflows[wid].update(self._get_exec_infos(wid))
+                workflow.update(self._get_exec_infos(wid))
+                # Outputs of finished workflows are final (even if empty)
+                if workflow["status"] == "Finished":
+                    self._resolved.add(wid)
+                if workflow["status"] != previous_status:
+                    events.append((wid, previous_status, workflow["status"]))
+                # Keep track of the execution duration
+                if previous_status == "Running" and workflow["status"] == "Finished":
+                    duration = self._observe_duration(wid, executions.get(wid, {}))
+                    if duration is not None:
+                        durations.append(duration)
+        # Save the new durations at once
+        if durations:
+            self._save_durations(self._pipeline_id, durations)
+            self._durations = None
+        # Relaunch failed workflows (if a retry policy is set)
+        if self._retry_policy:
+            events += self._retry_workflows()
+        # Keep track of time
+        self._last_update = time.time()
+        return events
+
+    # ------------------------------------------------
+
+    # Method to get the state of all executions at once
+    @vip.clientmethod
+    def _get_executions(cls) -> dict:
+        """
+        Returns the executions listed on VIP, as a dictionnary: {workflow_id: execution info}.
+        Returns an empty dictionnary if the list cannot be obtained, 
+        so that workflows are updated one by one.
+        """
+        try:
+            executions = cls._api().list_executions()
+        except RuntimeError as vip_error:
+            cls._printc(
+                f"(!) The executions could not be listed ({vip_error}).",
+                "Workflows are updated one by one."
+            )
+            return {}
+        return {
+            execution["identifier"]: execution
+            for execution in executions
+            if "identifier" in execution and "status" in execution
+        }
 
     # ------------------------------------------------
 
     # Method to get useful information about a given workflow
-    @classmethod
+    @vip.clientmethod
     def _get_exec_infos(cls, workflow_id: str) -> dict:
         """
         Returns succint information on `workflow_id`:
@@ -1315,7 +1656,7 @@ class VipLauncher:
         """
         # Get execution infos
         try:
-            infos = vip.execution_info(workflow_id)
+            infos = cls._api().execution_info(workflow_id)
         except RuntimeError as vip_error:
             cls._handle_vip_error(vip_error)
         # Return filtered information
@@ -1334,6 +1675,242 @@ class VipLauncher:
 
     # ------------------------------------------------
 
+    ##################################################
+    # Execution durations & adaptive monitoring
+    ##################################################
+
+    # Starting time of a workflow
+    def _start_time(self, workflow_id: str) -> float:
+        """Returns the starting time of `workflow_id` (seconds since the epoch)"""
+        return time.mktime(
+            time.strptime(self._workflows[workflow_id]["start"], "%Y/%m/%d %H:%M:%S")
+        )
+
+    # Load the history of execution durations
+    @classmethod
+    def _load_durations(cls) -> dict:
+        """
+        Returns the durations observed for each pipeline, as a dictionnary:
+        {pipeline_id: [durations (seconds)]}.
+        """
+        if cls._DURATIONS_FILE is None or not os.path.isfile(cls._DURATIONS_FILE):
+            return {}
+        try:
+            with open(cls._DURATIONS_FILE, "r") as file:
+                return json.load(file)
+        except (OSError, json.decoder.JSONDecodeError):
+            # The history is only used to plan updates
+            return {}
+
+    # Add new durations to the history
+    @classmethod
+    def _save_durations(cls, pipeline_id: str, durations: list) -> None:
+        """
+        Adds `durations` (seconds) to the history of `pipeline_id`, in a single write.
+        Only the last `_DURATIONS_HISTORY` durations are kept.
+        """
+        if cls._DURATIONS_FILE is None:
+            return
+        # Update the history atomically, under a lock shared by all processes
+        try:
+            os.makedirs(os.path.dirname(cls._DURATIONS_FILE), exist_ok=True)
+            with cls._locked_file(Path(f"{cls._DURATIONS_FILE}.lock")):
+                history = cls._load_durations()
+                samples = history.get(pipeline_id, []) + [round(d) for d in durations]
+                history[pipeline_id] = samples[-cls._DURATIONS_HISTORY :]
+                tmp_file = f"{cls._DURATIONS_FILE}.{os.getpid()}.tmp"
+                with open(tmp_file, "w") as file:
+                    json.dump(history, file)
+                os.replace(tmp_file, cls._DURATIONS_FILE)
+        except OSError:
+            # The history is only used to plan updates
+            pass
+
+    # Keep track of the duration of a finished workflow
+    def _observe_duration(self, workflow_id: str, execution: dict) -> float:
+        """
+        Returns the duration of `workflow_id`, which just finished (seconds).
+        - The end date is read from `execution` (as listed by VIP) if available;
+        - Otherwise the end is estimated by the current update, unless this instance 
+        did not follow the workflow (no previous update): returns None in this case.
+        """
+        if execution.get("endDate") and execution.get("startDate"):
+            duration = (execution["endDate"] - execution["startDate"]) / 1000
+        elif self._last_update is not None:
+            duration = time.time() - self._start_time(workflow_id)
+        else:
+            return None
+        return duration if duration > 0 else None
+
+    # Durations observed for the current pipeline
+    def _pipeline_durations(self) -> list:
+        """
+        Returns the sorted durations observed for the current pipeline (seconds).
+        The history is read once, until new durations are saved by this instance.
+        """
+        if not self._is_defined("_pipeline_id"):
+            return []
+        if self._durations is None or self._durations[0] != self._pipeline_id:
+            durations = sorted(self._load_durations().get(self._pipeline_id, []))
+            self._durations = (self._pipeline_id, durations)
+        return self._durations[1]
+
+    # Expected duration of the current pipeline
+    def _expected_duration(self, quantile=0.5) -> float:
+        """
+        Returns the `quantile` of the durations observed for the current pipeline (seconds).
+        Returns None if no duration was observed.
+        """
+        durations = self._pipeline_durations()
+        if not durations:
+            return None
+        return durations[int(quantile * (len(durations) - 1))]
+
+    # Expected remaining time for 1 workflow
+    def workflow_eta(self, workflow_id: str) -> float:
+        """
+        Returns the expected remaining time for `workflow_id` (seconds),
+        based on the durations observed for the current pipeline:
+        - 0 if the workflow is not running;
+        - None if no duration was observed for this pipeline.
+
+        /!\ Status is not updated: call monitor_workflows() to get the current status.
+        """
+        return self._workflow_eta(workflow_id, self._expected_duration())
+
+    def _workflow_eta(self, workflow_id: str, expected: float) -> float:
+        """Same as workflow_eta(), with the `expected` duration of the pipeline"""
+        if self._workflows[workflow_id]["status"] != "Running":
+            return 0
+        if expected is None:
+            return None
+        return max(expected - (time.time() - self._start_time(workflow_id)), 0)
+
+    # Expected remaining time for the whole session
+    def session_eta(self) -> float:
+        """
+        Returns the expected remaining time until all workflows are over (seconds):
+        - 0 if no workflow is running;
+        - None if no duration was observed for the current pipeline.
+
+        /!\ Status is not updated: call monitor_workflows() to get the current status.
+        """
+        expected = self._expected_duration()
+        etas = [self._workflow_eta(wid, expected) for wid in self._workflows]
+        if None in etas:
+            return None
+        return max(etas, default=0)
+
+    # Time to wait before the next update
+    def _next_refresh(self, refresh_time: float, errors=0) -> float:
+        """
+        Returns the time to wait before the next workflow update (seconds):
+        - Half the time left before the earliest expected end among running workflows;
+        - `refresh_time` near (or after) this end, or if no duration was observed;
+        - This time is doubled after each of the `errors` consecutive errors;
+        - The next retry of a failed workflow (if any) is not waited longer.
+        The result lies between min(`refresh_time`, 1) and `_MAX_REFRESH_FACTOR` * `refresh_time`.
+        """
+        wait = refresh_time
+        # Short executions of the current pipeline
+        earliest = self._expected_duration(quantile=0.1)
+        running = [
+            wid for wid in self._workflows if self._workflows[wid]["status"] == "Running"
+        ]
+        if earliest is not None and running:
+            now = time.time()
+            remaining = min(earliest - (now - self._start_time(wid)) for wid in running)
+            wait = max(wait, remaining / 2)
+        # Back off after errors
+        wait *= 2**errors
+        wait = min(wait, self._MAX_REFRESH_FACTOR * refresh_time)
+        # Wake up for the next retry
+        retries = self._pending_retries()
+        if retries:
+            wait = min(wait, max(min(retries.values()) - time.time(), 0))
+        # Never poll VIP in a tight loop
+        return max(wait, min(refresh_time, 1))
+
+    # ------------------------------------------------
+
+    ##################################################
+    # Retry failed workflows
+    ##################################################
+
+    # Failed workflows waiting for a retry
+    def _pending_retries(self) -> dict:
+        """Returns the failed workflows waiting for a retry: {workflow_id: retry time}"""
+        if not self._retry_policy:
+            return {}
+        return {
+            wid: workflow["retry_at"]
+            for wid, workflow in self._workflows.items()
+            if "retry_at" in workflow
+        }
+
+    # Relaunch failed workflows
+    def _retry_workflows(self) -> list:
+        """
+        Applies the retry policy (see set_retry_policy()):
+        - Failed workflows are scheduled for a retry (`workflow["retry_at"]`),
+            with exponential backoff depending on their attempt number;
+        - Scheduled workflows are relaunched when their retry time is reached.
+            Old and new workflows are linked by their keys "retried_by" and "retry_of";
+        - A failed relaunch counts as an attempt and is scheduled again with backoff.
+
+        Returns the relaunched workflows as status changes: (`new_workflow_id`, None, `new_status`).
+        """
+        policy = self._retry_policy
+        now = time.time()
+        events = []
+        for wid, workflow in list(self._workflows.items()):
+            attempt = workflow.get("attempt", 1)
+            # Schedule new failures
+            if (
+                workflow["status"] in policy["status"]
+                and "retried_by" not in workflow
+                and "retry_at" not in workflow
+                and attempt < policy["max_attempts"]
+            ):
+                workflow["retry_at"] = now + policy["backoff_time"] * 2 ** (attempt - 1)
+            # Relaunch scheduled workflows
+            if "retry_at" in workflow and workflow["retry_at"] <= now:
+                try:
+                    new_wid = self._init_exec()
+                except RuntimeError as e:
+                    # Count the attempt & retry later (e.g., maximum number of executions)
+                    workflow["attempt"] = attempt = attempt + 1
+                    if attempt < policy["max_attempts"]:
+                        workflow["retry_at"] = now + policy["backoff_time"] * 2 ** (attempt - 1)
+                        self._print(f"(!) Unable to relaunch workflow {wid} ({e}). Retrying later.")
+                    else:
+                        del workflow["retry_at"]
+                        self._print(f"(!) Unable to relaunch workflow {wid} ({e}). No attempt left.")
+                    continue
+                # Record the new workflow before anything else (its status is updated below)
+                self._workflows[new_wid] = {
+                    "status": "Running",
+                    "start": time.strftime("%Y/%m/%d %H:%M:%S", time.localtime(now)),
+                    "outputs": [],
+                    "attempt": attempt + 1,
+                    "retry_of": wid,
+                }
+                # Link the workflows
+                del workflow["retry_at"]
+                workflow["retried_by"] = new_wid
+                self._save()
+                try:
+                    self._workflows[new_wid].update(self._get_exec_infos(new_wid))
+                except RuntimeError as e:
+                    # The status is updated with the other workflows
+                    self._print(f"(!) Unable to get the status of workflow {new_wid} ({e}).")
+                self._print(f"(!) Workflow {wid} ended with status: {workflow['status']}.", 
+                            f"Relaunched as: {new_wid} (attempt {attempt + 1}).")
+                events.append((new_wid, None, self._workflows[new_wid]["status"]))
+        return events
+
+    # ------------------------------------------------
+
     ##################################################
     # Save / load Session Metadata
     ##################################################
@@ -1353,32 +1930,152 @@ class VipLauncher:
         - Raises ValueError if the session names do not match;
         - Saves backup properties that are not included in the session data;
         - Returns a success flag;
-        - Displays information unless `_VERBOSE` is False.
+        - Displays information unless the verbose mode is False.
+
+        Write-behind: the last backup data are kept in memory, so the backup
+        is read only once and written only when its content changes.
+        Backups are written in the background after `_SAVE_DELAY` seconds,
+        which coalesces bursts of saves (see `_flush_backup()`).
+        In this case, returns False if the last background write failed
+        (its data are written again with the current data).
         """
         # Return if no-backup mode is activated
         if self._BACKUP_LOCATION is None:
             return False
+        # Failure of the last background write
+        with self._BACKUP_LOCK:
+            failed, self._backup_error = self._backup_error, None
+        if failed is not None:
+            self._print(f"(!) The last session backup failed: {failed}")
         # Get session properties
         session_data = self._data_to_save()
-        # Get backup data from the output directory
-        with self._silent_session():
-            backup_data = self._load_session(location=self._BACKUP_LOCATION)
-        # If there is no backup data (i.e. None or empty dict), save immediately
-        if not backup_data:
-            return self._save_session(session_data, location=self._BACKUP_LOCATION)
-        # If the session name is different from backup, raise an error
-        if backup_data["session_name"] != session_data["session_name"]:
-            raise ValueError(
-                f"The backup data have a different session name ('{backup_data['session_name']}').\n"
-                + "Please change the session name or provide another output directory."
-            )
-        # If the backup data have more properties than current session, save them along with session properties
-        new_props = set(backup_data.keys()) - set(session_data.keys())
-        if new_props:
-            # Update the data to save
-            session_data.update({prop: backup_data[prop] for prop in new_props})
-        # Save to target
-        return self._save_session(session_data, location=self._BACKUP_LOCATION)
+        # Get the last backup data (from memory if possible): pending, then written data
+        backup_key = self._backup_key()
+        with self._BACKUP_LOCK:
+            pending, backup = self._pending_backup, self._backup
+        if pending is not None and pending[0] == backup_key:
+            backup_data = pending[1]
+        elif pending is None and backup is not None and backup[0] == backup_key:
+            backup_data = backup[1]
+        else:
+            # Write the pending backup (if any) before reading the backup file
+            self._flush_backup()
+            with self._silent_session():
+                backup_data = self._load_session(location=self._BACKUP_LOCATION)
+        # If there is backup data (i.e. not None or empty dict), merge it
+        if backup_data:
+            # If the session name is different from backup, raise an error
+            if backup_data["session_name"] != session_data["session_name"]:
+                raise ValueError(
+                    f"The backup data have a different session name ('{backup_data['session_name']}').\n"
+                    + "Please change the session name or provide another output directory."
+                )
+            # If the backup data have more properties than current session, save them along with session properties
+            new_props = set(backup_data.keys()) - set(session_data.keys())
+            if new_props:
+                # Update the data to save
+                session_data.update({prop: backup_data[prop] for prop in new_props})
+            # Nothing to write if the content did not change (and nothing is waiting)
+            if failed is None and json.dumps(session_data, sort_keys=True) == json.dumps(
+                backup_data, sort_keys=True
+            ):
+                with self._BACKUP_LOCK:
+                    if self._pending_backup is None:
+                        self._backup = (backup_key, backup_data)
+                return True
+        # Snapshot of the data to save (session data may change during a background write)
+        session_data = json.loads(json.dumps(session_data))
+        with self._BACKUP_LOCK:
+            self._pending_backup = (backup_key, session_data)
+        # Save to target immediately
+        if not self._SAVE_DELAY:
+            return self._flush_backup()
+        # Save to target in the background, with the client of this thread
+        with self._BACKUP_LOCK:
+            if self._backup_writer is None:
+                self._backup_flush = threading.Event()
+                self._backup_writer = threading.Thread(
+                    target=self._write_backup, args=(self._api(),), name="vip_backup"
+                )
+                self._backup_writer.start()
+        return failed is None
+
+    # ------------------------------------------------
+
+    # Identify the backup file
+    def _backup_key(self) -> tuple:
+        """Returns a key identifying the current backup file (location & output directory)"""
+        return (self._BACKUP_LOCATION, str(self.output_dir))
+
+    # ------------------------------------------------
+
+    # Background writer of session backups
+    def _write_backup(self, client: vip.Client) -> None:
+        """
+        Waits for `_SAVE_DELAY` seconds (or until `_flush_backup()` is called),
+        then writes the pending backups with `client` until there is none.
+        This thread is not daemonic: pending backups are written before Python exits.
+        """
+        self._backup_flush.wait(self._SAVE_DELAY)
+        with client.use():
+            self._write_pending(release_writer=True)
+
+    # ------------------------------------------------
+
+    # Write the pending backups
+    def _write_pending(self, release_writer=False) -> bool:
+        """
+        Writes the pending backups until there is none. Returns a success flag.
+        - The last backup data (`_backup`) are updated after each successful write;
+        - In case of failure, the data stay pending and the error is kept in `_backup_error`;
+        - If `release_writer` is True, the background writer is released when the writes end.
+        """
+        while True:
+            with self._BACKUP_LOCK:
+                pending = self._pending_backup
+                self._pending_backup = None
+                # Release the writer when there is nothing left to write
+                if pending is None:
+                    if release_writer:
+                        self._backup_writer = None
+                    return True
+            try:
+                done = self._save_session(pending[1], location=self._BACKUP_LOCATION)
+                error = None if done else "the backup could not be written"
+            except Exception as e:
+                error = e
+            with self._BACKUP_LOCK:
+                if error is None:
+                    self._backup = pending
+                    self._backup_error = None
+                    continue
+                # Keep the data for the next write (unless newer data are pending)
+                if self._pending_backup is None:
+                    self._pending_backup = pending
+                self._backup_error = error
+                if release_writer:
+                    self._backup_writer = None
+                return False
+
+    # ------------------------------------------------
+
+    # Write the pending backup now
+    def _flush_backup(self) -> bool:
+        """
+        Writes the pending session backup (if any) and waits for the end of the write.
+        Backups which failed in the background are written again.
+        Returns False if the backup could not be written, True otherwise.
+        """
+        writer = self._backup_writer
+        if writer is threading.current_thread():
+            return True
+        if writer is not None:
+            self._backup_flush.set()
+            writer.join()
+        # Write the data left by a failed write
+        if self._pending_backup is not None and self._backup_writer is None:
+            return self._write_pending()
+        return self._backup_error is None
 
     # ------------------------------------------------
 
@@ -1393,11 +2090,16 @@ class VipLauncher:
         # Return if no-backup mode is activated
         if not self._BACKUP_LOCATION:
             return False
+        # Write the pending backup (if any) before reading the backup file
+        self._flush_backup()
         # Get backup data from the output directory
         backup_data = self._load_session(location=self._BACKUP_LOCATION)
         # Case: no backup data (None or empty dict)
         if not backup_data:
             return False
+        # Keep the backup data in memory (see _save())
+        with self._BACKUP_LOCK:
+            self._backup = (self._backup_key(), json.loads(json.dumps(backup_data)))
         # Get current session properties
         session_data = self._data_to_save()
         # If session properties are undefined, set them silently and return
@@ -1454,7 +2156,7 @@ class VipLauncher:
         """
         Saves dictionary `session_data` to a JSON file, in the output directory at `location`.
         Returns a success flag.
-        Displays success / failure unless `_VERBOSE` is False.
+        Displays success / failure unless the verbose mode is False.
         """
         # Thow error if location is unknown
         if location != "vip":
@@ -1463,11 +2165,6 @@ class VipLauncher:
             )
         # Display
         self._print(f"\nSaving session properties ...")
-        # Temporary file to save session data
-        tmp_file = Path("tmp_save.json")
-        # Save the data in JSON format
-        with tmp_file.open("w") as outfile:
-            json.dump(session_data, outfile, indent=4)
         # Path to the backup file on VIP
         vip_file = self._vip_output_dir / self._SAVE_FILE
         # Make the output directory if it does not exist
@@ -1475,10 +2172,13 @@ class VipLauncher:
         # Delete the previous file if it exists
         if not is_new:
             self._delete_and_check(vip_file, location=location, timeout=30)
-        # Send the temportary file on VIP (no error raised)
-        done = self._upload_file(tmp_file, vip_file)
-        # Delete the temporary file
-        tmp_file.unlink()
+        # Temporary file to save session data (unique to this process)
+        with self._tmp_file(suffix="_save.json") as tmp_file:
+            # Save the data in JSON format
+            with tmp_file.open("w") as outfile:
+                json.dump(session_data, outfile, indent=4)
+            # Send the temportary file on VIP (no error raised)
+            done = self._upload_file(tmp_file, vip_file)
         # Display
         self._print()
         if done and is_new:
@@ -1514,20 +2214,18 @@ class VipLauncher:
         vip_file = self._vip_output_dir / self._SAVE_FILE
         if not self._exists(vip_file, location=location):
             return None
-        # Temporary file for download
-        tmp_file = Path("tmp_load.json")
-        # Download the file
-        done = self._download_file(vip_file, tmp_file)
-        if not (done and tmp_file.exists()):
-            self._print(
-                "\n(!) Unable to load backup data from session's output directory\n"
-            )
-            return None
-        # Load the JSON file
-        with tmp_file.open() as fid:
-            session_data = json.load(fid)
-        # Delete the temporary file
-        tmp_file.unlink()
+        # Temporary file for download (unique to this process)
+        with self._tmp_file(suffix="_load.json") as tmp_file:
+            # Download the file
+            done = self._download_file(vip_file, tmp_file)
+            if not (done and tmp_file.exists()):
+                self._print(
+                    "\n(!) Unable to load backup data from session's output directory\n"
+                )
+                return None
+            # Load the JSON file
+            with tmp_file.open() as fid:
+                session_data = json.load(fid)
         # Display success
         self._print("<< Session restored from its output directory\n")
         # Return
@@ -1535,8 +2233,63 @@ class VipLauncher:
 
     # ------------------------------------------------
 
+    # Temporary file which cannot conflict with other sessions
+    @staticmethod
+    @contextmanager
+    def _tmp_file(suffix: str = "") -> Path:
+        """
+        Under this context, yields the path to a new temporary file,
+        unique to this process and thread. The file is deleted on exit.
+        """
+        fid, tmp_file = tempfile.mkstemp(prefix="vip_", suffix=suffix)
+        os.close(fid)
+        tmp_file = Path(tmp_file)
+        try:
+            yield tmp_file
+        finally:
+            if tmp_file.exists():
+                tmp_file.unlink()
+
+    # ------------------------------------------------
+
+    # Lock shared by several processes
+    @staticmethod
+    @contextmanager
+    def _locked_file(lock_file: Path, shared=False, attempts=6) -> None:
+        """
+        Under this context, holds an advisory lock on `lock_file`,
+        so that several processes can update the same files safely.
+        - `shared`: lock for reading (not exclusive, except on Windows).
+        - `attempts`: on Windows, number of attempts to get the lock (about 10 seconds each)
+            before raising TimeoutError.
+        """
+        with lock_file.open("a") as fid:
+            if fcntl is not None:
+                fcntl.flock(fid, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            else:
+                # Windows: LK_LOCK raises OSError after 10 seconds
+                fid.seek(0)
+                for attempt in range(attempts):
+                    try:
+                        msvcrt.locking(fid.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        time.sleep(1)
+                else:
+                    raise TimeoutError(f"Could not lock {lock_file} after {attempts} attempts.")
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fid, fcntl.LOCK_UN)
+                else:
+                    fid.seek(0)
+                    msvcrt.locking(fid.fileno(), msvcrt.LK_UNLCK, 1)
+
+    # ------------------------------------------------
+
     # Function to download a single file from VIP
-    @classmethod
+    @vip.clientmethod
     def _download_file(cls, vip_path: PurePosixPath, local_path: Path) -> bool:
         """
         Downloads a single file in `vip_path` to `local_path`.
@@ -1544,14 +2297,14 @@ class VipLauncher:
         """
         # Download (file existence is not checked to save time)
         try:
-            return vip.download(str(vip_path), str(local_path))
+            return cls._api().download(str(vip_path), str(local_path))
         except RuntimeError as vip_error:
             return False
 
     # ------------------------------------------------
 
     # Function to upload a single file on VIP
-    @classmethod
+    @vip.clientmethod
     def _upload_file(cls, local_path: Path, vip_path: PurePosixPath) -> bool:
         """
         Uploads a single file in `local_path` to `vip_path`.
@@ -1559,7 +2312,7 @@ class VipLauncher:
         """
         # Upload
         try:
-            return vip.upload(str(local_path), str(vip_path))
+            return cls._api().upload(str(local_path), str(vip_path))
         except RuntimeError as vip_error:
             return False
 
@@ -1609,10 +2362,11 @@ class VipLauncher:
                 )
             pipeline_id = self._pipeline_id
         # Available pipelines
-        if not self._AVAILABLE_PIPELINES:
+        available_pipelines = self._api().pipelines
+        if not available_pipelines:
             return False
         # Check pipeline identifier
-        if pipeline_id not in self._AVAILABLE_PIPELINES:
+        if pipeline_id not in available_pipelines:
             raise ValueError(
                 f"'{pipeline_id}' is not a valid pipeline identifier.\n"
                 + f"Run {self.__name__}.show_pipeline() to show available pipelines."
@@ -1623,34 +2377,35 @@ class VipLauncher:
     # ------------------------------------------------
 
     # Function that lists available pipeline identifiers for a given VIP accout
-    @classmethod
+    @vip.clientmethod
     def _get_available_pipelines(cls) -> list:
         """
-        Updates the list of available pipelines (`cls._AVAILABLE_PIPELINES`) for current VIP account
+        Updates the list of available pipelines (`pipelines` of the VIP client) for current VIP account
         (defined by user API key). Returns the same list.
         """
+        client = cls._api()
         try:
-            all_pipelines = vip.list_pipeline()
+            all_pipelines = client.list_pipeline()
         except RuntimeError as vip_error:
             cls._handle_vip_error(vip_error)
-        cls._AVAILABLE_PIPELINES = [
+        client.pipelines = [
             pipeline["identifier"]
             for pipeline in all_pipelines
             if pipeline["canExecute"] is True
         ]
-        return cls._AVAILABLE_PIPELINES
+        return client.pipelines
 
     # ------------------------------------------------
 
     # Get pipeline definition
-    @classmethod
+    @vip.clientmethod
     def _get_pipeline_def(cls, pipeline_id) -> dict:
         """
         Gets the full definition of `pipeline_id` from VIP.
         Raises RuntimeError if fails to communicate with VIP.
         """
         try:
-            return vip.pipeline_def(pipeline_id)
+            return cls._api().pipeline_def(pipeline_id)
         except RuntimeError as vip_error:
             cls._handle_vip_error(vip_error)
 
@@ -1662,11 +2417,21 @@ class VipLauncher:
         """
         Parses the input settings, i.e.:
         - Converts all input paths to PathLib objects
+            (lists of inputs are stored as InputList objects)
         - Leave the other parameters untouched.
         """
 
+        # Function to convert a VIP path to its string form (None if `input` is not a VIP path)
+        def parse_path(input):
+            if str(input).startswith(self._SERVER_PATH_PREFIX):
+                return self._posix_path(input)
+            return None
+
         # Function to convert VIP paths to PurePath objects
         def parse_value(input):
+            # Case: list of strings / paths
+            if InputList.accepts(input):
+                return InputList.parse(input, parse_path)
             # Case: multiple inputs
             if isinstance(input, list):
                 return [parse_value(element) for element in input]
@@ -1686,6 +2451,15 @@ class VipLauncher:
         # Return the parsed value of each input
         return {key: parse_value(value) for key, value in input_settings.items()}
 
+    # String form of a Posix path, without building PathLib objects when possible
+    @staticmethod
+    def _posix_path(path) -> str:
+        """Returns `str(PurePosixPath(path))`, faster for paths that are already normalized."""
+        path = str(path)
+        if "//" in path or "/." in path or path.endswith("/") or path.startswith("."):
+            return str(PurePosixPath(path))
+        return path
+
     # Get the input settings after files are parsed as PathLib objects
     def _get_input_settings(self, location="vip") -> dict:
         """
@@ -1693,7 +2467,11 @@ class VipLauncher:
         `location` is destined to subclasses.
         """
         return {
-            key: [str(v) for v in value] if isinstance(value, list) else str(value)
+            key: (
+                value.bind(None, str) if isinstance(value, InputList)
+                else [str(v) for v in value] if isinstance(value, list)
+                else str(value)
+            )
             for key, value in self._input_settings.items()
         }
 
@@ -1711,7 +2489,7 @@ class VipLauncher:
         Use the same nomenclature as defined in self._exists() (e.g., `location="vip"`).
 
         Detailed output:
-            - Prints warnings if _VERBOSE is True.
+            - Prints warnings if the verbose mode is True.
             - Raises AttributeError if the input settings or pipeline identifier were not found.
             - Raises TypeError if some input parameter is missing.
             - Raises ValueError if some input value does not the fit with the pipeline definition.
@@ -1812,10 +2590,11 @@ class VipLauncher:
             # If input is a File, check file(s) existence
             if param["type"] == "File":
                 # Ensure every file exists at `location`
-                missing_file = self._first_missing_file(value, location)
-                if missing_file:
+                missing_files = self._missing_files(value, location)
+                if missing_files:
                     raise FileNotFoundError(
-                        f"Parameter '{name}': The following file is missing in the {location.upper()} file system:\n\t{missing_file}"
+                        f"Parameter '{name}': The following file(s) are missing in the {location.upper()} file system:\n\t"
+                        + "\n\t".join(missing_files)
                     )
             # Check other input formats ?
             else:
@@ -1832,7 +2611,7 @@ class VipLauncher:
         if isinstance(value, list) and cls._isinstance(
             value, str
         ):  # Case: list of strings
-            return all([(len(v) > 0) for v in value])
+            return "" not in value
         elif isinstance(value, (str, list)):  # Case: list or string
             return len(value) > 0
         else:  # Case: other
@@ -1847,7 +2626,7 @@ class VipLauncher:
         Returns True if `value` is instance of `type` or a list of `type`.
         """
         if isinstance(value, list):
-            return all([isinstance(v, type) for v in value])
+            return all(isinstance(v, type) for v in value)
         else:
             return isinstance(value, type)
 
@@ -1861,9 +2640,10 @@ class VipLauncher:
         """
         # Get a set of invalid characters
         if isinstance(value, list):
-            characters = {
-                v for val in value for v in cls._INVALID_CHARS_FOR_VIP.findall(str(val))
-            }
+            # Scan all values at once ('/' is a valid separator)
+            characters = set(
+                cls._INVALID_CHARS_FOR_VIP.findall("/".join(map(str, value)))
+            )
         else:
             characters = set(cls._INVALID_CHARS_FOR_VIP.findall(str(value)))
         # Special correction for Windows paths
@@ -1875,22 +2655,32 @@ class VipLauncher:
     # ------------------------------------------------
 
     # Function to assert file existence in the input settings
-    @classmethod
-    def _first_missing_file(cls, value, location: str) -> str:
+    @vip.clientmethod
+    def _missing_files(cls, value, location: str) -> list:
         """
-        Returns the path the first non-existent file in `value` (None by default).
+        Returns the paths of all non-existent files in `value`, in input order (empty list by default).
         - `value` can contain a single file path or a list of paths.
         - `location` refers to the storage infrastructure (e.g., "vip") to feed in cls._exists().
+        On VIP, files are checked by directory and in parallel (see `vip.exists_parallel()`).
         """
-        # Case : list of files
-        if isinstance(value, list):
-            for file in value:
-                if cls._first_missing_file(value=file, location=location) is not None:
-                    return file
-            return None
-        # Case: single file
+        # Unique files, in input order
+        files = list(dict.fromkeys(value if isinstance(value, list) else [value]))
+        # Case: VIP files
+        if location == "vip":
+            try:
+                existence = cls._api().exists_parallel(files)
+            except RuntimeError as vip_error:
+                # Connection error with VIP
+                cls._handle_vip_error(vip_error)
+            except json.decoder.JSONDecodeError:
+                raise ValueError(
+                    "Some input files generated an error on VIP.\n"
+                    + "Please check these paths or retry later."
+                )
+            return [file for file in files if not existence[file]]
+        # Case: other file systems
         else:
-            return value if not cls._exists(path=value, location=location) else None
+            return [file for file in files if not cls._exists(path=file, location=location)]
 
     # ------------------------------------------------
 
@@ -1909,7 +2699,7 @@ class VipLauncher:
         """
         Prints session logs.
         Behaves as Python built-in `print()` function with two additional conditions:
-        1. Does not print anything if `self.verbose` or `self._VERBOSE` is False,
+        1. Does not print anything if `self.verbose` is False,
         2. The number of blank lines before and after the log is framed between `min_space` and `max_space`
             (`min_space`=-1 means the log may end without newline).
         """
@@ -1988,7 +2778,7 @@ class VipLauncher:
         # Trim the newlines a the end of the message
         message = message.rstrip("\n") + "\n" * nb_nl_end()
         # Print the message with the rest of keywords arguments
-        self._printc(message, end="", **kwargs)
+        print(message, end="", **kwargs)
 
     # ------------------------------------------------
 
@@ -1996,13 +2786,13 @@ class VipLauncher:
     @classmethod
     def _printc(cls, *args, wrapper: textwrap.TextWrapper = None, **kwargs) -> None:
         """
-        Print logs from class methods only when cls._VERBOSE is True.
+        Print logs from class methods only when the default verbose mode is True (see init()).
         Takes the same arguments a Python built-in function `print()',
         with one additional argument:
         - `wrapper` (textwrapper.TextWrapper) : TextWrapper object defining
             how to wrap the text with TextWrapper method "fill".
         """
-        if not cls._VERBOSE:
+        if not cls._default_verbose():
             return None
         # Get the message from arguments
         sep = kwargs.pop("sep") if "sep" in kwargs else " "
@@ -24,8 +24,6 @@ class VipLoader(VipClient):
     __name__ = "VipLoader"
     # Default verbose state
     _VERBOSE = True
-    # List of known directory contents
-    _VIP_TREE = {}
 
     ################
     ################ Public Methods ##################
@@ -55,17 +53,14 @@ class VipLoader(VipClient):
         # Assert folder existence on VIP
         if not cls._exists(vip_path, location="vip"):
             raise FileNotFoundError("Folder does not exist on VIP.")
-        # Scan the distant and local directories and get a list of files to download
-        cls._printc("\nCloning the distant folder tree")
-        cls._printc("-------------------------------")
-        files_to_download = cls._init_download_dir(vip_path, local_path)
-        cls._printc("-------------------------------")
-        cls._printc("Done.")
+        # Scan the distant and local directories while downloading the missing files.
+        # The folder tree is cloned lazily: downloads start with the first files found.
+        cls._printc("\nCloning the distant folder tree & downloading the files")
+        cls._printc("-------------------------------------------------------")
+        files_to_download = cls._iter_download_dir(vip_path, local_path)
         # Download the files from VIP servers & keep track of the failures
-        cls._printc("\nParallel download of the distant files")
-        cls._printc("--------------------------------------")
         failures = cls._download_parallel(files_to_download, unzip)
-        cls._printc("--------------------------------------")
+        cls._printc("-------------------------------------------------------")
         cls._printc("End of parallel downloads\n")
         if not failures:
             return
@@ -91,11 +86,12 @@ class VipLoader(VipClient):
     @classmethod
     def _list_content_vip(cls, vip_path: PurePosixPath, update=True) -> list[dict]:
         """
-        Updates `cls._VIP_TREE` with the content of `vip_path` on VIP servers.
+        Returns the content of `vip_path` on VIP servers.
+        If `update` is False, the content may come from the cache of the VIP client (see `vip.PathCache`).
         """
-        if update or (vip_path not in cls._VIP_TREE):
-            cls._VIP_TREE[vip_path] = vip.list_content(str(vip_path))
-        return cls._VIP_TREE[vip_path]
+        if update:
+            cls._api().paths.invalidate(str(vip_path))
+        return cls._api().list_content(str(vip_path))
 
     # ------------------------------------------------
 
@@ -172,6 +168,20 @@ class VipLoader(VipClient):
         Dictionary keys: (vip_path, local_path).
         Dictionary values: file metadata.
         """
+        return dict(cls._iter_download_dir(vip_path, local_path))
+
+    # ------------------------------------------------
+
+    @classmethod
+    def _iter_download_dir(cls, vip_path: PurePosixPath, local_path: Path):
+        """
+        Generator version of `_init_download_dir()`.
+        Copies the folder tree under `vip_path` to `local_path` while it is consumed.
+
+        Yields the files within `vip_path` that are not in `local_paths` as (key, value) pairs:
+        - key: (vip_path, local_path);
+        - value: file metadata.
+        """
         # First display
         cls._printc(f"{local_path} : ", end="")
         # Scan the current VIP directory
@@ -187,6 +197,7 @@ class VipLoader(VipClient):
             # The local directory already exists
             cls._printc("Already there.")
             # Scan it to check if there are more files to download
+            # (partial files do not count: their download will be resumed)
             local_filenames = {
                 elem.name for elem in local_path.iterdir() if elem.exists()
             }
@@ -196,86 +207,109 @@ class VipLoader(VipClient):
                 for element in all_files
                 if PurePosixPath(element["path"]).name not in local_filenames
             ]
-        # Return files to download as a dictionary
-        files_to_download = {}
+        # Yield the files to download
         for file in all_files:
-            # Dict key: VIP & local paths
+            # Key: VIP & local paths
             file_vip_path = PurePosixPath(file["path"])
             file_local_path = local_path / file_vip_path.name
-            files_to_download[(file_vip_path, file_local_path)] = {
-                # Dict value: Metadata
+            yield (file_vip_path, file_local_path), {
+                # Value: Metadata
                 key: value
                 for key, value in file.items()
                 if key != "path"
             }
+        # Get the sub-directories (from the cached directory content)
+        subdirs = cls._list_dir_vip(vip_path, update=False)
         # Recurse this function over sub-directories
-        for subdir in cls._list_dir_vip(vip_path, update=False):
+        for subdir in subdirs:
             subdir_path = PurePosixPath(subdir["path"])
             # Scan the subdirectory
-            new_files = cls._init_download_dir(
+            yield from cls._iter_download_dir(
                 vip_path=subdir_path,
                 local_path=local_path / subdir_path.name,
             )
-            # Update the list of files to download
-            files_to_download.update(new_files)
-        return files_to_download
 
     # ------------------------------------------------
 
     # Method do download files using parallel threads
     @classmethod
-    def _download_parallel(cls, files_to_download: dict, unzip: bool):
+    def _download_parallel(cls, files_to_download, unzip: bool) -> dict:
         """
         Downloads files from VIP using parallel threads.
         - `files_to_download`: Dictionnary with key: (vip_path, local_path) and value: metadata.
+            An iterator of (key, value) pairs can also be provided (e.g. from `_iter_download_dir()`):
+            it is consumed lazily, with a bounded number of downloads in progress.
         - `unzip`: if True, extracts the tarballs inplace after the download.
 
-        Returns a list of failed downloads.
+        Returns a dictionary of failed downloads.
         """
-        # Copy the input
-        files_to_download = files_to_download.copy()
-        # Return if there is no file to download
-        if not files_to_download:
-            cls._printc("No file to download.")
-            return files_to_download
-        # Check the amount of data
-        try:
-            total_size = "%.1fMB" % sum(
-                [file["size"] / (1 << 20) for file in files_to_download.values()]
+        if isinstance(files_to_download, dict):
+            # Return if there is no file to download
+            if not files_to_download:
+                cls._printc("No file to download.")
+                return {}
+            # Check the amount of data
+            try:
+                total_size = "%.1fMB" % sum(
+                    [file["size"] / (1 << 20) for file in files_to_download.values()]
+                )
+            except:
+                total_size = "unknown"
+            # Display
+            cls._printc(
+                f"Downloading {len(files_to_download)} file(s) (total size: {total_size})..."
             )
-        except:
-            total_size = "unknown"
-        # Display
-        cls._printc(
-            f"Downloading {len(files_to_download)} file(s) (total size: {total_size})..."
-        )
-        # Sort the files to download by size
-        try:
-            file_list = sorted(
-                files_to_download.keys(),
-                key=lambda file: files_to_download[file]["size"],
+            # Sort the files to download by size
+            try:
+                file_list = sorted(
+                    files_to_download.keys(),
+                    key=lambda file: files_to_download[file]["size"],
+                )
+            except:
+                file_list = list(files_to_download)
+            # Iterate over (key, value) pairs
+            nb_files = f"/{len(files_to_download)}"
+            files_to_download = (
+                (file, files_to_download[file]) for file in file_list
             )
-        except:
-            file_list = list(files_to_download)
+        else:
+            # The number of files is unknown
+            nb_files = ""
+        # Metadata of the files in progress
+        in_progress = {}
+        sizes = {}
+
+        # Feed the files to download, keeping track of their metadata
+        def feed():
+            for file, file_info in files_to_download:
+                in_progress[file] = file_info
+                if "size" in file_info:
+                    sizes[file] = file_info["size"]
+                yield file
+
         # Download the files from VIP servers
         nFile = 0
-        nb_files = len(files_to_download)
-        for file, done in vip.download_parallel(file_list):
+        failures = {}
+        meter = vip.TransferMeter()  # Keeps track of the downloaded bytes
+        for file, done in cls._api().download_parallel(feed(), sizes=sizes, progress=meter):
             nFile += 1
             # Get informations about the new file
             vip_path, local_path = file
-            file_info = files_to_download[file]
+            file_info = in_progress.pop(file)
+            sizes.pop(file, None)
             file_size = (
                 "[%.1fMB]" % (file_info["size"] / (1 << 20))
                 if "size" in file_info
                 else ""
             )
             if done:
-                # Remove file from the list
-                file_info = files_to_download.pop(file)
                 # Display success
                 cls._printc(
-                    f"- [{nFile}/{nb_files}] DONE:", local_path, file_size, flush=True
+                    f"- [{nFile}{nb_files}] DONE:",
+                    local_path,
+                    file_size,
+                    "(%.1fMB/s)" % (meter.throughput() / (1 << 20)),
+                    flush=True,
                 )
                 # If the output is a tarball, extract the files and delete the tarball
                 if unzip and tarfile.is_tarfile(local_path):
@@ -285,12 +319,17 @@ class VipLoader(VipClient):
                     else:
                         cls._printc("Extraction failed.")  # Display failure
             else:
+                # Keep track of the failure
+                failures[file] = file_info
                 # Display failure
                 cls._printc(
-                    f"- [{nFile}/{nb_files}] FAILED:", vip_path, file_size, flush=True
+                    f"- [{nFile}{nb_files}] FAILED:", vip_path, file_size, flush=True
                 )
+        # Display if nothing was downloaded
+        if not nFile:
+            cls._printc("No file to download.")
         # Return failed downloads
-        return files_to_download
+        return failures
 
     # ------------------------------------------------
 
@@ -303,7 +342,7 @@ class VipLoader(VipClient):
         """
         # Download (file existence on VIP is not checked to save time)
         try:
-            return vip.download(str(vip_path), str(local_path))
+            return cls._api().download(str(vip_path), str(local_path))
         except RuntimeError as vip_error:
             cls._handle_vip_error(vip_error)
 
@@ -347,6 +386,21 @@ class VipLoader(VipClient):
         Displays what it does if `cls._VERBOSE` is True.
         Returns a list of files which failed to be uploaded on VIP.
         """
+        # Clone the folder tree on VIP and get the files to upload
+        files_to_upload = cls._init_upload_dir(local_path, vip_path)
+        # Upload all the files using parallel threads
+        return cls._upload_parallel(files_to_upload)
+
+    # ------------------------------------------------
+
+    # Function to clone a local folder tree on VIP
+    @classmethod
+    def _init_upload_dir(cls, local_path: Path, vip_path: PurePosixPath) -> list:
+        """
+        Creates the folder tree of `local_path` under `vip_path` (if needed).
+        Displays what it does if `cls._VERBOSE` is True.
+        Returns a list of files to upload in format: (`local_file`, `vip_file`).
+        """
         # Scan the local directory
         assert cls._exists(
             local_path, location="local"
@@ -365,7 +419,7 @@ class VipLoader(VipClient):
             # Scan it to check if there are more files to upload
             vip_filenames = {
                 PurePosixPath(element["path"]).name
-                for element in vip.list_elements(str(vip_path))
+                for element in cls._api().list_elements(str(vip_path))
             }
             # Get the files to upload
             files_to_upload = [
@@ -380,38 +434,73 @@ class VipLoader(VipClient):
                 )
             else:
                 cls._printc("Already on VIP.")
-        # Upload the files
+        # Bind each local file to its VIP path
+        files_to_upload = [
+            (local_file, vip_path / local_file.name) for local_file in files_to_upload
+        ]
+        # Look for sub-directories
+        subdirs = [elem for elem in local_path.iterdir() if elem.is_dir()]
+        # Recurse this function over sub-directories
+        for subdir in subdirs:
+            files_to_upload += cls._init_upload_dir(
+                local_path=subdir, vip_path=vip_path / subdir.name
+            )
+        # Return the list of files to upload
+        return files_to_upload
+
+    # ------------------------------------------------
+
+    # Method to upload files using parallel threads
+    @classmethod
+    def _upload_parallel(cls, files_to_upload: list) -> list:
+        """
+        Uploads files to VIP using parallel threads.
+        - `files_to_upload`: list of tuples in format (`local_file`, `vip_file`).
+
+        Returns a list of files which failed to be uploaded on VIP.
+        """
+        # Return if there is no file to upload
+        if not files_to_upload:
+            cls._printc("No file to upload.")
+            return []
+        # Check the amount of data
+        try:
+            total_size = "%.1fMB" % sum(
+                [local_file.stat().st_size / (1 << 20) for local_file, _ in files_to_upload]
+            )
+        except:
+            total_size = "unknown"
+        # Display
+        cls._printc(
+            f"Uploading {len(files_to_upload)} file(s) (total size: {total_size})..."
+        )
+        # Upload the files on VIP servers
         nFile = 0
+        nb_files = len(files_to_upload)
         failures = []
-        for local_file in files_to_upload:
+        meter = vip.TransferMeter()  # Keeps track of the uploaded bytes
+        for file, done in cls._api().upload_parallel(files_to_upload, progress=meter):
             nFile += 1
+            local_file, _ = file
             # Get the file size (if possible)
             try:
                 size = f"{local_file.stat().st_size/(1<<20):,.1f}MB"
             except:
                 size = "unknown size"
-            # Display the current file
-            cls._printc(
-                f"\t[{nFile}/{len(files_to_upload)}] Uploading file: {local_file.name} ({size}) ...",
-                end=" ",
-            )
-            # Upload the file on VIP
-            vip_file = vip_path / local_file.name  # file path on VIP
-            if cls._upload_file(local_path=local_file, vip_path=vip_file):
-                # Upload was successful
-                cls._printc("Done.")
+            if done:
+                # Display success
+                cls._printc(
+                    f"- [{nFile}/{nb_files}] DONE: {local_file} ({size})",
+                    "(%.1fMB/s)" % (meter.throughput() / (1 << 20)),
+                    flush=True,
+                )
             else:
-                # Update display
-                cls._printc(f"\n(!) Something went wrong during the upload.")
+                # Display failure
+                cls._printc(
+                    f"- [{nFile}/{nb_files}] FAILED: {local_file} ({size})", flush=True
+                )
                 # Update missing files
                 failures.append(str(local_file))
-        # Look for sub-directories
-        subdirs = [elem for elem in local_path.iterdir() if elem.is_dir()]
-        # Recurse this function over sub-directories
-        for subdir in subdirs:
-            failures += cls._upload_dir(
-                local_path=subdir, vip_path=vip_path / subdir.name
-            )
         # Return the list of failures
         return failures
 
@@ -428,7 +517,7 @@ class VipLoader(VipClient):
         assert local_path.exists(), f"{local_path} does not exist."
         # Upload
         try:
-            return vip.upload(str(local_path), str(vip_path))
+            return cls._api().upload(str(local_path), str(vip_path))
         except RuntimeError as vip_error:
             cls._handle_vip_error(vip_error)
 
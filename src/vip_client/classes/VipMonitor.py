@@ -0,0 +1,213 @@
+from __future__ import annotations
+import heapq
+import time
+
+from vip_client.classes.VipLauncher import VipLauncher
+
+
+class VipMonitor:
+    """
+    Python class to monitor the executions of several sessions from a single loop.
+
+    Sessions can be any instances of VipLauncher, VipSession or VipCI.
+    - All sessions are updated from one scheduler: each session is updated
+        when its own refresh time is reached (see VipLauncher.monitor_workflows());
+    - The executions listed on VIP are shared by all sessions updated at the same time
+        (for each VIP client, i.e. each account: see `vip.Client`);
+    - Requests to VIP are limited by a shared budget (`max_requests` per minute);
+    - Each session is saved only when the status of its workflows changes.
+
+    N.B.: requires that `VipLauncher.init()` (or any subclass) has been called with a valid API key.
+    """
+
+    ##################
+    ################ Class Attributes ##################
+    ##################
+
+    # Class name
+    __name__ = "VipMonitor"
+    # Default verbose state
+    _VERBOSE = True
+
+    #############
+    ################ Constructor ##################
+    #############
+
+    def __init__(
+        self,
+        sessions: list = (),
+        refresh_time: int = 30,
+        max_requests: int = 60,
+        verbose: bool = None,
+    ) -> None:
+        """
+        Create a VipMonitor instance.
+
+        ## Parameters
+        - `sessions` (list) Sessions to monitor (VipLauncher, VipSession or VipCI instances).
+            More sessions can be added later with add().
+
+        - `refresh_time` (int) Minimum time between two updates of each session (seconds).
+            This time can be longer for long executions (see VipLauncher._next_refresh()).
+
+        - `max_requests` (int) Maximum number of requests to VIP per minute, for all sessions.
+            Requests for execution details are counted once the session is updated.
+
+        - `verbose` [Optional] (bool) Verbose mode for this instance.
+        """
+        self.verbose = verbose if verbose is not None else self._VERBOSE
+        self.refresh_time = refresh_time
+        self.max_requests = max_requests
+        # Monitored sessions
+        self._sessions = []
+        for session in sessions:
+            self.add(session)
+
+    # ------------------------------------------------
+
+    ################
+    ################ Public Methods ##################
+    ################
+
+    # Add a session to monitor
+    def add(self, session: VipLauncher) -> VipMonitor:
+        """
+        Adds `session` to the monitored sessions.
+        Raises TypeError if `session` is not a VipLauncher instance (or any subclass).
+        """
+        if not isinstance(session, VipLauncher):
+            raise TypeError(f"Cannot monitor {session}: not a VipLauncher instance")
+        if session not in self._sessions:
+            self._sessions.append(session)
+        return self
+
+    # ------------------------------------------------
+
+    # Get status changes from all sessions
+    def watch_workflows(self):
+        """
+        Generator of status changes for the executions of all monitored sessions.
+        - Yields a tuple (`session`, `workflow_id`, `previous_status`, `new_status`)
+            as soon as an execution changes status;
+        - Stops when all executions are over.
+
+        Each session is saved after the update which changed its status.
+
+        Error profile:
+        - Raises RuntimeError if the client fails to communicate with VIP
+        (after `VipLauncher._MAX_MONITOR_ERRORS` consecutive errors for the same session).
+        """
+        # Scheduler: (next update time, session index)
+        schedule = [(0, index) for index in range(len(self._sessions))]
+        heapq.heapify(schedule)
+        errors = [0] * len(self._sessions)  # Consecutive errors by session
+        # Request budget (tokens may become negative after a costly update)
+        tokens, last_refill = float(self.max_requests), time.time()
+        while schedule:
+            # Wait for the next session update
+            due = schedule[0][0]
+            time.sleep(max(due - time.time(), 0))
+            # Wait for the request budget
+            tokens, last_refill = self._refill(tokens, last_refill)
+            if tokens < 1:
+                time.sleep((1 - tokens) * 60 / self.max_requests)
+                tokens, last_refill = self._refill(tokens, last_refill)
+            # Get all sessions due for an update
+            now = time.time()
+            due_sessions = []
+            while schedule and schedule[0][0] <= now:
+                due_sessions.append(heapq.heappop(schedule)[1])
+            # Executions listed on VIP, by client (shared by all sessions in this round)
+            executions = {}
+            # Update each session
+            for index in due_sessions:
+                session = self._sessions[index]
+                client = session._api()
+                if client not in executions:
+                    executions[client] = session._get_executions()
+                    tokens -= 1
+                try:
+                    events = session._update_workflows(executions=executions[client])
+                except (RuntimeError, OSError) as e:
+                    # Back off after connection errors
+                    errors[index] += 1
+                    if errors[index] > session._MAX_MONITOR_ERRORS:
+                        self._save_all()
+                        raise e
+                    self._print(
+                        f"(!) Unable to update session '{session.session_name}' ({e}). Retrying later."
+                    )
+                    delay = session._next_refresh(self.refresh_time, errors[index])
+                    heapq.heappush(schedule, (time.time() + delay, index))
+                    continue
+                errors[index] = 0
+                # Requests for execution details (approximation)
+                tokens -= len(events)
+                # Save the session if its state changed
+                if events:
+                    with session._silent_session():
+                        session._save()
+                for wid, previous_status, status in events:
+                    yield session, wid, previous_status, status
+                # Schedule the next update
+                if session._still_running():
+                    delay = session._next_refresh(self.refresh_time)
+                    heapq.heappush(schedule, (time.time() + delay, index))
+
+    # ------------------------------------------------
+
+    # Monitor all sessions until their executions are over
+    def monitor_workflows(self) -> VipMonitor:
+        """
+        Updates the status of each execution in the monitored sessions, until all runs are done.
+        - Displays each status change;
+        - Displays a full report for each session when all executions are done.
+
+        Error profile:
+        - Raises RuntimeError if the client fails to communicate with VIP.
+        """
+        self._print("\n=== MONITOR SESSIONS ===\n")
+        self._print(f"Monitoring {len(self._sessions)} session(s) until all executions are over.")
+        self._print("-------------------------------------------------------------")
+        for session, wid, previous_status, status in self.watch_workflows():
+            self._print(f"[{session.session_name}] {wid}: {previous_status} -> {status}")
+        self._print("-------------------------------------------------------------")
+        self._print("All executions are over.")
+        # Last execution reports
+        for session in self._sessions:
+            self._print(f"\n[{session.session_name}]")
+            session._execution_report()
+        self._print()
+        return self
+
+    # ------------------------------------------------
+
+    #################
+    ################ Private Methods ################
+    #################
+
+    # Refill the request budget
+    def _refill(self, tokens: float, last_refill: float) -> tuple:
+        """Returns the request budget after refill, and the refill time"""
+        now = time.time()
+        tokens = min(tokens + (now - last_refill) * self.max_requests / 60, self.max_requests)
+        return tokens, now
+
+    # Save all sessions (e.g., before raising an error)
+    def _save_all(self) -> None:
+        for session in self._sessions:
+            with session._silent_session():
+                session._save()
+
+    # Display
+    def _print(self, *args, **kwargs) -> None:
+        if self.verbose:
+            print(*args, **kwargs)
+
+    # ------------------------------------------------
+
+
+#######################################################
+
+if __name__ == "__main__":
+    pass
@@ -1,13 +1,16 @@
 from __future__ import annotations
 import os
+import hashlib
 import json
 import tarfile
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import *
 
 from vip_client.utils import vip
-from vip_client.classes.VipLauncher import VipLauncher
+from vip_client.classes.VipLauncher import InputList, VipLauncher
 
 
 class VipSession(VipLauncher):
@@ -52,6 +55,25 @@ class VipSession(VipLauncher):
     _SERVER_DEFAULT_PATH = PurePosixPath("/vip/Home/API/")
     # Default path to save session outputs on the current machine
     _LOCAL_DEFAULT_PATH = Path("./vip_outputs")
+    # Journal of the changes since the last backup file (see _save_session())
+    _JOURNAL_FILE = "session_data.journal"
+    # Maximum number of journal entries before compaction into the backup file
+    _JOURNAL_SIZE = 1000
+    # Lock file for the local backup files (see _locked_backup())
+    _LOCK_FILE = "session_data.lock"
+    # Manifest of the uploaded input files (see _upload_dir())
+    _MANIFEST_FILE = "upload_manifest.json"
+    # Content-addressed store of input files on VIP, shared by all sessions (see _store_inputs())
+    _STORE_PATH = _SERVER_DEFAULT_PATH / "INPUT_STORE"
+    # Input files linked to the store (see _load_input_store())
+    _STORE_FILE = "input_store.json"
+    # Links to the store for the current output directory & version of these links
+    _input_store = None
+    _store_version = 0
+    # Last saved data, hash of the backup file & number of journal entries
+    _journal_state = None
+    _journal_digest = None
+    _journal_entries = 0
 
     #################
     ################ Main Properties ##################
@@ -245,6 +267,7 @@ class VipSession(VipLauncher):
         input_settings: dict = None,
         output_dir=None,
         verbose: bool = None,
+        client: vip.Client = None,
     ) -> None:
         """
         Create a VipSession instance and sets its properties from keyword arguments.
@@ -274,6 +297,9 @@ class VipSession(VipLauncher):
             - If True, instance methods will display logs;
             - If False, instance methods will run silently.
 
+        - `client` [Optional] (vip.Client) VIP client of this instance (API key and connections).
+            Default: the current client of `vip` (see init()).
+
         `session_name` and `output_dir` are only set at instantiation; other properties can be set later in function calls.
         If `session_name` or `output_dir` refer to a saved session, properties will be loaded from the backup file.
         """
@@ -283,7 +309,8 @@ class VipSession(VipLauncher):
         if not output_dir:
             output_dir = self._LOCAL_DEFAULT_PATH / session_name
         if verbose is None:
-            verbose = self._VERBOSE
+            self._client = client
+            verbose = self._default_verbose()
         # Initiate parameters from the parent class
         super().__init__(
             output_dir=output_dir,
@@ -292,6 +319,7 @@ class VipSession(VipLauncher):
             input_settings=input_settings,
             verbose=verbose
             and any([output_dir, session_name, pipeline_id, input_settings]),
+            client=client,
         )
         # Reset the verbose state
         self.verbose = verbose
@@ -334,7 +362,7 @@ class VipSession(VipLauncher):
             C. [safer] The **name of some environment variable** containing your API key (default: "VIP_API_KEY").
         In cases B or C, the API key will be loaded from the local file or the environment variable.
 
-        - `verbose` (bool): default verbose mode for all instances.
+        - `verbose` (bool): default verbose mode for all instances using the same client.
             - If True, all instances will display logs by default;
             - If False, all instance methods will run silently by default.
 
@@ -345,12 +373,21 @@ class VipSession(VipLauncher):
     # ------------------------------------------------
 
     # Upload a dataset on VIP servers
-    def upload_inputs(self, input_dir=None, update_files=True) -> VipSession:
+    def upload_inputs(
+        self, input_dir=None, update_files=True, hash_files=False, use_store=None
+    ) -> VipSession:
         """
         Uploads a local dataset to VIP servers.
         - `input_dir` (str | os.PathLike): local directory containing the dataset.
             If not provided, `self.input_dir` is be used.
-        - If `update_files` (bool) is True, the input directory on VIP will be checked in depth for missing files.
+        - If `update_files` (bool) is True, the input directory on VIP will be checked in depth for
+            missing, truncated or modified files (based on file sizes and modification times).
+        - If `hash_files` (bool) is True, modified files are compared to their uploaded version
+            by content hash, and uploaded only if their content changed.
+        - If `use_store` (bool) is True, the files referenced in `input_settings` are uploaded in a
+            content-addressed store on VIP, shared by all sessions: files already uploaded by any
+            session are not uploaded again. The other files are uploaded in the VIP input directory.
+            By default, the store is used if it was used in the previous upload.
 
         Error profile:
         - Raises TypeError is `input_dir` is missing and was not declared at instanciation;
@@ -368,6 +405,9 @@ class VipSession(VipLauncher):
             exists = self._exists(self._vip_input_dir, location="vip")
         except RuntimeError as vip_error:
             self._handle_vip_error(vip_error)
+        # Use the store if it was used before
+        if use_store is None:
+            use_store = bool(self._load_input_store())
         # Return if `update_files` is False and input data are already on VIP
         if exists and not update_files:
             self._print("Skipped : There are already input data on VIP.")
@@ -408,7 +448,18 @@ class VipSession(VipLauncher):
         self._print("----------------------------")
         # Upload the input repository
         try:
-            failures = self._upload_dir(self._local_input_dir, self._vip_input_dir)
+            if use_store:
+                # Upload the files referenced in `input_settings` in the store
+                stored, failures = self._store_inputs()
+            else:
+                # Forget the previous links to the store
+                stored, failures = set(), []
+                if self._load_input_store():
+                    self._save_input_store({})
+            # Upload the other files in the input directory
+            failures += self._upload_dir(
+                self._local_input_dir, self._vip_input_dir, hash_files=hash_files, skip=stored
+            )
             # Display report
             self._print("-----------------------------")
             if not failures:
@@ -533,29 +584,8 @@ class VipSession(VipLauncher):
         failures = {}
         # Enumerate workflows
         for workflow in self._select_workflows(get_status):
-            # If there is no output file, go to the next execution
-            if not workflow["outputs"]:
-                self._print("Nothing to download.")
-                self._print()
-                continue
-            # Scan the output files and search for missing files
-            files_to_download = self._init_download(workflow)
-            # Skip if there are no missing file to download
-            if not files_to_download:  # All files are already there
-                self._print("Already there.")
-                self._print()
-                continue
-            # Download the files from VIP servers
-            failed = self._download_parallel(files_to_download, unzip)
-            # End of file loop
-            if not failed:  # All missing files were succesfully downloaded
-                self._print("All files downloaded.")
-            else:
-                self._print(
-                    "%d downloads failed. Waiting for the 2nd try." % len(failed)
-                )
-                failures.update(failed)
-            self._print()
+            # Download the missing files
+            failures.update(self._download_workflow(workflow, unzip))
         # End of workflow loop
         self._print("--------------------------------")
         if not failures:
@@ -563,7 +593,7 @@ class VipSession(VipLauncher):
             return self
         # Retry in case of failure
         self._print("End of the first try.")
-        self._print(len(files_to_download), "could not be downloaded from VIP.")
+        self._print(len(failures), "could not be downloaded from VIP.")
         self._print("\nGiving a second try...")
         self._print("--------------------------------")
         # Download the files from VIP servers
@@ -581,6 +611,80 @@ class VipSession(VipLauncher):
 
     # ------------------------------------------------
 
+    # Download execution outputs while the workflows are running
+    def harvest_outputs(
+        self,
+        refresh_time: int = 300,
+        unzip: bool = True,
+        get_status: list = ["Finished"],
+    ) -> VipSession:
+        """
+        Downloads the session outputs as they are produced on VIP servers.
+        - Every `refresh_time` (seconds), fetches the execution results of running workflows
+            and downloads the new output files;
+        - Stops when all executions are over, after a last download for workflows with status in `get_status`;
+        - If `unzip` is True, extracts the data if any output is a .tar file.
+
+        Downloaded files are recorded in the workflow inventory and never fetched twice.
+        Workflows which are over and fully downloaded are not fetched again.
+        Session is backed up after each round with new files.
+        Connection errors are tolerated `_MAX_MONITOR_ERRORS` times in a row, with backoff.
+        """
+        # First display
+        self._print("\n=== HARVEST OUTPUTS ===\n")
+        # Check if current session has existing workflows
+        if not self._workflows:
+            self._print("This session has not yet launched any execution.")
+            self._print("Run launch_pipeline() to launch workflows on VIP.")
+            return self
+        # Assert "Removed" is not in `get_status`
+        if "Removed" in get_status:
+            raise ValueError("'Removed' in `get_status`: cannot download removed data.")
+        self._print("Downloading pipeline outputs to:", self._local_output_dir)
+        self._print("--------------------------------")
+        status_to_harvest = ["Running"] + list(get_status)
+        harvested = set()  # Workflows which are over and fully downloaded
+        errors = 0  # Consecutive connection errors
+        while True:
+            # Update the workflow status & discard connection errors
+            try:
+                self._update_workflows()
+            except (RuntimeError, OSError) as e:
+                if errors >= self._MAX_MONITOR_ERRORS:
+                    self._print("(!) Connection with VIP was interrupted (see below).")
+                    self._print("    Relaunch harvest_outputs() to download the remaining outputs.\n")
+                    self._save()
+                    raise e
+                errors += 1
+                self._print(f"(!) Unable to update the workflows ({e}). Retrying later.")
+                time.sleep(min(refresh_time * 2**errors, self._MAX_REFRESH_FACTOR * refresh_time))
+                continue
+            errors = 0
+            running = self._still_running()
+            # Download the new files
+            new_files = False
+            for wid in self._workflows:
+                status = self._workflows[wid]["status"]
+                if status not in status_to_harvest or wid in harvested:
+                    continue
+                new, complete = self._harvest_workflow(wid, unzip)
+                new_files |= new
+                if complete and status != "Running":
+                    harvested.add(wid)
+            if new_files:
+                self._save()
+            # Stop when all executions are over
+            if not running:
+                break
+            time.sleep(refresh_time)
+        # End of harvest
+        self._print("All executions are over.")
+        self._print("--------------------------------")
+        self._execution_report()
+        return self
+
+    # ------------------------------------------------
+
     # Run a full VIP session
     def run_session(
         self,
@@ -589,6 +693,7 @@ class VipSession(VipLauncher):
         refresh_time=30,
         unzip=True,
         get_status=["Finished"],
+        pipelined=False,
     ) -> VipSession:
         """
         Runs a full session without the finish() step.
@@ -597,6 +702,9 @@ class VipSession(VipLauncher):
         3. Monitors pipeline executions until they are all over;
         4. Downloads execution results from VIP.
 
+        If `pipelined` is True, steps 3 & 4 overlap: the outputs of each workflow 
+        are downloaded as soon as its status is in `get_status`.
+
         /!\ This method assumes that all session properties are already set.
         Optional arguments can still be provided:
         - Set `update_files` to False to avoid checking the input data on VIP;
@@ -605,6 +713,14 @@ class VipSession(VipLauncher):
         - Set `get_status` to download files from workflows with a specific status
         - Set unzip to False to avoid extracting .tgz files during the download.
         """
+        if pipelined:
+            return self._run_pipelined_session(
+                update_files=update_files,
+                nb_runs=nb_runs,
+                refresh_time=refresh_time,
+                unzip=unzip,
+                get_status=get_status,
+            )
         # Upload-run-download procedure
         return (
             # 1. Upload the database on VIP or check the uploaded files
@@ -617,6 +733,47 @@ class VipSession(VipLauncher):
             .download_outputs(get_status=get_status, unzip=unzip)
         )
 
+    # Run a full VIP session with downloads during the executions
+    def _run_pipelined_session(
+        self, update_files, nb_runs, refresh_time, unzip, get_status
+    ) -> VipSession:
+        """
+        Runs a full session (see run_session()) while downloading the outputs
+        of each workflow as soon as its status is in `get_status`.
+        """
+        # 1. Upload the database on VIP & 2. Launch the executions
+        self.upload_inputs(update_files=update_files).launch_pipeline(nb_runs=nb_runs)
+        # 3. Monitor the executions & download the outputs in the background
+        self._print("\n=== MONITOR WORKFLOWS & DOWNLOAD OUTPUTS ===\n")
+        self._print("Downloading pipeline outputs to:", self._local_output_dir)
+        self._print("The current proccess will wait until all executions are over.")
+        self._print("--------------------------------")
+        client, downloads = self._api(), []
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="vip_downloads"
+        ) as downloader:
+            for workflow_id, _, status in self.watch_workflows(refresh_time):
+                if status in get_status:
+                    downloads.append(
+                        downloader.submit(self._download_finished, workflow_id, unzip, client)
+                    )
+            # Update the workflow inventory with the download results (in this thread)
+            failed = []
+            for download in as_completed(downloads):
+                workflow_id, outputs, error = download.result()
+                if error is not None:
+                    failed.append(workflow_id)
+                else:
+                    self._workflows[workflow_id]["outputs"] = outputs
+        self._print("All executions are over.")
+        if failed:
+            self._print(f"(!) Download failed for {len(failed)} workflow(s):", ", ".join(failed))
+            self._print("    Their outputs are downloaded again below.")
+        # 4. Download the missing outputs (in case of failure) & display a report
+        return self.download_outputs(get_status=get_status, unzip=unzip)
+
+    # ------------------------------------------------
+
     # Clean session data on VIP
     def finish(self, timeout=300) -> VipSession:
         """
@@ -630,6 +787,9 @@ class VipSession(VipLauncher):
         """
         # Finish the session based on self._path_to_delete()
         super().finish(timeout=timeout)
+        # Release the input files linked to the store (if the session data were removed)
+        if not self._still_running():
+            self._release_store()
         # Check if the input data have been erased (this is not the case when get_inputs have been used)
         if self._vip_input_dir != self._vip_dir / "INPUTS" and self._exists(
             self._vip_input_dir, location="vip"
@@ -745,7 +905,7 @@ class VipSession(VipLauncher):
         return {self._vip_dir: "vip"}
 
     # Method to check existence of a distant or local resource.
-    @classmethod
+    @vip.clientmethod
     def _exists(cls, path: PurePath, location="local") -> bool:
         """
         Checks existence of a distant (`location`="vip") or local (`location`="local") resource.
@@ -760,7 +920,7 @@ class VipSession(VipLauncher):
     # ------------------------------------------------
 
     # Method to create a distant or local directory
-    @classmethod
+    @vip.clientmethod
     def _create_dir(cls, path: PurePath, location="local", **kwargs) -> None:
         """
         Creates a directory at `path` :
@@ -790,20 +950,21 @@ class VipSession(VipLauncher):
 
     # Override the _update_wokflows() method to ask more information about the files to download
     def _update_workflows(
-        self, get_exec_results: bool = False, timeout: int = None
-    ) -> None:
+        self, get_exec_results: bool = False, timeout: int = None, executions: dict = None
+    ) -> list:
         """
         Updates the status of each workflow in the inventory.
         - More information is obtained for execution results if `get_exec_results` is True.
         - `timeout` controls the duration of the whole process.
-        - returns a list of failed updates
+        - `executions` is the list of executions on VIP, if already known (see VipLauncher._update_workflows()).
+        - returns the status changes (see VipLauncher._update_workflows())
         """
         # Keep track of time
         start = time.time()
         # Update the workflow status
-        super()._update_workflows()
+        events = super()._update_workflows(executions=executions)
         if not get_exec_results:
-            return []
+            return events
         # Get more information about execution results
         failed = []  # Failure list
         for workflow_id in self._workflows:
@@ -815,17 +976,7 @@ class VipSession(VipLauncher):
             new_timeout = None if timeout is None else timeout - curr_time
             # Get information from the API
             try:
-                files = vip.get_exec_results(workflow_id, timeout=new_timeout)
-                # Update information in the workflow inventory
-                self._workflows[workflow_id]["outputs"] = [
-                    # filtered information from the otput
-                    {
-                        key: elem[key]
-                        for key in ["path", "isDirectory", "size", "exists"]
-                        if key in elem
-                    }
-                    for elem in files
-                ]
+                self._update_outputs(workflow_id, timeout=new_timeout)
             except TimeoutError as e:  # Timeout is reached: abort update
                 failed.append(workflow_id)
             except RuntimeError as vip_error:  # Other kind of error
@@ -834,6 +985,136 @@ class VipSession(VipLauncher):
         # Display message in case of failure
         if failed:
             self._print("\n(!) Timeout for workflow(s):", ", ".join(failed))
+        return events
+
+    # ------------------------------------------------
+
+    # Get metadata about the output files of 1 workflow
+    def _update_outputs(self, workflow_id: str, timeout: int = None) -> None:
+        """
+        Updates the output metadata of `workflow_id` with the execution results.
+        Raises TimeoutError after `timeout` (seconds), if provided.
+        """
+        self._workflows[workflow_id]["outputs"] = self._get_outputs(workflow_id, timeout)
+
+    # ------------------------------------------------
+
+    # Get the output metadata of 1 workflow
+    def _get_outputs(self, workflow_id: str, timeout: int = None) -> list:
+        """
+        Returns the output metadata of `workflow_id` from the execution results.
+        Raises TimeoutError after `timeout` (seconds), if provided.
+        """
+        files = self._api().get_exec_results(workflow_id, timeout=timeout)
+        return [
+            # filtered information from the otput
+            {
+                key: elem[key]
+                for key in ["path", "isDirectory", "size", "exists"]
+                if key in elem
+            }
+            for elem in files
+        ]
+
+    # ------------------------------------------------
+
+    # Method to download the outputs of 1 workflow
+    def _download_workflow(self, workflow: dict, unzip: bool) -> dict:
+        """
+        Downloads the missing output files of `workflow` (workflow metadata).
+        Returns the failed downloads (see `self._download_parallel()`).
+        """
+        # If there is no output file, go to the next execution
+        if not workflow["outputs"]:
+            self._print("Nothing to download.")
+            self._print()
+            return {}
+        # Scan the output files and search for missing files
+        files_to_download = self._init_download(workflow)
+        # Skip if there are no missing file to download
+        if not files_to_download:  # All files are already there
+            self._print("Already there.")
+            self._print()
+            return {}
+        # Download the files from VIP servers
+        failed = self._download_parallel(files_to_download, unzip)
+        # End of file loop
+        if not failed:  # All missing files were succesfully downloaded
+            self._print("All files downloaded.")
+        else:
+            self._print("%d downloads failed. Waiting for the 2nd try." % len(failed))
+        self._print()
+        return failed
+
+    # ------------------------------------------------
+
+    # Method to download the new outputs of 1 workflow
+    def _harvest_workflow(self, workflow_id: str, unzip: bool) -> tuple:
+        """
+        Gets the current output metadata of `workflow_id` and downloads the files
+        which were not harvested before (see `workflow["harvested"]`).
+        Returns 2 flags: True if new files were downloaded, 
+        and True if all the current output files are downloaded.
+        """
+        workflow = self._workflows[workflow_id]
+        # Get the current outputs (discard failures until the next round)
+        try:
+            self._update_outputs(workflow_id)
+        except (TimeoutError, RuntimeError):
+            return False, False
+        # Files which were already harvested
+        harvested = set(workflow.get("harvested", []))
+        files_to_download = {
+            file: info
+            for file, info in self._init_download(workflow).items()
+            if str(file[0]) not in harvested
+        }
+        if not files_to_download:
+            return False, True
+        # Download the new files
+        self._print(
+            "Outputs from: ", workflow_id, " | Status: ", workflow["status"], sep=""
+        )
+        failed = self._download_parallel(files_to_download, unzip)
+        # Keep track of the harvested files
+        harvested.update(str(file[0]) for file in files_to_download if file not in failed)
+        workflow["harvested"] = sorted(harvested)
+        self._print()
+        return len(failed) < len(files_to_download), not failed
+
+    # ------------------------------------------------
+
+    # Method to download the outputs of 1 workflow as soon as it is over
+    def _download_finished(
+        self, workflow_id: str, unzip: bool, client: vip.Client
+    ) -> tuple:
+        """
+        Gets the output metadata of `workflow_id` and downloads the missing files with `client`.
+        The workflow inventory is left unchanged: this method runs in the background.
+        Returns `workflow_id`, its output metadata (to be updated by the caller) and the error
+        which stopped the download, if any (the output metadata are None in this case).
+        """
+        try:
+            with client.use():
+                # Copy of the workflow metadata with the current outputs
+                workflow = dict(self._workflows[workflow_id])
+                workflow["outputs"] = self._get_outputs(workflow_id)
+                # Display current execution
+                self._print(
+                    "Outputs from: ",
+                    workflow_id,
+                    " | Started on: ",
+                    workflow["start"],
+                    " | Status: ",
+                    workflow["status"],
+                    sep="",
+                )
+                self._download_workflow(workflow, unzip)
+        except Exception as error:
+            # Report the error & keep downloading the other workflows
+            self._print(f"(!) Download failed for workflow {workflow_id}: {error!r}")
+            return workflow_id, None, error
+        return workflow_id, workflow["outputs"], None
 
     # ------------------------------------------------
 
@@ -872,84 +1153,564 @@ class VipSession(VipLauncher):
     # ------------------------------------------------
 
     # Function to upload all files from a local directory
-    def _upload_dir(self, local_path: Path, vip_path: PurePosixPath) -> list:
+    def _upload_dir(
+        self, local_path: Path, vip_path: PurePosixPath, hash_files=False, skip: set = None
+    ) -> list:
         """
         Uploads all files in `local_path` to `vip_path` (if needed).
         Displays what it does if `self._verbose` is True.
         Returns a list of files which failed to be uploaded on VIP.
+
+        The size & modification time of each uploaded file are kept in a manifest
+        (`_MANIFEST_FILE`, in the local output directory), to upload only new or
+        modified files. Files with another size on VIP (e.g., truncated) are uploaded again.
+        If `hash_files` is True, the content hash of each file is also stored in the manifest
+        and used to skip modified files with unchanged content. Files found on VIP with the same size
+        but unknown to the manifest (e.g., uploaded by another session) are kept and added to the manifest.
+        Local files in `skip` are not uploaded.
         """
+        # Manifest of the files uploaded by previous calls
+        manifest = self._load_manifest()
+        # Clone the folder tree on VIP and get the files to upload / to check
+        files_to_upload, files_to_check = self._init_upload_dir(
+            local_path, vip_path, manifest, skip
+        )
+        # Hash the files in parallel (modified files & files to upload)
+        hashes = (
+            self._hash_files([local_file for local_file, _ in files_to_check + files_to_upload])
+            if hash_files else {}
+        )
+        # Upload the modified files unless their content is unchanged
+        unchanged = 0
+        for local_file, vip_file in files_to_check:
+            sha1 = manifest[str(vip_file)].get("sha1")
+            if sha1 is not None and sha1 == hashes.get(local_file):
+                manifest[str(vip_file)] = self._file_state(local_file, sha1)
+                unchanged += 1
+            else:
+                files_to_upload.append((local_file, vip_file))
+        if unchanged:
+            self._print(f"{unchanged} modified files have the same content on VIP.")
+        # Upload all the files using parallel threads
+        failures = self._upload_parallel(files_to_upload)
+        # Update the manifest
+        failed = set(failures)
+        for local_file, vip_file in files_to_upload:
+            if str(local_file) in failed:
+                manifest.pop(str(vip_file), None)
+            else:
+                manifest[str(vip_file)] = self._file_state(local_file, hashes.get(local_file))
+        self._save_manifest(manifest)
+        return failures
+
+    # ------------------------------------------------
+
+    # Function to clone a local folder tree on VIP
+    def _init_upload_dir(
+        self, local_path: Path, vip_path: PurePosixPath, manifest: dict = None, skip: set = None
+    ) -> tuple:
+        """
+        Creates the folder tree of `local_path` under `vip_path` (if needed).
+        Displays what it does if `self._verbose` is True.
+        `manifest` contains the state of the uploaded files (see _upload_dir()).
+        Local files in `skip` are ignored.
+        Returns 2 lists of files in format: (`local_file`, `vip_file`):
+        - The files to upload: missing on VIP, or with another size on VIP;
+        - The files to check: modified locally since their last upload (same size).
+        Files found on VIP with the same size but unknown to `manifest` are added to it.
+        """
+        manifest = manifest if manifest is not None else {}
+        skip = skip if skip is not None else set()
         # Scan the local directory
         assert self._exists(
             local_path, location="local"
         ), f"{local_path} does not exist."
         # First display
         self._print(f"Cloning: {local_path} ", end="... ")
+        local_files = [
+            elem for elem in local_path.iterdir() if elem.is_file() and elem not in skip
+        ]
+        files_to_check = []
         # Scan the distant directory and look for files to upload
         if self._mkdirs(vip_path, location="vip"):
             # The distant directory did not exist before call
             # -> upload all the data (no scan to save time)
-            files_to_upload = [elem for elem in local_path.iterdir() if elem.is_file()]
+            files_to_upload = local_files
             self._print("(Created on VIP)")
             if files_to_upload:
                 self._print(f"\t{len(files_to_upload)} files to upload.")
         else:  # The distant directory already exists
             # Scan it to check if there are more files to upload
-            vip_filenames = {
-                PurePosixPath(element["path"]).name
-                for element in vip.list_elements(str(vip_path))
+            vip_sizes = {
+                PurePosixPath(element["path"]).name: element.get("size")
+                for element in self._api().list_elements(str(vip_path))
             }
             # Get the files to upload
-            files_to_upload = [
-                elem
-                for elem in local_path.iterdir()
-                if elem.is_file() and (elem.name not in vip_filenames)
-            ]
+            files_to_upload = []
+            for local_file in local_files:
+                state = self._file_state(local_file)
+                entry = manifest.get(str(vip_path / local_file.name))
+                # New file, or different size on VIP (modified or truncated)
+                if local_file.name not in vip_sizes or (
+                    vip_sizes[local_file.name] is not None
+                    and vip_sizes[local_file.name] != state["size"]
+                ):
+                    files_to_upload.append(local_file)
+                # File uploaded by other means (e.g., another session): add it to the manifest
+                elif entry is None:
+                    manifest[str(vip_path / local_file.name)] = state
+                # File modified since its last upload
+                elif (entry["size"], entry["mtime"]) != (state["size"], state["mtime"]):
+                    files_to_check.append(local_file)
             # Update the display
-            if files_to_upload:
+            if files_to_upload or files_to_check:
                 self._print(
-                    f"\n\tVIP clone already exists and will be updated with {len(files_to_upload)} files."
+                    f"\n\tVIP clone already exists and will be updated with {len(files_to_upload)} files"
+                    + (f" ({len(files_to_check)} modified files to check)." if files_to_check else ".")
                 )
             else:
                 self._print("Already on VIP.")
-        # Upload the files
+        # Bind each local file to its VIP path
+        files_to_upload = [
+            (local_file, vip_path / local_file.name) for local_file in files_to_upload
+        ]
+        files_to_check = [
+            (local_file, vip_path / local_file.name) for local_file in files_to_check
+        ]
+        # Look for sub-directories
+        subdirs = [elem for elem in local_path.iterdir() if elem.is_dir()]
+        # Recurse this function over sub-directories
+        for subdir in subdirs:
+            upload, check = self._init_upload_dir(
+                local_path=subdir, vip_path=vip_path / subdir.name, manifest=manifest, skip=skip
+            )
+            files_to_upload += upload
+            files_to_check += check
+        # Return the files to upload & to check
+        return files_to_upload, files_to_check
+
+    # ------------------------------------------------
+
+    # State of a local file in the upload manifest
+    @staticmethod
+    def _file_state(local_file: Path, sha1: str = None) -> dict:
+        """
+        Returns the size & modification time (ns) of `local_file`,
+        with its content hash `sha1` if provided.
+        """
+        stat = local_file.stat()
+        state = {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+        if sha1 is not None:
+            state["sha1"] = sha1
+        return state
+
+    # ------------------------------------------------
+
+    # Hash local files using parallel threads
+    @staticmethod
+    def _hash_files(local_files: list) -> dict:
+        """
+        Returns the SHA-1 hash of each file in `local_files`, as a dictionary.
+        Files are read in parallel threads (hashlib releases the GIL on large buffers).
+        """
+        def hash_file(local_file: Path) -> str:
+            sha1 = hashlib.sha1()
+            with local_file.open("rb") as fid:
+                for chunk in iter(lambda: fid.read(1 << 20), b""):
+                    sha1.update(chunk)
+            return sha1.hexdigest()
+
+        if not local_files:
+            return {}
+        with ThreadPoolExecutor(
+            max_workers=min(len(local_files), os.cpu_count() or 1, 8),
+            thread_name_prefix="vip_hash",
+        ) as executor:
+            return dict(zip(local_files, executor.map(hash_file, local_files)))
+
+    # ------------------------------------------------
+
+    # Load the upload manifest from the local output directory
+    def _load_manifest(self) -> dict:
+        """
+        Returns the manifest of the uploaded files as a dictionary:
+        {`vip_file`: {"size": ..., "mtime": ..., ["sha1": ...]}}.
+        Returns an empty dictionary if the manifest could not be read.
+        """
+        return self._load_local_json(self._MANIFEST_FILE)
+
+    # ------------------------------------------------
+
+    # Save the upload manifest in the local output directory
+    def _save_manifest(self, manifest: dict) -> bool:
+        """
+        Writes the manifest of the uploaded files in the local output directory.
+        Returns a success flag.
+        """
+        return self._save_local_json(self._MANIFEST_FILE, manifest)
+
+    # ------------------------------------------------
+
+    # Load a dictionary from a JSON file in the local output directory
+    def _load_local_json(self, file_name: str) -> dict:
+        """Returns the content of `file_name`, or an empty dictionary if it could not be read."""
+        if not self._is_defined("_local_output_dir"):
+            return {}
+        try:
+            with (self._local_output_dir / file_name).open() as fid:
+                return json.load(fid)
+        except (OSError, ValueError):
+            return {}
+
+    # ------------------------------------------------
+
+    # Save a dictionary to a JSON file in the local output directory
+    def _save_local_json(self, file_name: str, data: dict) -> bool:
+        """Writes `data` to `file_name` atomically. Returns a success flag."""
+        if not self._is_defined("_local_output_dir"):
+            return False
+        file = self._local_output_dir / file_name
+        tmp_file = file.with_name(f"{file.name}.{os.getpid()}.tmp")
+        try:
+            self._mkdirs(file.parent, location="local")
+            with tmp_file.open("w") as fid:
+                json.dump(data, fid, separators=(",", ":"))
+            os.replace(tmp_file, file)
+        except OSError as error:
+            self._print(f"(!) {file_name} could not be saved: {error}")
+            return False
+        return True
+
+    # ------------------------------------------------
+
+    ###################################
+    # Content-addressed Input Store
+    ###################################
+
+    # Upload the input files in the store
+    def _store_inputs(self) -> tuple:
+        """
+        Links the input files referenced in `input_settings` to the content-addressed store
+        on VIP (`_STORE_PATH`), where each file is a blob stored as `sha1`/`file name`
+        (the original file name is kept for the pipelines).
+        - Blobs missing on VIP are uploaded; blobs uploaded by any session are reused;
+        - The blobs used by this session are listed in a reference file on VIP
+            (`_STORE_PATH`/refs/`session_name`.`version`.json), which is written before the upload.
+
+        Returns the set of local files linked to the store & the list of failed uploads.
+        """
+        # Local files referenced in the input settings
+        local_files = self._store_candidates()
+        self._print("Input store:", len(local_files), "files referenced in the input settings.")
+        if not local_files:
+            return set(), []
+        # Hash the new & modified files (other hashes are kept in the links)
+        links = dict(self._load_input_store())
+        states = {file: self._file_state(local_file) for file, local_file in local_files.items()}
+        to_hash = [
+            local_files[file]
+            for file, state in states.items()
+            if file not in links
+            or (links[file]["size"], links[file]["mtime"]) != (state["size"], state["mtime"])
+        ]
+        hashes = self._hash_files(to_hash)
+        for file, local_file in local_files.items():
+            sha1 = hashes[local_file] if local_file in hashes else links[file]["sha1"]
+            # Keep the file name in the blob path
+            blob = f"{sha1}/{PurePosixPath(file).name}"
+            links[file] = dict(states[file], sha1=sha1, blob=blob)
+        # Forget the files which are not referenced anymore
+        for file in set(links) - set(local_files):
+            del links[file]
+        # Reference the blobs before uploading (so that no other session removes them)
+        previous = self._read_store_refs(self._session_name)
+        blobs = {link["blob"] for link in links.values()}
+        if not self._write_store_refs(blobs):
+            raise RuntimeError("The references to the input store could not be saved on VIP.")
+        # Look for the missing blobs on VIP (other sessions may have uploaded them):
+        # the store is listed once, then the existing hash directories
+        self._api().paths.invalidate(str(self._STORE_PATH), recursive=True)
+        self._mkdirs(self._STORE_PATH, location="vip")
+        hash_dirs = {str(self._STORE_PATH / PurePosixPath(blob).parent) for blob in blobs}
+        hash_dirs = self._api().exists_parallel(hash_dirs)
+        existence = self._api().exists_parallel(
+            [
+                str(self._STORE_PATH / blob) for blob in blobs
+                if hash_dirs[str(self._STORE_PATH / PurePosixPath(blob).parent)]
+            ]
+        )
+        files_to_upload, uploading = [], set()
+        for file, link in links.items():
+            vip_file = self._STORE_PATH / link["blob"]
+            if not existence.get(str(vip_file)) and link["blob"] not in uploading:
+                files_to_upload.append((local_files[file], vip_file))
+                uploading.add(link["blob"])
+        # Create the missing hash directories
+        for hash_dir in sorted(path for path, exists in hash_dirs.items() if not exists):
+            self._create_dir(PurePosixPath(hash_dir), location="vip")
+        self._print(
+            f"\t{len(blobs) - len(files_to_upload)} files already in the store,",
+            f"{len(files_to_upload)} files to upload."
+        )
+        # Upload the missing blobs
+        failures = self._upload_parallel(files_to_upload)
+        failed = {
+            str(vip_file.relative_to(self._STORE_PATH)) for local_file, vip_file in files_to_upload
+            if str(local_file) in failures
+        }
+        self._save_input_store(
+            {file: link for file, link in links.items() if link["blob"] not in failed}
+        )
+        # Remove the blobs which are not used anymore
+        self._collect_store(set(previous) - blobs)
+        return set(local_files.values()), failures
+
+    # ------------------------------------------------
+
+    # Get the input files to link to the store
+    def _store_candidates(self) -> dict:
+        """
+        Returns the local files referenced in the input settings,
+        as a dictionary {`relative_path`: `local_file`}.
+        """
+        if not self._is_defined("_input_settings") or not self._is_defined("_local_input_dir"):
+            return {}
+        # Relative paths in the input settings
+        paths = set()
+        for value in self._input_settings.values():
+            if isinstance(value, InputList):
+                paths.update(v for v, is_path in zip(value.values, value.paths) if is_path)
+            elif isinstance(value, list):
+                paths.update(str(v) for v in value if isinstance(v, PurePath) and not v.is_absolute())
+            elif isinstance(value, PurePath) and not value.is_absolute():
+                paths.add(str(value))
+        # Keep the existing files
+        local_files = {path: self._local_input_dir / path for path in paths}
+        return {path: file for path, file in local_files.items() if file.is_file()}
+
+    # ------------------------------------------------
+
+    # Links to the store from the local output directory
+    def _load_input_store(self) -> dict:
+        """
+        Returns the input files linked to the store, as a dictionary:
+        {`relative_path`: {"blob": ..., "sha1": ..., "size": ..., "mtime": ...}}.
+        Links are read once for each output directory.
+        """
+        output_dir = str(self._local_output_dir) if self._is_defined("_local_output_dir") else None
+        if self._input_store is None or self._input_store[0] != output_dir:
+            self._set_input_store(output_dir, self._load_local_json(self._STORE_FILE))
+        return self._input_store[1]
+
+    # ------------------------------------------------
+
+    # Save the links to the store in the local output directory
+    def _save_input_store(self, links: dict) -> bool:
+        """Updates the input files linked to the store. Returns a success flag."""
+        output_dir = str(self._local_output_dir) if self._is_defined("_local_output_dir") else None
+        self._set_input_store(output_dir, links)
+        return self._save_local_json(self._STORE_FILE, links)
+
+    # ------------------------------------------------
+
+    # Keep the links to the store in memory
+    def _set_input_store(self, output_dir: str, links: dict) -> None:
+        """Sets the links to the store for `output_dir`, with the VIP path of each file."""
+        store_path = str(self._STORE_PATH)
+        paths = {file: f"{store_path}/{link['blob']}" for file, link in links.items()}
+        self._input_store = (output_dir, links, paths)
+        self._store_version += 1
+
+    # ------------------------------------------------
+
+    # VIP paths of the files linked to the store
+    def _store_paths(self) -> dict:
+        """Returns the VIP path of each file linked to the store: {`relative_path`: `vip_path`}"""
+        self._load_input_store()
+        return self._input_store[2]
+
+    # ------------------------------------------------
+
+    # List the reference files of the store
+    def _list_store_refs(self) -> dict:
+        """
+        Returns the reference files in the store, by session name: {`session_name`: [`vip_path`, ...]}.
+        A session may have several reference files while it replaces them (see _write_store_refs()).
+        """
+        refs_dir = self._STORE_PATH / "refs"
+        # Not cached: other sessions may have changed them
+        self._api().paths.invalidate(str(refs_dir), recursive=True)
+        if not self._exists(refs_dir, location="vip"):
+            return {}
+        refs = {}
+        for element in self._api().list_elements(str(refs_dir)):
+            path = PurePosixPath(element["path"])
+            # File names: `session_name`.`version`.json
+            refs.setdefault(path.name.split(".")[0], []).append(path)
+        return refs
+
+    # ------------------------------------------------
+
+    # Read a reference file of the store
+    def _read_refs_file(self, refs_file: PurePosixPath) -> list:
+        """Returns the blobs listed in `refs_file`, or None if it cannot be read."""
+        with self._tmp_file(suffix="_refs.json") as tmp_file:
+            if not self._download_file(refs_file, tmp_file):
+                return None
+            try:
+                with tmp_file.open() as fid:
+                    return json.load(fid)
+            except ValueError:
+                return None
+
+    # ------------------------------------------------
+
+    # Read the blobs referenced by a session
+    def _read_store_refs(self, session_name: str) -> list:
+        """Returns the blobs referenced by `session_name` in the store (empty list by default)."""
+        blobs = set()
+        for refs_file in self._list_store_refs().get(session_name, []):
+            blobs.update(self._read_refs_file(refs_file) or [])
+        return sorted(blobs)
+
+    # ------------------------------------------------
+
+    # Write the blobs referenced by this session
+    def _write_store_refs(self, blobs: set) -> bool:
+        """
+        Replaces the reference files of this session in the store by the list of `blobs`.
+        The new file is written before the old ones are removed, so that the blobs
+        stay referenced at any time (see _collect_store()).
+        Only removes the reference files if `blobs` is empty. Returns a success flag.
+        """
+        refs_dir = self._STORE_PATH / "refs"
+        self._mkdirs(refs_dir, location="vip")
+        old_files = self._list_store_refs().get(self._session_name, [])
+        if blobs:
+            refs_file = refs_dir / f"{self._session_name}.{time.time_ns()}.json"
+            with self._tmp_file(suffix="_refs.json") as tmp_file:
+                with tmp_file.open("w") as fid:
+                    json.dump(sorted(blobs), fid)
+                if not self._upload_file(tmp_file, refs_file):
+                    return False
+        for old_file in old_files:
+            self._delete_and_check(old_file, location="vip", timeout=30)
+        return True
+
+    # ------------------------------------------------
+
+    # Remove the blobs which are not referenced anymore
+    def _collect_store(self, blobs: set, attempts=3) -> None:
+        """
+        Removes the `blobs` which are not referenced by any session from the store,
+        with their hash directory when no other blob uses it.
+        Nothing is removed if the references cannot be read after `attempts` listings.
+        """
+        if not blobs:
+            return
+        # Blobs referenced by the sessions
+        for _ in range(attempts):
+            used, complete = set(), True
+            for refs_files in self._list_store_refs().values():
+                for refs_file in refs_files:
+                    refs = self._read_refs_file(refs_file)
+                    # A file removed since the listing is replaced by a newer one: list again
+                    if refs is None:
+                        complete = False
+                        break
+                    used.update(refs)
+                if not complete:
+                    break
+            if complete:
+                break
+        else:
+            self._print("(!) The references to the input store could not be read: no file was removed.")
+            return
+        # Remove the other blobs (with their directory if it is not used anymore)
+        used_dirs = {str(PurePosixPath(blob).parent) for blob in used}
+        to_delete = set()
+        for blob in set(blobs) - used:
+            hash_dir = str(PurePosixPath(blob).parent)
+            if hash_dir == "." or hash_dir in used_dirs:
+                to_delete.add(blob)
+            else:
+                to_delete.add(hash_dir)
+        for path in sorted(to_delete):
+            self._delete_path(self._STORE_PATH / path, location="vip")
+
+    # ------------------------------------------------
+
+    # Remove the references of this session to the store
+    def _release_store(self) -> None:
+        """Removes the references of this session to the store, and the blobs no other session uses."""
+        blobs = self._read_store_refs(self._session_name)
+        if not blobs and not self._load_input_store():
+            return
+        self._print("Releasing the input files from the store ... ", end="", flush=True)
+        self._write_store_refs(set())
+        self._collect_store(set(blobs))
+        self._save_input_store({})
+        self._print("Done.")
+
+    # ------------------------------------------------
+
+    # Method to upload files using parallel threads
+    def _upload_parallel(self, files_to_upload: list) -> list:
+        """
+        Uploads files to VIP using parallel threads.
+        - `files_to_upload`: list of tuples in format (`local_file`, `vip_file`).
+
+        Returns a list of files which failed to be uploaded on VIP.
+        """
+        # Return if there is no file to upload
+        if not files_to_upload:
+            return []
+        # Check the amount of data
+        try:
+            total_size = "%.1fMB" % sum(
+                [local_file.stat().st_size / (1 << 20) for local_file, _ in files_to_upload]
+            )
+        except:
+            total_size = "unknown"
+        # Display
+        self._print(
+            "%d files to upload. Total size: %s." % (len(files_to_upload), total_size)
+        )
+        # Upload the files on VIP servers
         nFile = 0
+        nb_files = len(files_to_upload)
         failures = []
-        for local_file in files_to_upload:
+        meter = vip.TransferMeter()  # Keeps track of the uploaded bytes
+        for file, done in self._api().upload_parallel(files_to_upload, progress=meter):
             nFile += 1
+            local_file, _ = file
             # Get the file size (if possible)
             try:
                 size = f"{local_file.stat().st_size/(1<<20):,.1f}MB"
             except:
                 size = "unknown size"
-            # Display the current file
-            self._print(
-                f"\t[{nFile}/{len(files_to_upload)}] Uploading file: {local_file.name} ({size}) ...",
-                end=" ",
-            )
-            # Upload the file on VIP
-            vip_file = vip_path / local_file.name  # file path on VIP
-            if self._upload_file(local_path=local_file, vip_path=vip_file):
-                # Upload was successful
-                self._print("Done.")
+            if done:
+                # Display success
+                self._print(
+                    f"\t[{nFile}/{nb_files}] DONE: {local_file} ({size})",
+                    "(%.1fMB/s)" % (meter.throughput() / (1 << 20)),
+                    flush=True,
+                )
             else:
-                # Update display
-                self._print(f"\n(!) Something went wrong during the upload.")
+                # Display failure
+                self._print(
+                    f"\t[{nFile}/{nb_files}] FAILED: {local_file} ({size})",
+                    flush=True,
+                )
                 # Update missing files
                 failures.append(str(local_file))
-        # Look for sub-directories
-        subdirs = [elem for elem in local_path.iterdir() if elem.is_dir()]
-        # Recurse this function over sub-directories
-        for subdir in subdirs:
-            failures += self._upload_dir(
-                local_path=subdir, vip_path=vip_path / subdir.name
-            )
         # Return the list of failures
         return failures
 
     # ------------------------------------------------
 
     # Method to upload a single file on VIP
-    @classmethod
+    @vip.clientmethod
     def _upload_file(cls, local_path: Path, vip_path: PurePosixPath) -> bool:
         """
         Uploads a single file in `local_path` to `vip_path`.
@@ -958,21 +1719,21 @@ class VipSession(VipLauncher):
         # Check
         assert local_path.exists(), f"{local_path} does not exist."
         # Upload
-        done = vip.upload(str(local_path), str(vip_path))
+        done = cls._api().upload(str(local_path), str(vip_path))
         # Return
         return done
 
     # ------------------------------------------------
 
     # Method to download a single file from VIP
-    @classmethod
+    @vip.clientmethod
     def _download_file(cls, vip_path: PurePosixPath, local_path: Path) -> bool:
         """
         Downloads a single file in `vip_path` to `local_path`.
         Returns a success flag.
         """
         # Download (file existence is not checked to save time)
-        return vip.download(str(vip_path), str(local_path))
+        return cls._api().download(str(vip_path), str(local_path))
 
     # ------------------------------------------------
 
@@ -1001,7 +1762,16 @@ class VipSession(VipLauncher):
         # Download the files from VIP servers
         nFile = 0
         nb_files = len(files_to_download)
-        for file, done in vip.download_parallel(list(files_to_download)):
+        meter = vip.TransferMeter()  # Keeps track of the downloaded bytes
+        # Expected file sizes, to check the downloads before renaming the partial files
+        sizes = {
+            file: info["size"]
+            for file, info in files_to_download.items()
+            if "size" in info
+        }
+        for file, done in self._api().download_parallel(
+            list(files_to_download), sizes=sizes, progress=meter
+        ):
             nFile += 1
             # Get informations about the new file
             vip_path, local_path = file
@@ -1019,6 +1789,7 @@ class VipSession(VipLauncher):
                     f"- [{nFile}/{nb_files}] DONE:",
                     local_path.name,
                     file_size,
+                    "(%.1fMB/s)" % (meter.throughput() / (1 << 20)),
                     flush=True,
                 )
                 # If the output is a tarball, extract the files and delete the tarball
@@ -1044,7 +1815,8 @@ class VipSession(VipLauncher):
     def _init_download(self, workflow) -> dict:
         """
         Returns files to download from VIP as dictionnary with keys (`vip_file`, `local_file`).
-        - The returned dictionnary contains only missing files on the local machine;
+        - The returned dictionnary contains only missing files on the local machine
+            (interrupted downloads are resumed from their partial file);
         - Each file may have metadata as a nested dictionnary;
         - Local parent folders are created along the file scan.
         """
@@ -1068,7 +1840,9 @@ class VipSession(VipLauncher):
             )  # This key matches the requirements of `vip.download_parallel()`
             files_to_download[file] = {}
             # Update the file metadata
-            files_to_download[file].update()
+            files_to_download[file].update(
+                {key: output[key] for key in ["size"] if key in output}
+            )
             # Make the parent directory (if needed)
             self._mkdirs(local_path.parent, location="local")
         # Return the list of files to download
@@ -1115,8 +1889,14 @@ class VipSession(VipLauncher):
     # Save session properties TO a JSON file
     def _save_session(self, session_data: dict, location="local") -> bool:
         """
-        Saves dictionary `session_data` to a JSON file in the LOCAL output directory.
+        Saves dictionary `session_data` in the LOCAL output directory.
         Returns a success flag.
+
+        Local backups are saved incrementally:
+        - The changes since the last save (properties & workflows) are appended 
+            to a journal file (`_JOURNAL_FILE`), one JSON line per save;
+        - Every `_JOURNAL_SIZE` entries, the journal is compacted into the backup file
+            (`_SAVE_FILE`, same JSON format as before).
         """
         # Call parent class if location is unknown
         if location != "local":
@@ -1128,9 +1908,20 @@ class VipSession(VipLauncher):
         file = self._local_output_dir / self._SAVE_FILE
         # Make the output directory if it does not exist
         is_new = self._mkdirs(file.parent, location="local")
-        # Save the data in JSON format
-        with file.open("w") as outfile:
-            json.dump(session_data, outfile, indent=4)
+        # Append the changes to the journal, or compact the journal into the backup file
+        with self._locked_backup():
+            if (
+                self._journal_digest is None
+                or self._journal_entries >= self._JOURNAL_SIZE
+                or not file.is_file()
+                # The backup was compacted by another process
+                or self._journal_header() != self._journal_digest
+            ):
+                self._write_snapshot(session_data)
+            else:
+                self._append_journal(session_data)
+        # Keep a copy of the saved data
+        self._journal_state = json.loads(json.dumps(session_data))
         # Display
         self._print()
         if is_new:
@@ -1147,6 +1938,9 @@ class VipSession(VipLauncher):
         Loads backup data from the LOCAL output directory.
         If the backup file could not be read, returns None.
         Otherwise, returns session properties as a dictionary.
+
+        The journal (if any) is replayed line by line on top of the backup file.
+        Backup files without journal (e.g., from older versions) are read as is.
         """
         # Call parent class if location is unknown
         if location != "local":
@@ -1158,9 +1952,15 @@ class VipSession(VipLauncher):
         file = self._local_output_dir / self._SAVE_FILE
         if not file.is_file():
             return None
-        # Load the JSON file
-        with file.open() as fid:
-            session_data = json.load(fid)
+        with self._locked_backup(shared=True):
+            # Load the JSON file
+            content = file.read_bytes()
+            session_data = json.loads(content)
+            # Replay the journal
+            self._journal_digest = self._read_journal(
+                session_data, hashlib.sha1(content).hexdigest()
+            )
+        self._journal_state = json.loads(json.dumps(session_data))
         # Update the local output directory
         session_data["local_output_dir"] = self.local_output_dir
         # Display success & return
@@ -1169,6 +1969,136 @@ class VipSession(VipLauncher):
 
     # ------------------------------------------------
 
+    # Write the backup file and start a new journal
+    def _write_snapshot(self, session_data: dict) -> None:
+        """
+        Writes `session_data` to the backup file, then resets the journal.
+        The journal starts with the hash of the backup file, so that a journal 
+        left by an interrupted compaction is ignored (see `_read_journal()`).
+        """
+        file = self._local_output_dir / self._SAVE_FILE
+        journal = self._local_output_dir / self._JOURNAL_FILE
+        content = json.dumps(session_data, indent=4).encode()
+        digest = hashlib.sha1(content).hexdigest()
+        # Write both files atomically
+        tmp_file = file.with_name(f"{file.name}.{os.getpid()}.tmp")
+        tmp_file.write_bytes(content)
+        os.replace(tmp_file, file)
+        tmp_file = journal.with_name(f"{journal.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps({"snapshot": digest}) + "\n")
+        os.replace(tmp_file, journal)
+        # Update the journal state
+        self._journal_digest = digest
+        self._journal_entries = 0
+
+    # ------------------------------------------------
+
+    # Append the changes since the last save to the journal
+    def _append_journal(self, session_data: dict) -> None:
+        """Appends the differences between `session_data` and the last saved data to the journal"""
+        previous = self._journal_state
+        # Changed properties
+        properties = {
+            key: value
+            for key, value in session_data.items()
+            if key != "workflows" and (key not in previous or previous[key] != value)
+        }
+        # Changed / removed workflows
+        old_workflows = previous.get("workflows") or {}
+        new_workflows = session_data.get("workflows") or {}
+        workflows = {
+            wid: workflow
+            for wid, workflow in new_workflows.items()
+            if old_workflows.get(wid) != workflow
+        }
+        removed = [wid for wid in old_workflows if wid not in new_workflows]
+        # Build the journal entry
+        entry = {}
+        if properties:
+            entry["properties"] = properties
+        if workflows:
+            entry["workflows"] = workflows
+        if removed:
+            entry["removed"] = removed
+        if not entry:
+            return
+        # Append 1 line
+        journal = self._local_output_dir / self._JOURNAL_FILE
+        with journal.open("a") as fid:
+            fid.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._journal_entries += 1
+
+    # ------------------------------------------------
+
+    # Replay the journal on top of the backup data
+    def _read_journal(self, session_data: dict, digest: str) -> str:
+        """
+        Updates `session_data` with the entries of the journal, streamed line by line.
+        Returns `digest` if the journal matches the backup file with this hash, None otherwise.
+        - A journal written for another backup file is ignored;
+        - An incomplete last line (interrupted write) is ignored.
+        """
+        journal = self._local_output_dir / self._JOURNAL_FILE
+        self._journal_entries = 0
+        if not journal.is_file():
+            return None
+        with journal.open() as fid:
+            # Check the header
+            if self._journal_header(fid) != digest:
+                return None
+            # Replay each entry
+            for line in fid:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The next save will compact the journal
+                    return None
+                session_data.update(entry.get("properties", {}))
+                workflows = session_data.setdefault("workflows", {})
+                if workflows is None:
+                    workflows = session_data["workflows"] = {}
+                workflows.update(entry.get("workflows", {}))
+                for wid in entry.get("removed", []):
+                    workflows.pop(wid, None)
+                self._journal_entries += 1
+        return digest
+
+    # ------------------------------------------------
+
+    # Hash of the backup file from the journal header
+    def _journal_header(self, fid=None) -> str:
+        """
+        Returns the hash of the backup file recorded in the first line of the journal,
+        or None if the journal is missing or invalid.
+        - `fid` [Optional]: journal opened for reading (the first line is consumed).
+        """
+        if fid is None:
+            journal = self._local_output_dir / self._JOURNAL_FILE
+            if not journal.is_file():
+                return None
+            with journal.open() as fid:
+                return self._journal_header(fid)
+        try:
+            return json.loads(fid.readline()).get("snapshot")
+        except (json.JSONDecodeError, AttributeError):
+            return None
+
+    # ------------------------------------------------
+
+    # Lock the local backup files while executing code
+    @contextmanager
+    def _locked_backup(self, shared=False) -> None:
+        """
+        Under this context, holds an advisory lock on the backup files of the
+        local output directory, so that several processes can save and load
+        the same session safely.
+        - `shared`: lock for reading (not exclusive, except on Windows).
+        """
+        with self._locked_file(self._local_output_dir / self._LOCK_FILE, shared=shared):
+            yield
+
+    # ------------------------------------------------
+
     ###########################################################################
     # Hide VIP paths to the user and allow multi-OS use (Unix, Windows)
     ###########################################################################
@@ -1181,8 +2111,59 @@ class VipSession(VipLauncher):
         - Converts all input paths (local or VIP) to PathLib objects
             and write them relatively to their input directory. For example:
             '/vip/Home/API/INPUTS/my_signals/signal001' becomes: 'my_signals/signal001'
+        - Stores lists of inputs as InputList objects (relative paths are kept as is)
         - Leaves the other parameters untouched.
         """
+        # Input directories, as strings (computed once)
+        vip_dir = (
+            str(self._vip_input_dir) if self._is_defined("_vip_input_dir") else None
+        )
+        local_dir = (
+            # We must use absolute paths to find the relative parts
+            self._local_input_dir.resolve() if self._is_defined("_local_input_dir") else None
+        )
+        vip_prefix = vip_dir.rstrip("/") + "/" if vip_dir is not None else None
+        # Input files linked to the store, from their VIP path
+        store_files = {path: file for file, path in self._store_paths().items()}
+        local_prefix = os.path.join(str(local_dir), "") if local_dir is not None else None
+
+        # Function to write a path relatively to its input directory
+        def relative_path(input) -> str:
+            """
+            Returns the part of `input` that is relative to the input directories (local or VIP),
+            in Posix format, or None if no relative part could be found.
+            """
+            # Case: VIP path
+            if str(input).startswith(
+                self._SERVER_PATH_PREFIX
+            ):  # PurePath.is_relative_to() is unavailable for Python <3.9
+                path = self._posix_path(input)
+                if path in store_files:
+                    return store_files[path]
+                if vip_dir is None:
+                    return None
+                if path == vip_dir:
+                    return "."
+                if path.startswith(vip_prefix):
+                    return path[len(vip_prefix) :]
+                return None
+            # Case: local path or any other string input
+            if local_dir is None:
+                return None
+            # Fast path: absolute path in the input directory
+            path = os.path.abspath(input)
+            if path == str(local_dir):
+                return "."
+            if path.startswith(local_prefix):
+                path = path[len(local_prefix) :]
+                # Force Posix flavor to avoid conflicts with Windows paths when checking equality
+                return path if os.sep == "/" else str(PurePosixPath(PurePath(path)))
+            # Resolve symbolic links
+            try:  # No condition since PurePath.is_relative_to() is unavailable for Python <3.9
+                return str(PurePosixPath(Path(input).resolve().relative_to(local_dir)))
+            except ValueError:
+                # This is the case when no relative part could be found
+                return None
 
         # Function to convert local / VIP paths to relative paths
         def parse_value(input):
@@ -1190,36 +2171,24 @@ class VipSession(VipLauncher):
             When possible, writes `input` relatively to the input directories (local or VIP), *if possible*.
             `input` can be a single string / os.PathLike object or a list of both types.
             """
+            # Case: parsed list of inputs
+            if isinstance(input, InputList):
+                values, paths = list(input.values), bytearray(input.paths)
+                for index, value in enumerate(values):
+                    relative = None if paths[index] else relative_path(value)
+                    if relative is not None:
+                        values[index], paths[index] = relative, 1
+                return InputList(values, bytes(paths))
+            # Case: list of strings / paths
+            elif InputList.accepts(input):
+                return InputList.parse(input, relative_path)
             # Case: multiple inputs
-            if isinstance(input, list):
+            elif isinstance(input, list):
                 return [parse_value(element) for element in input]
             # Case: single input, string or path-like
             elif isinstance(input, (str, os.PathLike)):
-                # Case: VIP path
-                if str(input).startswith(
-                    self._SERVER_PATH_PREFIX
-                ):  # PurePath.is_relative_to() is unavailable for Python <3.9
-                    if self._is_defined("_vip_input_dir"):
-                        input_dir = self._vip_input_dir
-                        input_path = PurePosixPath(input)
-                    else:  # Return input if `_vip_input_dir` is unset
-                        return input
-                # Case: local path or any other string input
-                else:
-                    if self._is_defined("_local_input_dir"):
-                        # We must use absolute paths to find the relative parts
-                        input_dir = self._local_input_dir.resolve()
-                        input_path = Path(input).resolve()
-                    else:  # Return input if `_local_input_dir` is unset
-                        return input
-                # Return the part of `input_path` that is relative to `input_dir` (if relevant)
-                try:  # No condition since PurePath.is_relative_to() is unavailable for Python <3.9
-                    return PurePosixPath(  # Force Posix flavor to avoid conflicts with Windows paths when checking equality
-                        input_path.relative_to(input_dir)
-                    )  # Relative part of `input_path`
-                except ValueError:
-                    # This is the case when no relative part could be found
-                    return input
+                relative = relative_path(input)
+                return input if relative is None else PurePosixPath(relative)
             # Case not string or path-like: return as is
             else:
                 return input
@@ -1252,7 +2221,9 @@ class VipSession(VipLauncher):
             elif not isinstance(value, PurePath):
                 return value
             # Case : Path relative to any `input_dir` => Cannot be distinguished from other parameters when parsing
-            # Case : VIP path
+            # Case : VIP path (linked to the store or in the input directory)
+            elif (location == "vip") and str(value) in store_paths:
+                return store_paths[str(value)]
             elif (location == "vip") and self._is_defined("_vip_input_dir"):
                 return str(self._vip_input_dir / value)
             # Case: local path
@@ -1262,13 +2233,37 @@ class VipSession(VipLauncher):
             else:
                 return str(value)
 
+        # Function to bind the paths of an InputList to `location` (computed once per input directory)
+        def get_input_list(value: InputList, location) -> list:
+            if (location == "vip") and self._is_defined("_vip_input_dir"):
+                input_dir = str(self._vip_input_dir)
+                prefix = input_dir.rstrip("/") + "/"
+                return value.bind(
+                    (location, input_dir, self._store_version),
+                    lambda path: store_paths.get(path)
+                    or (input_dir if path == "." else prefix + path),
+                )
+            elif (location == "local") and self._is_defined("_local_input_dir"):
+                input_dir = self._local_input_dir
+                return value.bind(
+                    (location, str(input_dir)), lambda path: str(input_dir / path)
+                )
+            else:
+                return value.bind(None, str)
+
         # -----------------------
         # Raise an error if `location` cannot be parsed
         if location not in ("vip", "local"):
             raise NotImplementedError(f"Unknown location: {location}")
+        # VIP paths of the input files linked to the store
+        store_paths = self._store_paths() if location == "vip" else {}
         # Browse input settings
         return {
-            key: get_input(value, location)
+            key: (
+                get_input_list(value, location)
+                if isinstance(value, InputList)
+                else get_input(value, location)
+            )
             for key, value in self._input_settings.items()
         }
 
@@ -3,6 +3,8 @@ All classes for the client.
 - VipSession: main user class. To run a VIP application on local datasets.
 - VipLauncher: to run a Vip application on datasets located on VIP servers.
 - VipCI (alpha): to run a Vip application on datasets located on CREATIS data warehouse.
+- VipMonitor: to monitor the executions of several sessions at once.
+- VipCampaign: to launch many executions under the execution quota of VIP.
 - VipLoader (planned): to upload / download data to / from VIP servers.
 - VipLoader (planned): base class.
 """
@@ -20,4 +22,6 @@ from vip_client.classes.VipSession import VipSession
 from vip_client.classes.VipLauncher import VipLauncher
 from vip_client.classes.VipCI import VipCI
 from vip_client.classes.VipLoader import VipLoader
-from vip_client.classes.VipClient import VipClient 
\ No newline at end of file
+from vip_client.classes.VipClient import VipClient
+from vip_client.classes.VipMonitor import VipMonitor
+from vip_client.classes.VipCampaign import VipCampaign 
\ No newline at end of file
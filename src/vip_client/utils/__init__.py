@@ -1,4 +1,5 @@
 """
 Useful methods for the Python classes. 
 - vip.py: makes requests to the VIP API.
+- vip_async.py: makes concurrent requests to the VIP API with `asyncio` (requires `aiohttp`).
 """
\ No newline at end of file
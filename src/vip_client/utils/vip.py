@@ -2,31 +2,36 @@
 This package is used to communicate with the VIP RESTful API.
 It implements the most basic elements of this Python client. 
 NB: This is a synchronous implementation.
+Requests are sent with the current `Client` of each thread (API key, connection pools):
+several clients (i.e., VIP accounts) can be used in the same process.
 """
 
 # Author: Timothée Chabat
 # Maintainer: Gaël Vila
 
 # Built-in libraries
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+import atexit
+import functools
 from os.path import exists
 from pathlib import *
+import logging
+import os
+import re
 import threading
+import time
+import types
+import weakref
+from contextlib import contextmanager
 # Third-Party
 import requests
 
 ########################### VARIABLES & ERRORS ################################
 # -----------------------------------------------------------------------------
 # API URL
-__PREFIX = "https://vip.creatis.insa-lyon.fr/rest/"
-
-# API key
-__apikey = None
-__headers = {'apikey': __apikey}
-
-# Void `requests` session (inefficient until __api_key is unset)
-SESSION = requests.Session() # with retry strategy
-SESSION_NO_RETRY = requests.Session() # without retry strategy
+PREFIX = "https://vip.creatis.insa-lyon.fr/rest/"
 
 # Strategy for retrying requests
 retry_strategy = requests.adapters.Retry(
@@ -41,67 +46,564 @@ retry_strategy = requests.adapters.Retry(
     backoff_factor = 8 # retries after 0s, 16s, 32s, 64s
 )
 
-# Mount a `requests` Session with the API key and retry strategy
-def new_session() -> requests.Session:
-    """Creates a new `requests` Session with headers and retry strategy"""
-    new_session = requests.Session()
-    new_session.mount(__PREFIX, requests.adapters.HTTPAdapter(max_retries=retry_strategy))
-    new_session.headers.update(__headers)
-    return new_session
-
-# Mount a `requests` Session without retry strategy
-def new_session_no_retry() -> requests.Session:
-    """Creates a new `requests` Session without retry strategy"""
-    new_session = requests.Session()
-    new_session.headers.update(__headers)
-    return new_session
+# Default size of the connection pools of each client.
+# `urllib3` pools are thread-safe: keep-alive connections are reused across 
+# launches, polls and transfers, whatever the thread that sends the request.
+# Their size follows the number of parallel threads (see `set_pool_size()`).
+POOL_SIZE = 10
 
 # Parallel downloads are implemented with a multithreading 
 # strategy for IO-bound operations.
 
-# Maximum number of threads to parallelize
+# Bounds for the number of parallel requests during transfers.
+# Concurrency starts at MAX_THREADS and is adapted between these bounds (see `AdaptiveConcurrency`).
+MIN_THREADS = 1
 MAX_THREADS = 10
-    
+
+# Size of the chunks streamed to disk during downloads (bytes).
+# This bounds the memory used by each download, whatever the file size.
+CHUNK_SIZE = 1 << 20 # 1MiB
+
+# Suffix of the partial files written during downloads.
+# The file is renamed to its final name once it is complete.
+PART_SUFFIX = ".part"
+
 # The `request` Session is not thread-safe: 
 # must be local to each thread when parallelized. 
+# (Thread-local sessions still share the connection pools of their client.)
 
-# Local object to gather thread-safe variables
+# Local object to gather thread-safe variables (e.g., the current client)
 thread_local = threading.local()
 
+################################## CLIENTS ####################################
+# -----------------------------------------------------------------------------
+# Time during which the metadata of VIP paths are cached (seconds)
+PATH_CACHE_TTL = 60
+
+# Maximum number of cached paths for each client 
+# (a directory listing counts for the number of its elements)
+PATH_CACHE_SIZE = 100000
+
+class PathCache:
+    """
+    Thread-safe cache of VIP path metadata: existence, properties (e.g., `isDirectory`, `size`) 
+    and directory listings.
+    - Entries expire after `ttl` seconds (set `ttl` to 0 to disable the cache);
+    - Least recently used entries are evicted when the cache holds more than `max_size` paths;
+    - Writes through this module (`create_dir()`, `upload()`, `delete_path()`) update the cache.
+    Paths are strings (VIP paths, without trailing '/').
+    """
+
+    def __init__(self, ttl=PATH_CACHE_TTL, max_size=PATH_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        # (kind, path) -> (expiry time, size, value) with kind in: 'exists', 'properties', 'list'
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _path(path) -> str:
+        return str(path).rstrip('/') or '/'
+
+    @classmethod
+    def _parent(cls, path) -> str:
+        return cls._path(path.rsplit('/', 1)[0])
+
+    def _get(self, kind, path):
+        """Cached value for (`kind`, `path`), or None (lock must be held)"""
+        key = (kind, path)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def _set(self, kind, path, value, size=1) -> None:
+        """Caches `value` for (`kind`, `path`) (lock must be held)"""
+        key = (kind, path)
+        self._pop(key)
+        self._entries[key] = (time.monotonic() + self.ttl, size, value)
+        self._size += size
+        # Evict the least recently used entries
+        while self._size > self.max_size and self._entries:
+            self._pop(next(iter(self._entries)))
+
+    def _pop(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+    def exists(self, path):
+        """Returns True / False if the existence of `path` is known, None otherwise"""
+        path = self._path(path)
+        with self._lock:
+            exists = self._get('exists', path)
+            if exists is not None:
+                return exists
+            properties = self._get('properties', path)
+            if properties is not None:
+                return properties.get('exists', True)
+            # Look for `path` in the listing of its parent directory
+            listing = self._get('list', self._parent(path))
+            if listing is not None:
+                return path in listing
+        return None
+
+    def properties(self, path):
+        """Returns the properties of `path` if they are known, None otherwise"""
+        path = self._path(path)
+        with self._lock:
+            properties = self._get('properties', path)
+            if properties is None:
+                listing = self._get('list', self._parent(path))
+                if listing is not None:
+                    properties = listing.get(path)
+        return properties
+
+    def listing(self, path):
+        """Returns the content of directory `path` if it is known, None otherwise"""
+        with self._lock:
+            listing = self._get('list', self._path(path))
+        return None if listing is None else list(listing.values())
+
+    def set_exists(self, path, exists: bool) -> None:
+        if self.ttl > 0:
+            with self._lock:
+                self._set('exists', self._path(path), exists)
+
+    def set_properties(self, path, properties: dict) -> None:
+        if self.ttl > 0:
+            with self._lock:
+                self._set('properties', self._path(path), properties)
+
+    def set_listing(self, path, elements: list) -> None:
+        if self.ttl > 0:
+            path = self._path(path)
+            listing = {self._path(element['path']): element for element in elements}
+            with self._lock:
+                self._set('list', path, listing, size=1 + len(listing))
+                self._set('exists', path, True)
+
+    def invalidate(self, path, recursive=False) -> None:
+        """
+        Removes the metadata of `path` and the listing of its parent directory.
+        If `recursive` is True, also removes the metadata of the content of `path`.
+        """
+        path = self._path(path)
+        with self._lock:
+            for kind in ('exists', 'properties', 'list'):
+                self._pop((kind, path))
+            self._pop(('list', self._parent(path)))
+            if recursive:
+                prefix = path.rstrip('/') + '/'
+                for key in [key for key in self._entries if key[1].startswith(prefix)]:
+                    self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+# -----------------------------------------------------------------------------
+class Client:
+    """
+    Connection to VIP for one account: API key, connection pools and caches (pipelines, paths).
+    - Clients are independent: several accounts can be used in the same process;
+    - The functions of this module send their requests with the current client 
+    of the calling thread (see `use()` and `get_client()`), i.e. `CLIENT` by default;
+    - These functions are also methods of each client, e.g.: `client.list_executions()`.
+
+    `apikey` is not checked at instantiation: see `set_api_key()`.
+    """
+
+    # Live clients (closed when Python exits)
+    _instances = weakref.WeakSet()
+
+    def __init__(self, apikey=None, prefix=PREFIX, pool_size=POOL_SIZE):
+        self.prefix = prefix
+        self.apikey = apikey
+        self.headers = {'apikey': apikey}
+        # Connection pools shared by all `requests` Sessions of this client
+        self.pool_size = pool_size
+        self._new_adapters(pool_size)
+        self.session = self.new_session() # with retry strategy
+        self.session_no_retry = self.new_session_no_retry() # without retry strategy
+        # Pipelines available for this account (filled by the client classes)
+        self.pipelines = []
+        # Default verbose mode of the client classes using this account (set by their `init()`)
+        self.verbose = True
+        # Metadata of VIP paths (see `PathCache`)
+        self.paths = PathCache()
+        # Thread-local Sessions of this client (see `init_thread()`)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        Client._instances.add(self)
+
+    def __repr__(self) -> str:
+        return "%s(%r)" % (type(self).__name__, self.prefix)
+
+    # Create the connection pools
+    def _new_adapters(self, size: int) -> None:
+        """Creates the connection pools of this client, with `size` connections each"""
+        self.adapter = requests.adapters.HTTPAdapter(
+            pool_connections=size, pool_maxsize=size,
+            max_retries=retry_strategy) # with retry strategy
+        self.adapter_no_retry = requests.adapters.HTTPAdapter(
+            pool_connections=size, pool_maxsize=size) # without retry strategy
+
+    # Mount a `requests` Session with the API key and retry strategy
+    def new_session(self) -> requests.Session:
+        """Creates a new `requests` Session with headers and retry strategy"""
+        new_session = requests.Session()
+        new_session.mount(self.prefix, self.adapter)
+        new_session.headers.update(self.headers)
+        return new_session
+
+    # Mount a `requests` Session without retry strategy
+    def new_session_no_retry(self) -> requests.Session:
+        """Creates a new `requests` Session without retry strategy"""
+        new_session = requests.Session()
+        new_session.mount(self.prefix, self.adapter_no_retry)
+        new_session.headers.update(self.headers)
+        return new_session
+
+    def set_api_key(self, value) -> bool:
+        """
+        Return True is correct apikey, False otherwise.
+        Raise an error if an other problems occured 
+        """
+        url = self.prefix + 'plateform'
+        head_test = {
+                     'apikey': value,
+                    }
+        # Send a single test request (through the shared connection pool)
+        rq = self.session_no_retry.put(url, headers=head_test)
+        res = detect_errors(rq)
+        if res[0]:
+            # Error
+            if res[1] == 40101:
+                return False
+            else:
+                raise RuntimeError("Error {} from VIP : {}".format(res[1], res[2]))
+        # OK: set the API key
+        with self._lock:
+            self.apikey = value
+            self.headers['apikey'] = value
+            for session in (self.session, self.session_no_retry):
+                session.headers.update(self.headers)
+            self.pipelines = []
+            self.paths.clear()
+        return True
+
+    def set_pool_size(self, size: int) -> None:
+        """
+        Ensures the connection pools can keep `size` connections alive to VIP.
+        Pools are only enlarged: new pools are mounted on the Sessions of this client 
+        (and on new thread Sessions), then the idle connections of the old pools are closed.
+        """
+        with self._lock:
+            if size <= self.pool_size:
+                return
+            self.pool_size = size
+            old_adapters = (self.adapter, self.adapter_no_retry)
+            self._new_adapters(size)
+            self.session.mount(self.prefix, self.adapter)
+            self.session_no_retry.mount(self.prefix, self.adapter_no_retry)
+            for adapter in old_adapters:
+                adapter.close()
+
+    def close(self) -> None:
+        """
+        Closes all connections of this client.
+        The pools remain usable: new connections are opened on the next request.
+        """
+        for adapter in (self.adapter, self.adapter_no_retry):
+            adapter.close()
+
+    # Function to create a new Session object when initializing the current thread
+    def init_thread(self) -> None:
+        """
+        Creates a new thread-safe version of the `requests` Session with a retry strategy,
+        and makes this client the current client of the thread.
+        """
+        assert not hasattr(self._local, "session")
+        self._local.session = self.new_session()
+        thread_local.client = self
+
+    def thread_session(self) -> requests.Session:
+        """
+        Returns the thread-safe Session of the current thread (see `init_thread()`),
+        or the Session of this client outside of the parallel threads.
+        """
+        return getattr(self._local, "session", self.session)
+
+    @contextmanager
+    def use(self):
+        """
+        Under this context, the functions of this module run with this client
+        in the current thread.
+        """
+        previous = getattr(thread_local, "client", None)
+        thread_local.client = self
+        try:
+            yield self
+        finally:
+            if previous is None:
+                del thread_local.client
+            else:
+                thread_local.client = previous
+
+    def __getattr__(self, name):
+        """Functions of this module listed in `API`, run with this client"""
+        if name not in API:
+            raise AttributeError("%r object has no attribute %r" % (type(self).__name__, name))
+        function = globals()[name]
+        @functools.wraps(function)
+        def method(*args, **kwargs):
+            with self.use():
+                return function(*args, **kwargs)
+        return method
+
+# Default client
+CLIENT = Client()
+
+# Connection pools & Sessions of the default client
+# (the pools are replaced when they are enlarged: see `Client.set_pool_size()`)
+ADAPTER = CLIENT.adapter # with retry strategy
+ADAPTER_NO_RETRY = CLIENT.adapter_no_retry # without retry strategy
+SESSION = CLIENT.session # with retry strategy
+SESSION_NO_RETRY = CLIENT.session_no_retry # without retry strategy
+
+def get_client() -> Client:
+    """Returns the current client of the calling thread (`CLIENT` by default)"""
+    return getattr(thread_local, "client", CLIENT)
+
+class clientmethod(classmethod):
+    """
+    Method decorator for the client classes: same as `classmethod`, 
+    except that the method receives the instance when called from an instance. 
+    This lets the method use the client of the instance (if any).
+    """
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return super().__get__(instance, owner)
+        return types.MethodType(self.__func__, instance)
+
+def set_pool_size(size: int) -> None:
+    """
+    Ensures the connection pools of the current client can keep `size` connections alive to VIP.
+    Pools are only enlarged: see `Client.set_pool_size()`.
+    """
+    get_client().set_pool_size(size)
+
+def close() -> None:
+    """
+    Closes all connections of the current client. 
+    This is done automatically for all clients when Python exits.
+    The pools remain usable: new connections are opened on the next request.
+    """
+    get_client().close()
+
+def _close_clients() -> None:
+    """Closes all connections of the live clients"""
+    for client in list(Client._instances):
+        client.close()
+
+atexit.register(_close_clients)
+
+# Mount a `requests` Session with the API key and retry strategy
+def new_session() -> requests.Session:
+    """Creates a new `requests` Session with headers and retry strategy"""
+    return get_client().new_session()
+
+# Mount a `requests` Session without retry strategy
+def new_session_no_retry() -> requests.Session:
+    """Creates a new `requests` Session without retry strategy"""
+    return get_client().new_session_no_retry()
+
 # Function to create a new Session object when initializing the current thread
 def init_thread()  -> requests.Session:
     """Creates a new thread-safe version of the `requests` Session with a retry strategy"""
-    assert not hasattr(thread_local, "session")
-    thread_local.session = new_session()
+    get_client().init_thread()
+
+# Function to get the Session of the current thread
+def _session() -> requests.Session:
+    """
+    Returns the thread-safe Session of the current thread (see `init_thread()`),
+    or the Session of the current client outside of the parallel threads.
+    This allows to call the functions of this module from parallel threads.
+    """
+    return get_client().thread_session()
+
+# Parallel transfers submit their requests through a bounded window: 
+# files are pulled from the input iterable only when a slot is free, 
+# so very large (or lazy) file lists are never expanded in memory.
+# The window size (i.e., the concurrency) is set by an `AdaptiveConcurrency` controller.
+
+# Logger for concurrency decisions
+logger = logging.getLogger(__name__)
+
+class AdaptiveConcurrency:
+    """
+    Controls the number of parallel requests during transfers, between `min_limit` and `max_limit`.
+    - Concurrency starts at `start` (default: `max_limit`);
+    - Throughput is measured in transferred bytes per second (see `transferred()`);
+    - Concurrency is doubled (slow start), then increased by 1, while throughput improves;
+    - Concurrency is halved after errors (including HTTP errors and timeouts);
+    - Concurrency is decreased by 1 when latency rises without throughput gain.
+
+    Requests are tagged with the current `epoch` when they are submitted, which
+    changes after each decrease: the results of requests submitted before the last decrease
+    are ignored, so that the concurrency is decreased at most once per window.
+
+    Decisions are made after each round of `limit` requests and logged with 
+    the logger of this module (INFO level).
+    """
+
+    # Relative gain of throughput considered as an improvement
+    GAIN = 0.05
+    # Latency factor (relative to the best round) considered as a rise
+    LATENCY_RISE = 2
+
+    def __init__(self, min_limit=None, max_limit=None, start=None):
+        self.min_limit = max(1, MIN_THREADS if min_limit is None else min_limit)
+        self.max_limit = max(self.min_limit, MAX_THREADS if max_limit is None else max_limit)
+        self.limit = self.max_limit if start is None else start
+        self.limit = min(max(self.limit, self.min_limit), self.max_limit)
+        # Slow start until the first decrease
+        self._slow_start = True
+        # Number of decreases
+        self.epoch = 0
+        # Reference metrics
+        self._best_latency = None
+        self._last_throughput = None
+        # Bytes are counted from the worker threads
+        self._lock = threading.Lock()
+        self._new_round()
+
+    def _new_round(self) -> None:
+        """Resets the metrics of the current round"""
+        self._start = time.time()
+        self._count = 0
+        self._errors = 0
+        self._latency = 0.0
+        with self._lock:
+            self._nbytes = 0
+
+    def _set_limit(self, new_limit, reason) -> None:
+        """Updates the concurrency limit within bounds and logs the decision"""
+        new_limit = min(max(new_limit, self.min_limit), self.max_limit)
+        if new_limit != self.limit:
+            logger.info("Concurrency %d -> %d (%s)", self.limit, new_limit, reason)
+            # New window after a decrease
+            if new_limit < self.limit:
+                self.epoch += 1
+            self.limit = new_limit
+
+    def transferred(self, nbytes) -> None:
+        """Counts `nbytes` transferred bytes (thread-safe)"""
+        with self._lock:
+            self._nbytes += nbytes
+
+    def record(self, success: bool, latency: float, epoch: int = None) -> None:
+        """
+        Records the result of a request that lasted `latency` seconds,
+        submitted during `epoch` (default: the current epoch).
+        """
+        # This request was sent before the last decrease: it belongs to the previous window
+        if epoch is not None and epoch != self.epoch:
+            return
+        self._count += 1
+        self._latency += latency
+        # Cut back as soon as the server fails
+        if not success:
+            self._errors += 1
+            self._slow_start = False
+            self._set_limit(self.limit // 2, "error")
+            # The other requests of this round were sent with the old limit
+            self._last_throughput = None
+            self._new_round()
+            return
+        # Wait for the end of the round
+        if self._count < self.limit:
+            return
+        # Metrics of this round
+        elapsed = max(time.time() - self._start, 1e-6)
+        with self._lock:
+            throughput = self._nbytes / elapsed
+        latency = self._latency / self._count
+        if self._best_latency is None or latency < self._best_latency:
+            self._best_latency = latency
+        # Decide
+        if self._last_throughput is None or throughput > self._last_throughput * (1 + self.GAIN):
+            # Throughput improves
+            new_limit = self.limit * 2 if self._slow_start else self.limit + 1
+            self._set_limit(new_limit, "throughput: %.3g B/s" % throughput)
+        elif latency > self.LATENCY_RISE * self._best_latency:
+            # Latency rises without improving throughput
+            self._slow_start = False
+            self._set_limit(self.limit - 1, "latency: %.3gs" % latency)
+        self._last_throughput = throughput
+        self._new_round()
+
+def _nb_threads(files) -> int:
+    """Number of threads to transfer `files` (any iterable)"""
+    try:
+        return max(1, min(MAX_THREADS, len(files)))
+    except TypeError: # `files` has no length (e.g., a generator)
+        return MAX_THREADS
+
+def _timed_call(function, item) -> tuple:
+    """Returns the result of `function(item)` and its duration (seconds)"""
+    start = time.time()
+    result = function(item)
+    return result, time.time() - start
+
+def _imap_unordered(executor, function, iterable, controller: AdaptiveConcurrency):
+    """
+    Applies `function` to each item in `iterable` with `executor`.
+    - At most `controller.limit` calls are submitted at once;
+    - `iterable` is consumed lazily, as soon as a slot is free;
+    - Results are yielded in completion order.
+    `function` must return a tuple with a success flag in 2nd position.
+    """
+    items = iter(iterable)
+    pending = set()
+    # Epoch of the controller when each call was submitted
+    epochs = {}
+    # Function to fill the submission window
+    def refill():
+        for item in islice(items, max(0, controller.limit - len(pending))):
+            future = executor.submit(_timed_call, function, item)
+            epochs[future] = controller.epoch
+            pending.add(future)
+    refill()
+    while pending:
+        # Wait for the first results
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        # Update the concurrency
+        for future in done:
+            result, latency = future.result()
+            controller.record(result[1], latency, epochs.pop(future))
+        # Refill the submission window
+        refill()
+        # Yield the results
+        for future in done:
+            yield future.result()[0]
 
 # -----------------------------------------------------------------------------
 def setApiKey(value) -> bool:
     """
     Return True is correct apikey, False otherwise.
     Raise an error if an other problems occured 
+    (API key of the current client: see `Client.set_api_key()`)
     """
-    url = __PREFIX + 'plateform'
-    head_test = {
-                 'apikey': value,
-                }
-    # Send a test request
-    rq = requests.put(url, headers=head_test)
-    res = detect_errors(rq)
-    if res[0]:
-        # Error
-        if res[1] == 40101:
-            return False
-        else:
-            raise RuntimeError("Error {} from VIP : {}".format(res[1], res[2]))
-    else:
-        # OK
-        global __apikey, __headers, SESSION, SESSION_NO_RETRY
-        # Set the API key
-        __apikey = value
-        __headers['apikey'] = __apikey
-        SESSION = new_session()
-        SESSION_NO_RETRY = new_session_no_retry()
-        return True
+    return get_client().set_api_key(value)
 
 # -----------------------------------------------------------------------------
 def detect_errors(req)->tuple:
@@ -136,18 +638,23 @@ def manage_errors(req)->None:
         raise RuntimeError("Error {} from VIP : {}".format(res[1], res[2]))
 
 ################################### PATH ######################################
+# Path metadata (existence, properties, listings) are cached by each client 
+# for `PATH_CACHE_TTL` seconds (see `PathCache`).
 # -----------------------------------------------------------------------------
 def create_dir(path)->bool:
     """
     Return True if done, False otherwise
     """
-    url = __PREFIX + 'path' + path
-    rq = SESSION.put(url, headers=__headers)
+    client = get_client()
+    url = client.prefix + 'path' + path
+    rq = client.thread_session().put(url, headers=client.headers)
     try:
         manage_errors(rq)
     except RuntimeError:
         return False
     else:
+        client.paths.invalidate(path)
+        client.paths.set_exists(path, True)
         return True
 
 # -----------------------------------------------------------------------------
@@ -174,14 +681,20 @@ def _path_action(path, action) -> requests.models.Response:
     Also 'content' is not accepted here, use download() function instead.
     """
     assert action in ['list', 'exists', 'properties', 'md5']
-    url = __PREFIX + 'path' + path + '?action=' + action
-    rq = SESSION.get(url, headers=__headers)
+    client = get_client()
+    url = client.prefix + 'path' + path + '?action=' + action
+    rq = client.thread_session().get(url, headers=client.headers)
     manage_errors(rq)
     return rq
 
 # -----------------------------------------------------------------------------
 def list_content(path) -> list:
-    return _path_action(path, 'list').json()
+    paths = get_client().paths
+    content = paths.listing(path)
+    if content is None:
+        content = _path_action(path, 'list').json()
+        paths.set_listing(path, content)
+    return content
 
 # -----------------------------------------------------------------------------
 def list_directory(path) -> list:
@@ -195,11 +708,21 @@ def list_elements(path) -> list:
 
 # -----------------------------------------------------------------------------
 def exists(path) -> bool:
-    return _path_action(path, 'exists').json()['exists']
+    paths = get_client().paths
+    res = paths.exists(path)
+    if res is None:
+        res = _path_action(path, 'exists').json()['exists']
+        paths.set_exists(path, res)
+    return res
 
 # -----------------------------------------------------------------------------
 def get_path_properties(path) -> dict:
-    return _path_action(path, 'properties').json()
+    paths = get_client().paths
+    res = paths.properties(path)
+    if res is None:
+        res = _path_action(path, 'properties').json()
+        paths.set_properties(path, res)
+    return res
 
 # -----------------------------------------------------------------------------
 def is_dir(path) -> bool:
@@ -211,8 +734,11 @@ def delete_path(path)->bool:
     Delete a file or a path (with all its content).
     Return True if done, False otherwise
     """
-    url = __PREFIX + 'path' + path
-    rq = SESSION.delete(url, headers=__headers)
+    client = get_client()
+    url = client.prefix + 'path' + path
+    rq = client.thread_session().delete(url, headers=client.headers)
+    # The deletion may take some time: the path is not cached as missing
+    client.paths.invalidate(path, recursive=True)
     try:
         manage_errors(rq)
     except RuntimeError:
@@ -221,107 +747,383 @@ def delete_path(path)->bool:
         return True
 
 # -----------------------------------------------------------------------------
-def upload(path, where_to_save) -> bool:
+def _put_file(session, path, where_to_save) -> bool:
     """
-    - `path` : on local computer, the file to upload
-    - `where_to_save` : on VIP, something like "/vip/Home/RandomName.ext"
-
+    Uploads the local file `path` to `where_to_save` on VIP with `session`.
     Return True if done, False otherwise
     """
-    url = __PREFIX + 'path' + where_to_save
+    client = get_client()
+    url = client.prefix + 'path' + where_to_save
     headers = {
-                'apikey': __apikey,
+                'apikey': client.apikey,
                 'Content-Type': 'application/octet-stream',
               }
+    # The file is streamed from its handle by small blocks, so memory use does 
+    # not depend on the file size. The handle can be rewound (tell / seek),
+    # which allows the retry strategy to send the body again.
     with open(path, 'rb') as fid:
-        data = fid.read()
-    rq = SESSION.put(url, headers=headers, data=data)
+        # Empty files are sent as empty bytes to keep a `Content-Length` header
+        data = fid if os.fstat(fid.fileno()).st_size > 0 else b''
+        rq = session.put(url, headers=headers, data=data)
+    client.paths.invalidate(where_to_save)
     try:
         manage_errors(rq)
     except RuntimeError:
         return False
     else:
+        client.paths.set_exists(where_to_save, True)
         return True
 
 # -----------------------------------------------------------------------------
-def download(path, where_to_save) -> bool :
+def upload(path, where_to_save) -> bool:
+    """
+    - `path` : on local computer, the file to upload
+    - `where_to_save` : on VIP, something like "/vip/Home/RandomName.ext"
+
+    Return True if done, False otherwise
+    """
+    return _put_file(_session(), path, where_to_save)
+
+# -----------------------------------------------------------------------------
+def _write_content(rq, where_to_save, chunk_size=CHUNK_SIZE, progress=None, mode='wb') -> int:
+    """
+    Streams the body of response `rq` to the local file `where_to_save`.
+    - The file is written `chunk_size` bytes at a time;
+    - `progress(nbytes)` is called after each chunk, if provided;
+    - `mode` is 'wb' to overwrite the file, 'ab' to append to it.
+
+    Returns the number of bytes written.
+    """
+    written = 0
+    with open(where_to_save, mode) as out_file:
+        for chunk in rq.iter_content(chunk_size=chunk_size):
+            out_file.write(chunk)
+            written += len(chunk)
+            if progress is not None:
+                progress(len(chunk))
+    return written
+
+# -----------------------------------------------------------------------------
+def _resumable_download(session, path, where_to_save, size=None, resume=True,
+                        chunk_size=CHUNK_SIZE, progress=None) -> bool:
+    """
+    Downloads `path` from VIP to `where_to_save` through a partial file.
+    - Data are written in `where_to_save` + PART_SUFFIX;
+    - If `resume` is True and the partial file exists, only the missing bytes 
+    are requested (HTTP Range). The download restarts from scratch if the server
+    does not honour the range;
+    - If `size` is provided, the partial file must reach this size to be complete;
+    - The partial file is renamed to `where_to_save` only when it is complete.
+
+    Returns a success flag. Incomplete partial files are kept for the next try.
+    """
+    client = get_client()
+    url = client.prefix + 'path' + path + '?action=content'
+    part_file = where_to_save + PART_SUFFIX
+    # Bytes already on disk
+    offset = os.path.getsize(part_file) if (resume and os.path.isfile(part_file)) else 0
+    if size is not None and offset > size:
+        offset = 0 # The partial file cannot belong to this file
+    # Ask only for the missing bytes
+    headers = dict(client.headers)
+    if offset > 0:
+        headers['Range'] = 'bytes=%d-' % offset
+    with session.get(url, headers=headers, stream=True) as rq:
+        if rq.status_code == 416 and offset > 0:
+            # Range not satisfiable: the partial file is complete or invalid
+            if size is None or offset != size:
+                os.remove(part_file)
+                return _resumable_download(session, path, where_to_save, size, False,
+                                           chunk_size, progress)
+        elif rq.status_code == 206 and offset > 0 and \
+            re.match(r"bytes %d-" % offset, rq.headers.get('Content-Range', '')):
+            # The server sent the missing bytes
+            _write_content(rq, part_file, chunk_size, progress, mode='ab')
+        elif rq.status_code == 200:
+            # The server sent the whole file
+            _write_content(rq, part_file, chunk_size, progress, mode='wb')
+        else:
+            return False
+    # Check the final size
+    if size is not None:
+        actual_size = os.path.getsize(part_file)
+        if actual_size > size:
+            os.remove(part_file) # Unusable data
+        if actual_size != size:
+            return False
+    # Rename the complete file atomically
+    os.replace(part_file, where_to_save)
+    return True
+
+# -----------------------------------------------------------------------------
+def download(path, where_to_save, size=None, resume=False,
+             chunk_size=CHUNK_SIZE, progress=None) -> bool :
     """
     Downloads a single file from VIP.
     - `path`: on VIP, something like "/vip/Home/RandomName.ext", content to dl
     - `where_to_save` : on local computer
+    - `size`: expected file size (bytes), as given by `list_content()`
+    - `resume`: if True, resumes an interrupted download of `where_to_save`
+    - `chunk_size`: size of the chunks written to disk (bytes)
+    - `progress`: callable receiving the number of bytes written after each chunk
     """
-    # Parse arguments
-    url = __PREFIX + 'path' + path + '?action=content'
-    rq = SESSION.get(url, headers=__headers, stream=True)
-    if rq.status_code != 200:
+    try:
+        return _resumable_download(_session(), path, str(where_to_save), size, resume,
+                                   chunk_size, progress)
+    except requests.exceptions.ChunkedEncodingError:
+        # The connection was interrupted during the transfer
         return False
-    else:
-        with open(where_to_save, 'wb') as out_file:
-            out_file.write(rq.content)
-        return True
 
 # Methods for parallel downloads
-    
+
+class TransferMeter:
+    """
+    Thread-safe counter of the bytes transferred by parallel threads.
+    Instances can be given as `progress` callback to `download_parallel()`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.start = time.time()
+        self.nbytes = 0
+
+    def __call__(self, file, nbytes) -> None:
+        with self._lock:
+            self.nbytes += nbytes
+
+    def throughput(self) -> float:
+        """Average throughput since instantiation (bytes/s)"""
+        return self.nbytes / max(time.time() - self.start, 1e-6)
+
 # Method to downlad data in a thread-safe session
-def download_thread(file: tuple) -> tuple :
+def download_thread(file: tuple, size=None, resume=True,
+                    chunk_size=CHUNK_SIZE, progress=None) -> tuple :
     """
     Downloads a single file from VIP with a thread-safe session.
     - `file` must be in format: (`vip_filename`, `local_filename`)
     - `vip_filename`, `local_filename` can be strings or os.PathLike objects.
+    - `size`: expected file size (bytes), if known.
+    - `resume`: if True, interrupted downloads are resumed from their partial file.
+    - `progress(file, nbytes)` is called after each chunk written to disk, if provided.
 
     Returns the Vip path and a success flag.
     """
     # Parameters
     path, where_to_save = map(str, file)
-    # URL for request
-    url = __PREFIX + 'path' + str(path) + '?action=content'
+    # Report the written bytes with the file identifier
+    chunk_progress = None if progress is None else (lambda nbytes: progress(file, nbytes))
     # Parallel download
-    with (thread_local.session.get(url, headers=__headers, stream=True) as rq,
-          open(where_to_save, 'wb') as out_file):
-        # TODO: manage HTTP return code
-        if rq.status_code != 200:
-            return file, False
-        else:
-            with open(where_to_save, 'wb') as out_file:
-                out_file.write(rq.content)
-            return file, True
-        
-def download_parallel(files):
+    try:
+        done = _resumable_download(_session(), path, where_to_save, size,
+                                   resume, chunk_size, chunk_progress)
+    except requests.exceptions.RequestException:
+        # The connection was interrupted during the transfer
+        return file, False
+    except OSError:
+        # The local file could not be written (e.g., disk full, permission denied)
+        return file, False
+    return file, done
+
+def download_parallel(files, sizes: dict=None, resume=True,
+                      chunk_size=CHUNK_SIZE, progress=None, concurrency=None):
     """
     Downloads files from VIP in parallel.
     - `files`: iterable of tuples in format (`vip_file`, `local_file`) 
     where file paths can be `str` or `os.PathLike` objects; 
+    `files` can be a lazy iterator: it is consumed as the downloads progress.
+    - `sizes`: dictionary of expected file sizes (bytes) with keys from `files`;
+    Sizes are read when each download starts, so `sizes` can be filled along with `files`.
+    - `resume`: if True, interrupted downloads are resumed from their partial file;
+    - `chunk_size`: size of the chunks written to disk by each thread (bytes);
+    - `progress`: thread-safe callable receiving (`file`, `nbytes`) after each chunk
+    (e.g., a `TransferMeter` instance);
+    - `concurrency`: `AdaptiveConcurrency` instance controlling the number of parallel downloads
+    (default: adaptive between MIN_THREADS and MAX_THREADS);
     - Yields a filename and a success flag as soon as the file is downloaded from VIP.
     """
+    # Downloads run with the current client, wherever the results are consumed
+    return _download_parallel(get_client(), files, sizes, resume, chunk_size, progress, concurrency)
+
+def _download_parallel(client, files, sizes, resume, chunk_size, progress, concurrency):
+    """Generator behind `download_parallel()`, with the connections of `client`"""
+    sizes = sizes if sizes is not None else {}
+    if concurrency is None:
+        concurrency = AdaptiveConcurrency(max_limit=_nb_threads(files))
+    # Count the downloaded bytes for the controller
+    def count_bytes(file, nbytes):
+        concurrency.transferred(nbytes)
+        if progress is not None:
+            progress(file, nbytes)
+    # Keep one connection alive for each thread
+    client.set_pool_size(concurrency.max_limit)
     # Threads are run in a context manager to secure their closing
     with ThreadPoolExecutor(
-        max_workers = min(MAX_THREADS, len(files)), # Number of threads
+        max_workers = concurrency.max_limit, # Number of threads
         thread_name_prefix = "vip_requests",
-        initializer = init_thread  # Method to create a thread-safe `requests` Session
+        initializer = client.init_thread  # Method to create a thread-safe `requests` Session
         ) as executor:
-        # Transparent connexion between executor.map() and the caller of download_parallel()
-        yield from executor.map(download_thread, files)
+        # Transparent connexion between the executor and the caller of download_parallel()
+        yield from _imap_unordered(
+            executor,
+            lambda file: download_thread(
+                file, sizes.get(file), resume, chunk_size, count_bytes
+            ),
+            files,
+            concurrency
+        )
+
+# Methods for parallel uploads
+
+# Method to upload data in a thread-safe session
+def upload_thread(file: tuple, progress=None) -> tuple :
+    """
+    Uploads a single file to VIP with a thread-safe session.
+    - `file` must be in format: (`local_filename`, `vip_filename`)
+    - `local_filename`, `vip_filename` can be strings or os.PathLike objects.
+    - `progress(file, nbytes)` is called when the file is uploaded, if provided.
+
+    Returns the local path and a success flag.
+    """
+    # Parameters
+    path, where_to_save = map(str, file)
+    # Parallel upload
+    try:
+        done = _put_file(_session(), path, where_to_save)
+    except requests.exceptions.RequestException:
+        # The connection was interrupted during the transfer
+        return file, False
+    # Report the uploaded bytes
+    if done and progress is not None:
+        progress(file, os.path.getsize(path))
+    return file, done
+
+def upload_parallel(files, progress=None, concurrency=None):
+    """
+    Uploads files to VIP in parallel.
+    - `files`: iterable of tuples in format (`local_file`, `vip_file`) 
+    where file paths can be `str` or `os.PathLike` objects;
+    `files` can be a lazy iterator: it is consumed as the uploads progress.
+    The parent directories must already exist on VIP.
+    - `progress`: thread-safe callable receiving (`file`, `nbytes`) after each upload
+    (e.g., a `TransferMeter` instance);
+    - `concurrency`: `AdaptiveConcurrency` instance controlling the number of parallel uploads
+    (default: adaptive between MIN_THREADS and MAX_THREADS);
+    - Yields a filename and a success flag as soon as the file is uploaded on VIP.
+    """
+    # Uploads run with the current client, wherever the results are consumed
+    return _upload_parallel(get_client(), files, progress, concurrency)
+
+def _upload_parallel(client, files, progress, concurrency):
+    """Generator behind `upload_parallel()`, with the connections of `client`"""
+    if concurrency is None:
+        concurrency = AdaptiveConcurrency(max_limit=_nb_threads(files))
+    # Count the uploaded bytes for the controller
+    def count_bytes(file, nbytes):
+        concurrency.transferred(nbytes)
+        if progress is not None:
+            progress(file, nbytes)
+    # Keep one connection alive for each thread
+    client.set_pool_size(concurrency.max_limit)
+    # Threads are run in a context manager to secure their closing
+    with ThreadPoolExecutor(
+        max_workers = concurrency.max_limit, # Number of threads
+        thread_name_prefix = "vip_requests",
+        initializer = client.init_thread  # Method to create a thread-safe `requests` Session
+        ) as executor:
+        # Results are yielded in completion order
+        yield from _imap_unordered(
+            executor,
+            lambda file: upload_thread(file, count_bytes),
+            files,
+            concurrency
+        )
+
+# Methods for parallel existence checks
+
+# Method to check files of the same directory in a thread-safe session
+def exists_thread(parent: str, files: list) -> dict:
+    """
+    Checks the existence of `files` (VIP paths) sharing the `parent` directory.
+    Several files are checked with a single listing of `parent`.
+
+    Returns a dictionary {`file`: existence flag}.
+    """
+    # Single file: one request
+    if len(files) < 2:
+        return {file: exists(file) for file in files}
+    # Several files: list the directory once
+    try:
+        content = list_content(parent)
+    except RuntimeError:
+        # The listing failed: the parent may not exist
+        if not exists(parent):
+            return {file: False for file in files}
+        return {file: exists(file) for file in files}
+    listed = {PathCache._path(element['path']) for element in content}
+    return {file: PathCache._path(file) in listed for file in files}
+
+def exists_parallel(files, nb_threads=None) -> dict:
+    """
+    Checks the existence of many files on VIP.
+    - `files`: iterable of VIP paths (`str` or `os.PathLike` objects);
+    - `nb_threads`: number of parallel requests (default: MAX_THREADS).
+    Files are grouped by parent directory, which is listed once for several files,
+    and the directories are checked in parallel. Results go through the path cache.
+
+    Returns a dictionary {`file`: existence flag} with keys from `files`.
+    """
+    client = get_client()
+    # Group the files by parent directory, skipping the cached ones
+    result, groups = {}, {}
+    for file in files:
+        path = PathCache._path(file)
+        cached = client.paths.exists(path)
+        if cached is not None:
+            result[file] = cached
+        else:
+            groups.setdefault(PathCache._parent(path), []).append(file)
+    if not groups:
+        return result
+    # Check each group in a separate thread
+    nb_threads = max(1, min(nb_threads or MAX_THREADS, len(groups)))
+    client.set_pool_size(nb_threads)
+    with ThreadPoolExecutor(
+        max_workers = nb_threads, # Number of threads
+        thread_name_prefix = "vip_requests",
+        initializer = client.init_thread  # Method to create a thread-safe `requests` Session
+        ) as executor:
+        futures = [
+            executor.submit(exists_thread, parent, [str(file) for file in group])
+            for parent, group in groups.items()
+        ]
+        for future, group in zip(futures, groups.values()):
+            checked = future.result()
+            result.update({file: checked[str(file)] for file in group})
+    return result
 
 ################################ EXECUTIONS ###################################
 # -----------------------------------------------------------------------------
 def list_executions()->list:
-    url = __PREFIX + 'executions'
-    rq = SESSION.get(url, headers=__headers)
+    client = get_client()
+    url = client.prefix + 'executions'
+    rq = client.thread_session().get(url, headers=client.headers)
     manage_errors(rq)
     return rq.json()
 
 # -----------------------------------------------------------------------------
 def count_executions()->int:
-    url = __PREFIX + 'executions/count'
-    rq = SESSION.get(url, headers=__headers)
+    client = get_client()
+    url = client.prefix + 'executions/count'
+    rq = client.thread_session().get(url, headers=client.headers)
     manage_errors(rq)
     return int(rq.text)
 
 # -----------------------------------------------------------------------------
 def init_exec(pipeline, name="default", inputValues={}, resultsLocation="/vip/Home") -> str:
-    url = __PREFIX + 'executions'
+    client = get_client()
+    url = client.prefix + 'executions'
     headers = {
-                'apikey': __apikey,
+                'apikey': client.apikey,
                 'Content-Type': 'application/json'
               }
     data_ = {
@@ -330,16 +1132,17 @@ def init_exec(pipeline, name="default", inputValues={}, resultsLocation="/vip/Ho
             "inputValues": inputValues,
             "resultsLocation": resultsLocation
            }
-    rq = SESSION.post(url, headers=headers, json=data_)
+    rq = client.thread_session().post(url, headers=headers, json=data_)
     manage_errors(rq)
     return rq.json()["identifier"]
 # -----------------------------------------------------------------------------
 
 def init_exec_without_resultsLocation(pipeline, name="default", inputValues={}) -> str:
     """Initiate executions with "results-directory" in the `inputValues`"""
-    url = __PREFIX + 'executions'
+    client = get_client()
+    url = client.prefix + 'executions'
     headers = {
-                'apikey': __apikey,
+                'apikey': client.apikey,
                 'Content-Type': 'application/json'
               }
     data_ = {
@@ -347,14 +1150,15 @@ def init_exec_without_resultsLocation(pipeline, name="default", inputValues={})
             'pipelineIdentifier': pipeline,
             "inputValues": inputValues
            }
-    rq = requests.post(url, headers=headers, json=data_)
+    rq = client.thread_session().post(url, headers=headers, json=data_)
     manage_errors(rq)
     return rq.json()["identifier"]
 
 # -----------------------------------------------------------------------------
 def execution_info(id_exec)->dict:
-    url = __PREFIX + 'executions/' + id_exec
-    rq = SESSION.get(url, headers=__headers)
+    client = get_client()
+    url = client.prefix + 'executions/' + id_exec
+    rq = client.thread_session().get(url, headers=client.headers)
     manage_errors(rq)
     return rq.json()
 
@@ -365,15 +1169,17 @@ def is_running(id_exec)->bool:
 
 # -----------------------------------------------------------------------------
 def get_exec_stderr(exec_id) -> str:
-    url = __PREFIX + 'executions/' + exec_id + '/stderr'
-    rq = SESSION.get(url, headers=__headers)
+    client = get_client()
+    url = client.prefix + 'executions/' + exec_id + '/stderr'
+    rq = client.thread_session().get(url, headers=client.headers)
     manage_errors(rq)
     return rq.text
 
 # -----------------------------------------------------------------------------
 def get_exec_stdout(exec_id) -> str:
-    url = __PREFIX + 'executions/' + exec_id + '/stdout'
-    rq = SESSION.get(url, headers=__headers)
+    client = get_client()
+    url = client.prefix + 'executions/' + exec_id + '/stdout'
+    rq = client.thread_session().get(url, headers=client.headers)
     manage_errors(rq)
     return rq.text
 
@@ -384,10 +1190,11 @@ def get_exec_results(exec_id, timeout: int=None) -> str:
     If `timeout` is set, `requests will make a single try with timeout
     (without the persistent session). 
     """
-    url = __PREFIX + 'executions/' + exec_id + '/results'
+    client = get_client()
+    url = client.prefix + 'executions/' + exec_id + '/results'
     try:
         # Use the session without retry strategy
-        rq = SESSION_NO_RETRY.get(url, headers=__headers, timeout=timeout)
+        rq = client.session_no_retry.get(url, headers=client.headers, timeout=timeout)
         # This will throw TimeoutError in case of timeout
     except requests.exceptions.ReadTimeout as e:
         raise TimeoutError(e) # builtin Python error
@@ -396,10 +1203,11 @@ def get_exec_results(exec_id, timeout: int=None) -> str:
 
 # -----------------------------------------------------------------------------
 def kill_execution(exec_id, deleteFiles=False) -> bool:
-    url = __PREFIX + 'executions/' + exec_id
+    client = get_client()
+    url = client.prefix + 'executions/' + exec_id
     if deleteFiles:
         url += '?deleteFiles=true'
-    rq = SESSION.delete(url, headers=__headers)
+    rq = client.thread_session().delete(url, headers=client.headers)
     try:
         manage_errors(rq)
     except RuntimeError:
@@ -410,23 +1218,26 @@ def kill_execution(exec_id, deleteFiles=False) -> bool:
 ################################ PIPELINES ####################################
 # -----------------------------------------------------------------------------
 def list_pipeline()->list:
-    url = __PREFIX + 'pipelines'
-    rq = SESSION.get(url, headers=__headers)
+    client = get_client()
+    url = client.prefix + 'pipelines'
+    rq = client.thread_session().get(url, headers=client.headers)
     manage_errors(rq)
     return rq.json()
 
 # -----------------------------------------------------------------------------
 def pipeline_def(pip_id)->dict:
-    url = __PREFIX + 'pipelines/' + pip_id
-    rq = SESSION.get(url, headers=__headers)
+    client = get_client()
+    url = client.prefix + 'pipelines/' + pip_id
+    rq = client.thread_session().get(url, headers=client.headers)
     manage_errors(rq)
     return rq.json()
 
 ################################## OTHER ######################################
 # -----------------------------------------------------------------------------
 def platform_info()->dict:
-    url = __PREFIX + 'platform'
-    rq = SESSION.get(url, headers=__headers)
+    client = get_client()
+    url = client.prefix + 'platform'
+    rq = client.thread_session().get(url, headers=client.headers)
     manage_errors(rq)
     return rq.json()
 
@@ -435,19 +1246,31 @@ def get_apikey(username, password)->str:
     """
     username is the email account you used to create your VIP account
     """
-    url = __PREFIX + 'authenticate'
+    client = get_client()
+    url = client.prefix + 'authenticate'
     headers = {
-                'apikey': __apikey,
+                'apikey': client.apikey,
                 'Content-Type': 'application/json'
               }
     data_ = {
             "username": username, 
             "password": password
            }
-    rq = SESSION.post(url, headers=headers, json=data_)
+    rq = client.session.post(url, headers=headers, json=data_)
     manage_errors(rq)
     return rq.json()['httpHeaderValue']
 
+################################### CLIENTS ###################################
+# Functions available as methods of each client (see `Client`)
+API = (
+    'create_dir', 'create_dir_smart', 'list_content', 'list_directory',
+    'list_elements', 'exists', 'get_path_properties', 'is_dir', 'delete_path',
+    'upload', 'download', 'download_parallel', 'upload_parallel', 'exists_parallel',
+    'list_executions', 'count_executions', 'init_exec', 'init_exec_without_resultsLocation',
+    'execution_info', 'is_running', 'get_exec_stderr', 'get_exec_stdout', 'get_exec_results',
+    'kill_execution', 'list_pipeline', 'pipeline_def', 'platform_info', 'get_apikey',
+)
+
 ###############################################################################
 if __name__=='__main__':
     pass
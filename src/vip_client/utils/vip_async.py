@@ -0,0 +1,541 @@
+"""
+This package is used to communicate with the VIP RESTful API.
+It is the asynchronous counterpart of `vip.py`, based on `asyncio` and `aiohttp`:
+thousands of requests can be sent concurrently from a single event loop.
+- Requests are capped by `max_concurrency` (semaphore + connection pool);
+- Errors are handled as in `vip.py` (see `vip.detect_errors()`, `vip.manage_errors()`);
+- Requests are retried with the strategy of `vip.py` (see `vip.retry_strategy`),
+  downloads included (interrupted downloads are resumed);
+- Local files are written in the default executor of the event loop, which is never blocked by disk I/O.
+
+Example:
+    async with VipAsync(api_key, max_concurrency=200) as api:
+        infos = await asyncio.gather(*[api.execution_info(wid) for wid in workflows])
+"""
+
+# Built-in libraries
+import asyncio
+import json
+import os
+import re
+from itertools import islice
+# Third-Party
+try:
+    import aiohttp
+except:
+    from warnings import warn
+    warn("vip_client.utils.vip_async is unavailable (missing package: aiohttp)")
+# Synchronous implementation
+from vip_client.utils import vip
+
+########################### VARIABLES & ERRORS ################################
+# -----------------------------------------------------------------------------
+# Default number of concurrent requests
+MAX_CONCURRENCY = 100
+
+# Maximum delay between two retries (seconds), as in `urllib3`
+BACKOFF_MAX = 120
+
+# The API URL and key are read from the current client of `vip.py` by default.
+def _vip_prefix() -> str:
+    return vip.get_client().prefix
+
+def _vip_apikey() -> str:
+    return vip.get_client().apikey
+
+# -----------------------------------------------------------------------------
+class Response:
+    """
+    Response of VIP, read in full.
+    Implements the interface of `requests.Response` used by `vip.detect_errors()`,
+    so both modules share the same error semantics.
+    """
+
+    def __init__(self, status_code: int, headers, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+# -----------------------------------------------------------------------------
+class VipAsync:
+    """
+    Asynchronous client for the VIP API.
+    Must be opened within an event loop, preferably as an async context manager:
+        `async with VipAsync(api_key) as api: ...`
+    - `api_key`: VIP API key (default: the key of the current `vip.Client`);
+    - `max_concurrency`: maximum number of concurrent requests;
+    - `prefix`: URL of the API (default: the URL of the current `vip.Client`).
+    """
+
+    def __init__(self, api_key: str=None, max_concurrency: int=MAX_CONCURRENCY, prefix: str=None):
+        self.prefix = prefix if prefix is not None else _vip_prefix()
+        self._apikey = api_key if api_key is not None else _vip_apikey()
+        self.max_concurrency = max_concurrency
+        self._session = None
+        self._semaphore = None
+        # Path metadata cache (see `vip.PathCache`)
+        self.paths = vip.PathCache()
+
+    # Context manager
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def open(self) -> None:
+        """Opens the HTTP session in the running event loop"""
+        if self._session is not None and not self._session.closed:
+            return
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._session = aiohttp.ClientSession(
+            headers = {'apikey': self._apikey},
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        )
+
+    async def close(self) -> None:
+        """Closes all connections to VIP"""
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    # -----------------------------------------------------------------------------
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Delay before retry number `attempt`, as in `vip.retry_strategy`"""
+        if attempt <= 1:
+            return 0
+        return min(vip.retry_strategy.backoff_factor * 2 ** (attempt - 1), BACKOFF_MAX)
+
+    async def _request(self, method: str, url: str, retry=True, timeout: int=None,
+                       file: str=None, **kwargs) -> Response:
+        """
+        Sends a request within the concurrency cap and reads the whole response.
+        - If `retry` is True, idempotent requests are retried on connection errors
+        and on the status codes of `vip.retry_strategy`;
+        - `timeout`: total timeout of each try (seconds);
+        - `file`: local file streamed as the request body (reopened at each try).
+        Other keyword arguments are given to `aiohttp.ClientSession.request()`.
+        """
+        strategy = vip.retry_strategy
+        retries = strategy.total if (retry and method in strategy.allowed_methods) else 0
+        timeout = aiohttp.ClientTimeout(total=timeout)
+        for attempt in range(retries + 1):
+            await asyncio.sleep(self._backoff(attempt))
+            try:
+                async with self._semaphore:
+                    if file is None:
+                        async with self._session.request(method, url, timeout=timeout, **kwargs) as rq:
+                            content = await rq.read()
+                    else:
+                        # The file is streamed from its handle by small blocks.
+                        # Empty files are sent as empty bytes to keep a `Content-Length` header
+                        with open(file, 'rb') as fid:
+                            data = fid if os.fstat(fid.fileno()).st_size > 0 else b''
+                            async with self._session.request(
+                                method, url, timeout=timeout, data=data, **kwargs) as rq:
+                                content = await rq.read()
+            except aiohttp.ClientConnectionError:
+                if attempt == retries:
+                    raise
+                continue
+            if rq.status in strategy.status_forcelist and attempt < retries:
+                continue
+            return Response(rq.status, rq.headers, content)
+
+    async def _get(self, url: str, **kwargs) -> Response:
+        rq = await self._request('GET', url, **kwargs)
+        vip.manage_errors(rq)
+        return rq
+
+    @staticmethod
+    def _is_done(rq: Response) -> bool:
+        """Return True if `rq` is not an error message, False otherwise"""
+        try:
+            vip.manage_errors(rq)
+        except RuntimeError:
+            return False
+        else:
+            return True
+
+    # -----------------------------------------------------------------------------
+    async def set_api_key(self, value) -> bool:
+        """
+        Return True is correct apikey, False otherwise.
+        Raise an error if an other problems occured
+        """
+        url = self.prefix + 'plateform'
+        rq = await self._request('PUT', url, retry=False, headers={'apikey': value})
+        res = vip.detect_errors(rq)
+        if res[0]:
+            # Error
+            if res[1] == 40101:
+                return False
+            else:
+                raise RuntimeError("Error {} from VIP : {}".format(res[1], res[2]))
+        # Set the API key (in the headers of the running session)
+        self._apikey = value
+        self.paths.clear()
+        if self._session is not None:
+            self._session.headers['apikey'] = value
+        return True
+
+    ################################### PATH ######################################
+    # -----------------------------------------------------------------------------
+    async def create_dir(self, path) -> bool:
+        """
+        Return True if done, False otherwise
+        """
+        url = self.prefix + 'path' + path
+        done = self._is_done(await self._request('PUT', url))
+        if done:
+            self.paths.invalidate(path)
+            self.paths.set_exists(path, True)
+        return done
+
+    # -----------------------------------------------------------------------------
+    async def create_dir_smart(self, path) -> str:
+        """
+        If 'path' already exist, add a number suffix
+
+        'path' should NOT have a '/' at the end
+        return a path with the same syntax
+        """
+        ind = 0
+        res_path = path
+        while await self.exists(res_path):
+            ind += 1
+            res_path = path + str(ind)
+
+        await self.create_dir(res_path)
+        return res_path
+
+    # -----------------------------------------------------------------------------
+    async def _path_action(self, path, action) -> Response:
+        """
+        'content' is not accepted here, use download() method instead.
+        """
+        assert action in ['list', 'exists', 'properties', 'md5']
+        url = self.prefix + 'path' + path + '?action=' + action
+        return await self._get(url)
+
+    # -----------------------------------------------------------------------------
+    async def list_content(self, path) -> list:
+        content = self.paths.listing(path)
+        if content is None:
+            content = (await self._path_action(path, 'list')).json()
+            self.paths.set_listing(path, content)
+        return content
+
+    # -----------------------------------------------------------------------------
+    async def list_directory(self, path) -> list:
+        res = await self.list_content(path)
+        return [d for d in res if d['isDirectory'] == True]
+
+    # -----------------------------------------------------------------------------
+    async def list_elements(self, path) -> list:
+        res = await self.list_content(path)
+        return [e for e in res if e['isDirectory'] != True]
+
+    # -----------------------------------------------------------------------------
+    async def exists(self, path) -> bool:
+        res = self.paths.exists(path)
+        if res is None:
+            res = (await self._path_action(path, 'exists')).json()['exists']
+            self.paths.set_exists(path, res)
+        return res
+
+    # -----------------------------------------------------------------------------
+    async def get_path_properties(self, path) -> dict:
+        res = self.paths.properties(path)
+        if res is None:
+            res = (await self._path_action(path, 'properties')).json()
+            self.paths.set_properties(path, res)
+        return res
+
+    # -----------------------------------------------------------------------------
+    async def is_dir(self, path) -> bool:
+        return (await self.get_path_properties(path))['isDirectory']
+
+    # -----------------------------------------------------------------------------
+    async def delete_path(self, path) -> bool:
+        """
+        Delete a file or a path (with all its content).
+        Return True if done, False otherwise
+        """
+        url = self.prefix + 'path' + path
+        self.paths.invalidate(path, recursive=True)
+        return self._is_done(await self._request('DELETE', url))
+
+    # -----------------------------------------------------------------------------
+    async def upload(self, path, where_to_save) -> bool:
+        """
+        - `path` : on local computer, the file to upload
+        - `where_to_save` : on VIP, something like "/vip/Home/RandomName.ext"
+
+        Return True if done, False otherwise
+        """
+        url = self.prefix + 'path' + str(where_to_save)
+        headers = {'Content-Type': 'application/octet-stream'}
+        rq = await self._request('PUT', url, file=str(path), headers=headers)
+        self.paths.invalidate(str(where_to_save))
+        done = self._is_done(rq)
+        if done:
+            self.paths.set_exists(str(where_to_save), True)
+        return done
+
+    # -----------------------------------------------------------------------------
+    @staticmethod
+    async def _write_content(rq, where_to_save, chunk_size=vip.CHUNK_SIZE,
+                             progress=None, mode='wb') -> int:
+        """
+        Streams the body of response `rq` to the local file `where_to_save`.
+        Same as `vip._write_content()` for `aiohttp` responses.
+        The file is written in the default executor, out of the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        written = 0
+        out_file = await loop.run_in_executor(None, open, where_to_save, mode)
+        try:
+            async for chunk in rq.content.iter_chunked(chunk_size):
+                await loop.run_in_executor(None, out_file.write, chunk)
+                written += len(chunk)
+                if progress is not None:
+                    progress(len(chunk))
+        finally:
+            await loop.run_in_executor(None, out_file.close)
+        return written
+
+    async def _resumable_download(self, path, where_to_save, size=None, resume=True,
+                                  chunk_size=vip.CHUNK_SIZE, progress=None) -> bool:
+        """
+        Downloads `path` from VIP to `where_to_save` through a partial file.
+        Same as `vip._resumable_download()`, except that None is returned 
+        when VIP answers with a status code of `vip.retry_strategy` (the download can be retried).
+        """
+        url = self.prefix + 'path' + path + '?action=content'
+        part_file = where_to_save + vip.PART_SUFFIX
+        # Bytes already on disk
+        offset = os.path.getsize(part_file) if (resume and os.path.isfile(part_file)) else 0
+        if size is not None and offset > size:
+            offset = 0 # The partial file cannot belong to this file
+        # Ask only for the missing bytes
+        headers = {'Range': 'bytes=%d-' % offset} if offset > 0 else {}
+        async with self._semaphore:
+            async with self._session.get(url, headers=headers) as rq:
+                if rq.status == 416 and offset > 0:
+                    # Range not satisfiable: the partial file is complete or invalid
+                    restart = (size is None or offset != size)
+                elif rq.status == 206 and offset > 0 and \
+                    re.match(r"bytes %d-" % offset, rq.headers.get('Content-Range', '')):
+                    # The server sent the missing bytes
+                    restart = False
+                    await self._write_content(rq, part_file, chunk_size, progress, mode='ab')
+                elif rq.status == 200:
+                    # The server sent the whole file
+                    restart = False
+                    await self._write_content(rq, part_file, chunk_size, progress, mode='wb')
+                elif rq.status in vip.retry_strategy.status_forcelist:
+                    return None
+                else:
+                    return False
+        # Restart from scratch (out of the concurrency slot)
+        if restart:
+            os.remove(part_file)
+            return await self._resumable_download(path, where_to_save, size, False,
+                                                  chunk_size, progress)
+        # Check the final size
+        if size is not None:
+            actual_size = os.path.getsize(part_file)
+            if actual_size > size:
+                os.remove(part_file) # Unusable data
+            if actual_size != size:
+                return False
+        # Rename the complete file atomically
+        os.replace(part_file, where_to_save)
+        return True
+
+    async def download(self, path, where_to_save, size=None, resume=False,
+                       chunk_size=vip.CHUNK_SIZE, progress=None) -> bool:
+        """
+        Downloads a single file from VIP.
+        - `path`: on VIP, something like "/vip/Home/RandomName.ext", content to dl
+        - `where_to_save` : on local computer
+        - `size`: expected file size (bytes), as given by `list_content()`
+        - `resume`: if True, resumes an interrupted download of `where_to_save`
+        - `chunk_size`: size of the chunks written to disk (bytes)
+        - `progress`: callable receiving the number of bytes written after each chunk
+        Connection errors and the status codes of `vip.retry_strategy` are retried
+        with backoff (`vip.retry_strategy.total` times at most): retries resume the partial file.
+        """
+        retries = vip.retry_strategy.total
+        for attempt in range(retries + 1):
+            await asyncio.sleep(self._backoff(attempt))
+            try:
+                done = await self._resumable_download(str(path), str(where_to_save), size,
+                                                      resume or attempt > 0, chunk_size, progress)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # The connection was interrupted during the transfer
+                continue
+            if done is not None:
+                return done
+        return False
+
+    # Methods for parallel transfers
+
+    async def imap_unordered(self, function, iterable, max_pending: int=None):
+        """
+        Applies the coroutine `function` to each item of `iterable`.
+        - Items are pulled from `iterable` only when a slot is free, so that at most
+        `max_pending` calls are pending (default: `max_concurrency`);
+        - Yields the results in completion order.
+        """
+        items = iter(iterable)
+        max_pending = max_pending if max_pending is not None else self.max_concurrency
+        pending = {asyncio.ensure_future(function(item)) for item in islice(items, max_pending)}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Refill the window
+                pending.update(asyncio.ensure_future(function(item))
+                               for item in islice(items, len(done)))
+                for task in done:
+                    yield task.result()
+        finally:
+            # The caller stopped early: cancel the remaining calls
+            for task in pending:
+                task.cancel()
+
+    async def download_parallel(self, files, sizes: dict=None, resume=True,
+                                chunk_size=vip.CHUNK_SIZE, progress=None):
+        """
+        Downloads files from VIP concurrently.
+        - `files`: iterable of tuples in format (`vip_file`, `local_file`);
+        - `sizes`: dictionary of expected file sizes (bytes) with keys from `files`;
+        - `resume`: if True, interrupted downloads are resumed from their partial file;
+        - `progress`: callable receiving (`file`, `nbytes`) after each chunk
+        (e.g., a `vip.TransferMeter` instance);
+        - Yields a filename and a success flag as soon as the file is downloaded from VIP.
+        """
+        sizes = sizes if sizes is not None else {}
+        async def download_file(file):
+            chunk_progress = None if progress is None else (lambda nbytes: progress(file, nbytes))
+            done = await self.download(*file, size=sizes.get(file), resume=resume,
+                                       chunk_size=chunk_size, progress=chunk_progress)
+            return file, done
+        async for result in self.imap_unordered(download_file, files):
+            yield result
+
+    async def upload_parallel(self, files, progress=None):
+        """
+        Uploads files to VIP concurrently.
+        - `files`: iterable of tuples in format (`local_file`, `vip_file`);
+        The parent directories must already exist on VIP.
+        - `progress`: callable receiving (`file`, `nbytes`) after each upload;
+        - Yields a filename and a success flag as soon as the file is uploaded on VIP.
+        """
+        async def upload_file(file):
+            try:
+                done = await self.upload(*file)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # The connection was interrupted during the transfer
+                return file, False
+            if done and progress is not None:
+                progress(file, os.path.getsize(file[0]))
+            return file, done
+        async for result in self.imap_unordered(upload_file, files):
+            yield result
+
+    ################################ EXECUTIONS ###################################
+    # -----------------------------------------------------------------------------
+    async def list_executions(self) -> list:
+        return (await self._get(self.prefix + 'executions')).json()
+
+    # -----------------------------------------------------------------------------
+    async def count_executions(self) -> int:
+        return int((await self._get(self.prefix + 'executions/count')).text)
+
+    # -----------------------------------------------------------------------------
+    async def init_exec(self, pipeline, name="default", inputValues={},
+                        resultsLocation="/vip/Home") -> str:
+        data_ = {
+                "name": name,
+                'pipelineIdentifier': pipeline,
+                "inputValues": inputValues,
+                "resultsLocation": resultsLocation
+               }
+        rq = await self._request('POST', self.prefix + 'executions', json=data_)
+        vip.manage_errors(rq)
+        return rq.json()["identifier"]
+
+    # -----------------------------------------------------------------------------
+    async def init_exec_without_resultsLocation(self, pipeline, name="default",
+                                                inputValues={}) -> str:
+        """Initiate executions with "results-directory" in the `inputValues`"""
+        data_ = {
+                "name": name,
+                'pipelineIdentifier': pipeline,
+                "inputValues": inputValues
+               }
+        rq = await self._request('POST', self.prefix + 'executions', json=data_)
+        vip.manage_errors(rq)
+        return rq.json()["identifier"]
+
+    # -----------------------------------------------------------------------------
+    async def execution_info(self, id_exec) -> dict:
+        return (await self._get(self.prefix + 'executions/' + id_exec)).json()
+
+    # -----------------------------------------------------------------------------
+    async def is_running(self, id_exec) -> bool:
+        info = await self.execution_info(id_exec)
+        return info['status'] == 'Running'
+
+    # -----------------------------------------------------------------------------
+    async def get_exec_stderr(self, exec_id) -> str:
+        return (await self._get(self.prefix + 'executions/' + exec_id + '/stderr')).text
+
+    # -----------------------------------------------------------------------------
+    async def get_exec_stdout(self, exec_id) -> str:
+        return (await self._get(self.prefix + 'executions/' + exec_id + '/stdout')).text
+
+    # -----------------------------------------------------------------------------
+    async def get_exec_results(self, exec_id, timeout: int=None) -> str:
+        """
+        If `timeout` is set, makes a single try with timeout.
+        Raises the builtin TimeoutError in case of timeout.
+        """
+        url = self.prefix + 'executions/' + exec_id + '/results'
+        try:
+            rq = await self._get(url, retry=(timeout is None), timeout=timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(e) # builtin Python error
+        return rq.json()
+
+    # -----------------------------------------------------------------------------
+    async def kill_execution(self, exec_id, deleteFiles=False) -> bool:
+        url = self.prefix + 'executions/' + exec_id
+        if deleteFiles:
+            url += '?deleteFiles=true'
+        return self._is_done(await self._request('DELETE', url))
+
+    ################################ PIPELINES ####################################
+    # -----------------------------------------------------------------------------
+    async def list_pipeline(self) -> list:
+        return (await self._get(self.prefix + 'pipelines')).json()
+
+    # -----------------------------------------------------------------------------
+    async def pipeline_def(self, pip_id) -> dict:
+        return (await self._get(self.prefix + 'pipelines/' + pip_id)).json()
+
+    ################################## OTHER ######################################
+    # -----------------------------------------------------------------------------
+    async def platform_info(self) -> dict:
+        return (await self._get(self.prefix + 'platform')).json()